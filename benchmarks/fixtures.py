@@ -0,0 +1,484 @@
+#!/usr/bin/env python
+
+"""GameDay payloads used by the benchmarks, served from local files.
+
+The files in `benchmarks/fixtures/` are what `serve()` hands out in place
+of mlb.com. They can be written in two ways:
+
+    python -m benchmarks.fixtures record 2016_08_02_nyamlb_nynmlb_1
+    python -m benchmarks.fixtures generate
+
+`record` downloads the files of a game, its scoreboard and the league
+files from mlb.com. `generate` writes files with the same structure and a
+typical size (15 game scoreboard, 9 innings of events with ~290 pitches,
+full box scores, 30 teams) for machines without access to mlb.com; the
+committed fixtures were made this way.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+import mlbgame.data
+
+DIRECTORY = os.path.join(os.path.dirname(__file__), 'fixtures')
+GAME_ID = '2016_08_02_nyamlb_nynmlb_1'
+
+# fixture file names by the last part of the url
+GAME_FILES = ('scoreboard.xml', 'boxscore.xml', 'rawboxscore.xml',
+              'game_events.xml', 'linescore.xml', 'players.xml')
+FILES = {
+    'mlb_properties.xml': 'mlb_properties.xml',
+    'named.roster_40.bam': 'roster.json',
+    'named.standings_schedule_date.bam': 'standings.json',
+    'named.historical_standings_schedule_date.bam': 'standings.json',
+    'named.wsfb_news_injury.bam': 'injury.json',
+}
+FILES.update((x, x) for x in GAME_FILES)
+
+TEAMS = [
+    # (team_id, code, club, city, name, league, division)
+    (108, 'ana', 'ana', 'Los Angeles', 'Angels', 'American', 'West'),
+    (109, 'ari', 'ari', 'Arizona', 'D-backs', 'National', 'West'),
+    (110, 'bal', 'bal', 'Baltimore', 'Orioles', 'American', 'East'),
+    (111, 'bos', 'bos', 'Boston', 'Red Sox', 'American', 'East'),
+    (112, 'chn', 'chc', 'Chicago', 'Cubs', 'National', 'Central'),
+    (113, 'cin', 'cin', 'Cincinnati', 'Reds', 'National', 'Central'),
+    (114, 'cle', 'cle', 'Cleveland', 'Indians', 'American', 'Central'),
+    (115, 'col', 'col', 'Colorado', 'Rockies', 'National', 'West'),
+    (116, 'det', 'det', 'Detroit', 'Tigers', 'American', 'Central'),
+    (117, 'hou', 'hou', 'Houston', 'Astros', 'American', 'West'),
+    (118, 'kca', 'kc', 'Kansas City', 'Royals', 'American', 'Central'),
+    (119, 'lan', 'la', 'Los Angeles', 'Dodgers', 'National', 'West'),
+    (120, 'was', 'was', 'Washington', 'Nationals', 'National', 'East'),
+    (121, 'nyn', 'nym', 'New York', 'Mets', 'National', 'East'),
+    (133, 'oak', 'oak', 'Oakland', 'Athletics', 'American', 'West'),
+    (134, 'pit', 'pit', 'Pittsburgh', 'Pirates', 'National', 'Central'),
+    (135, 'sdn', 'sd', 'San Diego', 'Padres', 'National', 'West'),
+    (136, 'sea', 'sea', 'Seattle', 'Mariners', 'American', 'West'),
+    (137, 'sfn', 'sf', 'San Francisco', 'Giants', 'National', 'West'),
+    (138, 'sln', 'stl', 'St. Louis', 'Cardinals', 'National', 'Central'),
+    (139, 'tba', 'tb', 'Tampa Bay', 'Rays', 'American', 'East'),
+    (140, 'tex', 'tex', 'Texas', 'Rangers', 'American', 'West'),
+    (141, 'tor', 'tor', 'Toronto', 'Blue Jays', 'American', 'East'),
+    (142, 'min', 'min', 'Minnesota', 'Twins', 'American', 'Central'),
+    (143, 'phi', 'phi', 'Philadelphia', 'Phillies', 'National', 'East'),
+    (144, 'atl', 'atl', 'Atlanta', 'Braves', 'National', 'East'),
+    (145, 'cha', 'cws', 'Chicago', 'White Sox', 'American', 'Central'),
+    (146, 'mia', 'mia', 'Miami', 'Marlins', 'National', 'East'),
+    (147, 'nya', 'nyy', 'New York', 'Yankees', 'American', 'East'),
+    (158, 'mil', 'mil', 'Milwaukee', 'Brewers', 'National', 'Central'),
+]
+
+PITCHES = [('Ball', 'Bola mala', 'B', 'FF'),
+           ('Called Strike', 'Strike cantado', 'S', 'FT'),
+           ('Swinging Strike', 'Strike tirandole', 'S', 'SL'),
+           ('Foul', 'Foul', 'S', 'CH'),
+           ('In play, out(s)', 'En juego, out(s)', 'X', 'CU')]
+EVENTS = [('Groundout', 'Roletazo', 'grounds out to shortstop'),
+          ('Flyout', 'Elevado de Out', 'flies out to center fielder'),
+          ('Strikeout', 'Ponche', 'strikes out swinging'),
+          ('Single', 'Sencillo', 'singles on a line drive to left fielder'),
+          ('Walk', 'Base por Bolas', 'walks')]
+POSITIONS = ['CF', 'SS', '2B', 'RF', '1B', 'LF', '3B', 'C', 'P']
+
+
+def __attrs(data):
+    return ' '.join('{0}="{1}"'.format(x, data[x]) for x in sorted(data))
+
+
+def __element(tag, data, children=None):
+    if children is None:
+        return '<{0} {1}/>'.format(tag, __attrs(data))
+    return '<{0} {1}>\n{2}\n</{0}>'.format(tag, __attrs(data),
+                                           '\n'.join(children))
+
+
+def __name(team, number):
+    return ('Player{0}{1}'.format(team, number), 'First{0}'.format(number))
+
+
+def scoreboard_xml():
+    games = []
+    # the mets host the yankees in the first game, as in `GAME_ID`
+    teams = [TEAMS[13], TEAMS[28]]
+    teams.extend(x for x in TEAMS if x not in teams)
+    for x in range(15):
+        home = teams[2 * x]
+        away = teams[2 * x + 1]
+        game_id = '2016_08_02_{0}mlb_{1}mlb_1'.format(away[1], home[1])
+        children = [
+            __element('game', {'id': game_id, 'league': 'AN',
+                               'status': 'FINAL', 'start_time': '07:10PM'}),
+            __element('team', {'name': home[4]}, [
+                __element('gameteam', {'R': x % 7, 'H': 8, 'E': 0})]),
+            __element('team', {'name': away[4]}, [
+                __element('gameteam', {'R': x % 5 + 1, 'H': 6, 'E': 1})]),
+            __element('w_pitcher', {'wins': 7, 'losses': 5}, [
+                __element('pitcher', {'name': 'J. deGrom'})]),
+            __element('l_pitcher', {'wins': 3, 'losses': 6}, [
+                __element('pitcher', {'name': 'C. Sabathia'})]),
+            __element('sv_pitcher', {'saves': 0}, [
+                __element('pitcher', {'name': ''})]),
+        ]
+        games.append(__element('go_game', {}, children))
+    return __element('scoreboard', {}, games)
+
+
+def __batter(team, number, raw):
+    name, first = __name(team, number)
+    data = {'id': 400000 + team * 100 + number, 'name': name,
+            'name_display_first_last': first + ' ' + name,
+            'pos': POSITIONS[number % 9], 'ab': 4, 'r': number % 2,
+            'h': number % 3, 'd': 0, 't': 0, 'hr': number % 4 == 0 and 1 or 0,
+            'rbi': number % 3, 'bb': number % 2, 'so': 1, 'sb': 0, 'cs': 0,
+            'hbp': 0, 'sac': 0, 'sf': 0, 'lob': 1, 'a': 1, 'po': 2, 'e': 0,
+            'go': 1, 'ao': 1, 'avg': '.261', 'obp': '.330', 'slg': '.412',
+            'ops': '.742', 'fldg': '1.000'}
+    if not raw:
+        data.update({'bo': 100 * number, 's_bb': 14, 's_h': 28, 's_hr': 3,
+                     's_r': 12, 's_rbi': 9, 's_so': 42})
+    return data
+
+
+def __pitcher(team, number, raw):
+    name, first = __name(team, number)
+    data = {'id': 500000 + team * 100 + number, 'name': name,
+            'name_display_first_last': first + ' ' + name, 'pos': 'P',
+            'out': 21 if number == 1 else 3, 'bf': 26, 'er': 0, 'r': 0,
+            'h': 4, 'so': 8, 'hr': 0, 'bb': 1, 'np': 103, 's': 69,
+            'era': '2.41', 'go': 6, 'ao': 7}
+    if not raw:
+        data.update({'w': 7, 'l': 5, 'sv': 0, 'bs': 0, 'hld': 0,
+                     's_ip': '119.2', 's_h': 101, 's_r': 35, 's_er': 32,
+                     's_bb': 26, 's_so': 117, 'game_score': 80,
+                     'note': '(W, 7-5)', 'win': 'true'})
+    return data
+
+
+def boxscore_xml(raw=False):
+    children = []
+    if not raw:
+        children.append(__element('linescore', {'home_team_runs': 7}, [
+            __element('inning_line_score',
+                      {'inning': x, 'home': x % 3, 'away': x % 2})
+            for x in range(1, 10)]))
+    for flag, team in (('away', 147), ('home', 121)):
+        pitchers = [__element('pitcher', __pitcher(team, x, raw))
+                    for x in range(1, 5)]
+        batters = [__element('batter', __batter(team, x, raw))
+                   for x in range(1, 15)]
+        pitching = {'team_flag': flag, 'out': 27, 'h': 6, 'r': 1, 'er': 1,
+                    'bb': 2, 'so': 10, 'hr': 1, 'bf': 35, 'era': '3.35'}
+        batting = {'team_flag': flag, 'ab': 35, 'r': 7, 'h': 10, 'd': 3,
+                   't': 0, 'hr': 2, 'rbi': 7, 'bb': 0, 'so': 5, 'lob': 10,
+                   'po': 27, 'da': 7, 'avg': '.238', 'obp': '.309',
+                   'slg': '.408', 'ops': '.717'}
+        if raw:
+            pitching.pop('team_flag')
+            batting.pop('team_flag')
+            children.append(__element('team', {'team_flag': flag}, [
+                __element('pitching', pitching, pitchers),
+                __element('batting', batting, batters)]))
+        else:
+            children.append(__element('pitching', pitching, pitchers))
+            children.append(__element('batting', batting, batters))
+    return __element('boxscore', {'game_id': GAME_ID.replace('_', '/')},
+                     children)
+
+
+def game_events_xml():
+    innings = []
+    num = 0
+    score = {'home': 0, 'away': 0}
+    for inning in range(1, 10):
+        halves = []
+        for half in ('top', 'bottom'):
+            side = 'away' if half == 'top' else 'home'
+            atbats = []
+            for x in range(4):
+                num += 1
+                event = EVENTS[num % len(EVENTS)]
+                outs = (1, 1, 2, 3)[x]
+                if event[0] == 'Single' and x == 3:
+                    score[side] += 1
+                pitches = []
+                for y in range(4):
+                    pitch = PITCHES[(num + y) % len(PITCHES)]
+                    pitches.append(__element('pitch', {
+                        'sv_id': '160802_19{0:04d}'.format(num * 4 + y),
+                        'des': pitch[0], 'des_es': pitch[1],
+                        'type': pitch[2], 'pitch_type': pitch[3],
+                        'start_speed': '9{0}.{1}'.format(y, num % 10)}))
+                atbats.append(__element('atbat', {
+                    'num': num, 'b': 1, 's': 2, 'o': outs,
+                    'batter': 400000 + num, 'pitcher': 594798,
+                    'b1': 400000 + num if event[0] in ('Single', 'Walk')
+                    else '', 'b2': '', 'b3': '',
+                    'event_num': num * 6, 'event': event[0],
+                    'event_es': event[1],
+                    'home_team_runs': score['home'],
+                    'away_team_runs': score['away'],
+                    'start_tfs': 231105, 'play_guid':
+                    'e91fe0bf-6e1e-40a3-953c-{0:012d}'.format(num),
+                    'start_tfs_zulu': '2016-08-02T23:11:05Z',
+                    'des': 'Batter {0} {1}.  '.format(num, event[2]),
+                    'des_es': 'Bateador {0} {1}.  '.format(num, event[1])},
+                    pitches))
+            halves.append(__element(half, {}, atbats))
+        innings.append(__element('inning', {'num': inning}, halves))
+    return __element('game', {}, innings)
+
+
+def linescore_xml():
+    import benchmarks.object_conversion
+    return __element('game', benchmarks.object_conversion.OVERVIEW, [])
+
+
+def players_xml():
+    teams = []
+    for kind, team in (('away', 147), ('home', 121)):
+        players = []
+        for x in range(1, 26):
+            name, first = __name(team, x)
+            players.append(__element('player', {
+                'id': 400000 + team * 100 + x, 'first': first, 'last': name,
+                'num': x, 'boxname': name, 'rl': 'R', 'bats': 'R',
+                'position': POSITIONS[x % 9],
+                'current_position': POSITIONS[x % 9], 'status': 'A',
+                'team_abbrev': 'NYM', 'team_id': team,
+                'parent_team_abbrev': 'NYM', 'parent_team_id': team,
+                'avg': '.261', 'hr': 3, 'rbi': 9, 'wins': 0, 'losses': 0,
+                'era': '-'}))
+        coaches = [__element('coach', {
+            'id': 100000 + x, 'first': 'Coach', 'last': str(x), 'num': x,
+            'position': 'coach'}) for x in range(1, 8)]
+        teams.append(__element('team', {'type': kind, 'id': team,
+                                        'name': 'Team'}, players + coaches))
+    umpires = __element('umpires', {}, [__element('umpire', {
+        'id': 200000 + x, 'first': 'Ump', 'last': str(x),
+        'name': 'Ump ' + str(x), 'position': x}) for x in range(1, 5)])
+    return __element('game', {}, teams + [umpires])
+
+
+def properties_xml():
+    teams = []
+    for team in TEAMS:
+        teams.append(__element('team', {
+            'id': 36000 + team[0], 'team_id': team[0],
+            'club_id': team[0] - 100,
+            'team_code': team[1], 'club': team[2], 'display_code': team[2],
+            'historical_team_code': team[1].upper(), 'city': team[3],
+            'location': team[3], 'club_common_name': team[4],
+            'club_full_name': team[3] + ' ' + team[4],
+            'name_display_short': team[3] + ' ' + team[4],
+            'name_display_long': 'The ' + team[3] + ' ' + team[4],
+            'league': team[5], 'division': team[6], 'venue_id': 3289,
+            'timezone': 'ET', 'primary': '#003581', 'country': 'USA'}))
+    league = __element('league', {
+        'id': 35003, 'club': 'mlb', 'club_id': 1,
+        'club_full_name': 'Major League Baseball', 'club_common_name': 'MLB',
+        'league': 'Major', 'url_prod': 'www.mlb.com'},
+        [__element('teams', {}, teams)])
+    return __element('mlb', {}, [__element('leagues', {}, [league])])
+
+
+def roster_json():
+    rows = []
+    for x in range(1, 41):
+        name, first = __name(121, x)
+        rows.append({
+            'player_id': str(400000 + x), 'name_first': first,
+            'name_last': name, 'name_use': first,
+            'name_full': first + ' ' + name,
+            'name_display_first_last': first + ' ' + name,
+            'name_display_last_first': name + ', ' + first,
+            'position_txt': POSITIONS[x % 9], 'primary_position': str(x % 9),
+            'jersey_number': str(x), 'bats': 'R', 'throws': 'R',
+            'height_feet': '6', 'height_inches': '2', 'weight': '205',
+            'birth_date': '1988-06-19T00:00:00', 'college': '',
+            'pro_debut_date': '2014-05-15T00:00:00', 'start_date': '',
+            'end_date': '', 'starter_sw': 'N', 'status_code': 'A',
+            'team_abbrev': 'NYM', 'team_code': 'nyn', 'team_id': '121',
+            'team_name': 'New York Mets'})
+    return {'roster_40': {'queryResults': {'row': rows}}}
+
+
+def standings_json():
+    leagues = []
+    ids = {('American', 'East'): '201', ('American', 'Central'): '202',
+           ('American', 'West'): '200', ('National', 'East'): '204',
+           ('National', 'Central'): '205', ('National', 'West'): '203'}
+    for league_id, league in (('103', 'American'), ('104', 'National')):
+        rows = []
+        for team in TEAMS:
+            if team[5] != league:
+                continue
+            rows.append({
+                'team_id': str(team[0]), 'team_full': team[3] + ' ' + team[4],
+                'team_short': team[3], 'team_abbrev': team[2].upper(),
+                'file_code': team[2], 'division_id': ids[(league, team[6])],
+                'division': '{0} League {1}'.format(league, team[6]),
+                'w': '55', 'l': '50', 'pct': '.524', 'gb': '-',
+                'gb_wildcard': '', 'place': '1', 'home': '30-22',
+                'away': '25-28', 'last_ten': '6-4', 'streak': 'W2',
+                'runs': '450', 'opp_runs': '430', 'x_wl': '56-49',
+                'division_odds': '54.4', 'playoff_odds': '77.1',
+                'wildcard_odds': '22.7', 'sit_code': 'h0'})
+        leagues.append({'league_id': league_id,
+                        'queryResults': {'row': rows}})
+    data = {'standings_all_date_rptr': {'standings_all_date': leagues}}
+    return {'standings_schedule_date': data,
+            'historical_standings_schedule_date': data}
+
+
+def injury_json():
+    rows = []
+    for x in range(1, 151):
+        team = TEAMS[x % len(TEAMS)]
+        rows.append({
+            'player_id': str(600000 + x), 'name_first': 'First{0}'.format(x),
+            'name_last': 'Player{0}'.format(x),
+            'position': POSITIONS[x % 9], 'team_id': str(team[0]),
+            'team_name': team[4], 'league_id': '103',
+            'injury_status': ('10-day DL', '60-day DL', 'Day-to-day')[x % 3],
+            'injury_desc': 'Right hamstring strain',
+            'injury_update': 'Began a rehab assignment.',
+            'due_back': 'Mid-August',
+            'insert_ts': '2016-07-{0:02d}T12:00:00'.format(x % 28 + 1),
+            'display_ts': '2016-08-01T12:00:00'})
+    return {'wsfb_news_injury': {'queryResults': {'row': rows}}}
+
+
+def generate(directory=DIRECTORY):
+    """Write generated fixtures to `directory`."""
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    files = {
+        'scoreboard.xml': scoreboard_xml(),
+        'boxscore.xml': boxscore_xml(),
+        'rawboxscore.xml': boxscore_xml(raw=True),
+        'game_events.xml': game_events_xml(),
+        'linescore.xml': linescore_xml(),
+        'players.xml': players_xml(),
+        'mlb_properties.xml': properties_xml(),
+        'roster.json': json.dumps(roster_json(), indent=1),
+        'standings.json': json.dumps(standings_json(), indent=1),
+        'injury.json': json.dumps(injury_json(), indent=1),
+    }
+    for name in sorted(files):
+        with open(os.path.join(directory, name), 'w') as f:
+            f.write(files[name] + '\n')
+
+
+def record(game_id=GAME_ID, directory=DIRECTORY):
+    """Download the files of `game_id` and the league files to
+    `directory`."""
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    year, month, day = mlbgame.data.get_date_from_game_id(game_id)
+    date = datetime(year, month, day)
+    sources = {
+        'scoreboard.xml': mlbgame.data.get_scoreboard(year, month, day),
+        'boxscore.xml': mlbgame.data.get_box_score(game_id),
+        'rawboxscore.xml': mlbgame.data.get_raw_box_score(game_id),
+        'game_events.xml': mlbgame.data.get_game_events(game_id),
+        'linescore.xml': mlbgame.data.get_overview(game_id),
+        'players.xml': mlbgame.data.get_players(game_id),
+        'mlb_properties.xml': mlbgame.data.get_properties(),
+        'roster.json': mlbgame.data.get_roster(121),
+        'standings.json': mlbgame.data.get_historical_standings(date),
+        'injury.json': mlbgame.data.get_injuries(),
+    }
+    for name in sorted(sources):
+        with open(os.path.join(directory, name), 'wb') as f:
+            shutil.copyfileobj(sources[name], f)
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    directory = DIRECTORY
+
+    def do_GET(self):
+        name = self.path.split('?', 1)[0].rstrip('/').rsplit('/', 1)[-1]
+        path = os.path.join(self.directory, FILES.get(name, name))
+        if name not in FILES or not os.path.isfile(path):
+            self.send_error(404)
+            return
+        with open(path, 'rb') as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+# url templates of `mlbgame.data` and their paths on the local server
+URLS = {
+    'BASE_URL': '/components/game/mlb/year_{0}/month_{1:02d}/day_{2:02d}/',
+    'GAME_URL': ('/components/game/mlb/year_{0}/month_{1:02d}/'
+                 'day_{2:02d}/gid_{3}/{4}'),
+    'PROPERTY_URL': '/properties/mlb_properties.xml',
+    'ROSTER_URL': '/lookup/json/named.roster_40.bam?team_id={0}',
+    'INJURY_URL': '/fantasylookup/json/named.wsfb_news_injury.bam',
+    'STANDINGS_URL': ('/lookup/json/named.standings_schedule_date.bam?'
+                      'season={0}&date={1}'),
+    'STANDINGS_HISTORICAL_URL': ('/lookup/json/named.historical_standings_'
+                                 'schedule_date.bam?season={0}&date={1}'),
+}
+
+
+class serve(object):
+    """Context manager that serves the fixtures over HTTP on localhost
+    and points the url templates of `mlbgame.data` at them."""
+
+    def __init__(self, directory=DIRECTORY):
+        self.directory = directory
+
+    def __enter__(self):
+        handler = type('Handler', (_Handler,), {'directory': self.directory})
+        self.server = _Server(('127.0.0.1', 0), handler)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        root = 'http://127.0.0.1:{0}'.format(self.server.server_address[1])
+        self.saved = dict((x, getattr(mlbgame.data, x)) for x in URLS)
+        for x in URLS:
+            setattr(mlbgame.data, x, root + URLS[x])
+        return self
+
+    def __exit__(self, *args):
+        for x in self.saved:
+            setattr(mlbgame.data, x, self.saved[x])
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('action', choices=['generate', 'record'])
+    parser.add_argument('game_id', nargs='?', default=GAME_ID)
+    args = parser.parse_args()
+    if args.action == 'generate':
+        generate()
+    else:
+        record(args.game_id)
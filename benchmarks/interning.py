@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+
+"""Measures the memory saved by interning repeated strings while
+parsing a season of game events.
+
+Every game is parsed from the game_events.xml fixture in
+`benchmarks/fixtures/`, nine innings of at bats with their pitches and
+the usual descriptions. Run with `python -m benchmarks.interning`, pass
+`--games` for a smaller load. Results are printed as JSON.
+"""
+
+from __future__ import print_function
+
+import argparse
+import io
+import json
+import os
+import tracemalloc
+
+import mlbgame
+import mlbgame.data
+import mlbgame.object
+
+import benchmarks.fixtures
+
+
+def load(games, body):
+    get_game_events = mlbgame.data.get_game_events
+    mlbgame.data.get_game_events = lambda x: io.BytesIO(body)
+    mlbgame.object.clear_interned()
+    try:
+        tracemalloc.start()
+        season = [mlbgame.game_events('2016_08_02_nyamlb_nynmlb_1')
+                  for x in range(games)]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    finally:
+        mlbgame.data.get_game_events = get_game_events
+    del season
+    return size
+
+
+def run(games=2430):
+    with open(os.path.join(benchmarks.fixtures.DIRECTORY,
+                           'game_events.xml'), 'rb') as f:
+        body = f.read()
+    size = mlbgame.object.INTERN_SIZE
+    mlbgame.object.INTERN_SIZE = 0
+    try:
+        plain = load(games, body)
+    finally:
+        mlbgame.object.INTERN_SIZE = size
+    interned = load(games, body)
+    result = {
+        'games': games,
+        'plain_mb': round(plain / 1048576.0, 1),
+        'interned_mb': round(interned / 1048576.0, 1),
+        'saved': round(1 - float(interned) / plain, 3)
+    }
+    return result
+
+
+def main(games=2430):
+    result = run(games)
+    print(json.dumps(result, indent=2))
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--games', type=int, default=2430)
+    main(parser.parse_args().games)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+"""Measures the construction time saved by lazy attribute conversion
+on a full season of objects.
+
+A season is 2430 games; every game builds an `Overview`, about 38
+`PlayerStats` and about 290 `Pitch` objects, of which only a few
+attributes are read. Run with `python -m benchmarks.lazy_objects`,
+pass `--games` for a smaller load. Results are printed as JSON.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import time
+
+import mlbgame.events
+import mlbgame.game
+import mlbgame.stats
+
+from benchmarks.object_conversion import BATTER, OVERVIEW, PITCH
+
+# objects per game and the attributes usually read from them
+LOADS = [
+    ('Overview', mlbgame.game.Overview, OVERVIEW, 1,
+     ('home_team_runs', 'away_team_runs', 'status')),
+    ('PlayerStats', mlbgame.stats.PlayerStats, BATTER, 38,
+     ('id', 'ab', 'h')),
+    ('Pitch', mlbgame.events.Pitch, PITCH, 290,
+     ('pitch_type', 'start_speed')),
+]
+
+
+def load(cls, data, count, attributes, lazy):
+    start = time.time()
+    # every object gets its own dictionary, like the parsers produce
+    objects = [cls(dict(data), lazy=lazy) for x in range(count)]
+    built = time.time() - start
+    for obj in objects:
+        for x in attributes:
+            getattr(obj, x)
+    return built, time.time() - start
+
+
+def run(games=2430):
+    results = []
+    for name, cls, data, per_game, attributes in LOADS:
+        count = games * per_game
+        eager = load(cls, data, count, attributes, False)
+        lazy = load(cls, data, count, attributes, True)
+        results.append({
+            'name': name,
+            'objects': count,
+            'eager_construct_seconds': round(eager[0], 3),
+            'lazy_construct_seconds': round(lazy[0], 3),
+            'eager_total_seconds': round(eager[1], 3),
+            'lazy_total_seconds': round(lazy[1], 3),
+            'construct_seconds_saved': round(eager[0] - lazy[0], 3)
+        })
+    return results
+
+
+def main(games=2430):
+    results = run(games)
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--games', type=int, default=2430)
+    main(parser.parse_args().games)
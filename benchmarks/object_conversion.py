@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+
+"""Compares building objects with `setobjattr()` against the
+`Schema` converters used by `mlbgame.object.Object`.
+
+Run with `python -m benchmarks.object_conversion` from the root of the
+repository, results are printed as JSON.
+"""
+
+from __future__ import print_function
+
+import json
+import timeit
+
+import mlbgame.events
+import mlbgame.game
+import mlbgame.object
+import mlbgame.stats
+
+BATTER = {
+    'a': '0', 'ab': '3', 'ao': '1', 'avg': '.211', 'bb': '0', 'bo': '100',
+    'cs': '0', 'd': '0', 'e': '0', 'fldg': '1.000', 'go': '1', 'h': '1',
+    'hbp': '0', 'hr': '1', 'id': '457477', 'lob': '0', 'name': 'De Aza',
+    'name_display_first_last': 'Alejandro De Aza', 'obp': '.300',
+    'ops': '.623', 'po': '5', 'pos': 'CF', 'r': '1', 'rbi': '2',
+    's_bb': '14', 's_h': '28', 's_hr': '3', 's_r': '12', 's_rbi': '9',
+    's_so': '42', 'sac': '0', 'sb': '0', 'sf': '0', 'slg': '.323',
+    'so': '0', 't': '0'
+}
+
+PITCH = {
+    'des': 'Ball', 'des_es': 'Bola mala', 'pitch_type': 'FT',
+    'start_speed': '95.2', 'sv_id': '160802_191121', 'type': 'B'
+}
+
+OVERVIEW = {
+    'ampm': 'PM', 'away_code': 'nya', 'away_division': 'E',
+    'away_file_code': 'nyy', 'away_games_back': '4.0',
+    'away_league_id': '103', 'away_loss': '52', 'away_name_abbrev': 'NYY',
+    'away_team_city': 'NY Yankees', 'away_team_errors': '1',
+    'away_team_hits': '6', 'away_team_id': '147', 'away_team_name': 'Yankees',
+    'away_team_runs': '1', 'away_time': '7:10', 'away_time_zone': 'ET',
+    'away_win': '54', 'day': 'TUE', 'double_header_sw': 'N',
+    'game_data_directory': '/components/game/mlb/year_2016/month_08/day_02/'
+                           'gid_2016_08_02_nyamlb_nynmlb_1',
+    'game_pk': '448418', 'game_type': 'R',
+    'gameday_link': '2016_08_02_nyamlb_nynmlb_1', 'home_code': 'nyn',
+    'home_division': 'E', 'home_league_id': '104', 'home_loss': '50',
+    'home_name_abbrev': 'NYM', 'home_team_city': 'NY Mets',
+    'home_team_errors': '0', 'home_team_hits': '10', 'home_team_id': '121',
+    'home_team_name': 'Mets', 'home_team_runs': '7', 'home_win': '55',
+    'id': '2016/08/02/nyamlb-nynmlb-1', 'inning': '9',
+    'inning_state': '', 'league': 'AN', 'location': 'Flushing, NY',
+    'original_date': '2016/08/02', 'scheduled_innings': '9',
+    'status': 'Final', 'time': '7:10', 'time_zone': 'ET',
+    'tv_station': 'SNY', 'venue': 'Citi Field', 'venue_id': '3289',
+}
+
+
+def legacy(cls, data):
+    obj = cls.__new__(cls)
+    for x in data:
+        mlbgame.object.setobjattr(obj, x, data[x])
+    return obj
+
+
+def compare(name, cls, data, number):
+    old = timeit.timeit(lambda: legacy(cls, data), number=number)
+    new = timeit.timeit(lambda: cls(data), number=number)
+    return {
+        'name': name,
+        'objects': number,
+        'setobjattr_seconds': round(old, 4),
+        'schema_seconds': round(new, 4),
+        'speedup': round(old / new, 2)
+    }
+
+
+def run(number=20000):
+    results = [
+        compare('PlayerStats', mlbgame.stats.PlayerStats, BATTER, number),
+        compare('Pitch', mlbgame.events.Pitch, PITCH, number),
+        compare('Overview', mlbgame.game.Overview, OVERVIEW, number),
+    ]
+    return results
+
+
+def main(number=20000):
+    results = run(number)
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == '__main__':
+    main()
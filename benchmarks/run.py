@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+
+"""Runs the benchmarks against the GameDay fixtures, without mlb.com.
+
+The files in `benchmarks/fixtures/` are served over HTTP on localhost,
+so every call goes through the same download, parse and object
+construction steps as it would against mlb.com, without the network
+noise. Run with `python -m benchmarks.run` from the root of the
+repository; results are printed as JSON, or written to `--output`.
+Pass `--all` to also run the object conversion, lazy object, slotted
+object and interning benchmarks, and `--phases` to add the totals of
+`mlbgame.metrics` for the fetch, parse and construct phases.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import platform
+import timeit
+from datetime import datetime
+
+import mlbgame
+import mlbgame.events
+import mlbgame.game
+import mlbgame.info
+import mlbgame.metrics
+import mlbgame.stats
+
+import benchmarks.fixtures
+
+GAME_ID = benchmarks.fixtures.GAME_ID
+DATE = datetime(2016, 8, 2)
+
+
+def __expire_properties():
+    # league and team calls should parse the properties file every time
+    mlbgame.info._PROPERTIES['expires'] = 0
+
+
+BENCHMARKS = [
+    # (name, function, setup)
+    ('game.scoreboard', lambda: mlbgame.game.scoreboard(2016, 8, 2), None),
+    ('game.box_score', lambda: mlbgame.game.box_score(GAME_ID), None),
+    ('game.overview', lambda: mlbgame.game.overview(GAME_ID), None),
+    ('game.players', lambda: mlbgame.game.players(GAME_ID), None),
+    ('stats.player_stats', lambda: mlbgame.stats.player_stats(GAME_ID),
+     None),
+    ('stats.team_stats', lambda: mlbgame.stats.team_stats(GAME_ID), None),
+    ('events.game_events', lambda: mlbgame.events.game_events(GAME_ID),
+     None),
+    ('info.league_info', mlbgame.info.league_info, __expire_properties),
+    ('info.roster', lambda: mlbgame.info.roster(121), None),
+    ('info.standings', lambda: mlbgame.info.standings(DATE), None),
+    ('info.injury', mlbgame.info.injury, None),
+    ('mlbgame.day', lambda: mlbgame.day(2016, 8, 2), None),
+    ('mlbgame.day(home)', lambda: mlbgame.day(2016, 8, 2, home='Mets'),
+     None),
+    ('mlbgame.box_score', lambda: mlbgame.box_score(GAME_ID), None),
+    ('mlbgame.overview', lambda: mlbgame.overview(GAME_ID), None),
+    ('mlbgame.players', lambda: mlbgame.players(GAME_ID), None),
+    ('mlbgame.player_stats', lambda: mlbgame.player_stats(GAME_ID), None),
+    ('mlbgame.team_stats', lambda: mlbgame.team_stats(GAME_ID), None),
+    ('mlbgame.game_stats', lambda: mlbgame.game_stats(GAME_ID), None),
+    ('mlbgame.game_events', lambda: mlbgame.game_events(GAME_ID), None),
+    ('mlbgame.league', mlbgame.league, __expire_properties),
+    ('mlbgame.teams', mlbgame.teams, __expire_properties),
+    ('mlbgame.roster', lambda: mlbgame.roster(121), None),
+    ('mlbgame.standings', lambda: mlbgame.standings(DATE), None),
+    ('mlbgame.injury', mlbgame.injury, None),
+]
+
+
+def measure(function, setup, repeat):
+    """Return the timings of `repeat` calls of `function` in milliseconds."""
+    times = []
+    # the first call warms up imports and schemas and is not counted
+    function()
+    for x in range(repeat):
+        if setup is not None:
+            setup()
+        start = timeit.default_timer()
+        function()
+        times.append((timeit.default_timer() - start) * 1000)
+    times.sort()
+    return {
+        'calls': repeat,
+        'min_ms': round(times[0], 3),
+        'median_ms': round(times[len(times) // 2], 3),
+        'mean_ms': round(sum(times) / len(times), 3)
+    }
+
+
+def run(repeat=20, directory=benchmarks.fixtures.DIRECTORY, names=None):
+    """Return the results of the fixture benchmarks matching `names`."""
+    results = []
+    with benchmarks.fixtures.serve(directory):
+        for name, function, setup in BENCHMARKS:
+            if names and not any(name.startswith(x) for x in names):
+                continue
+            result = {'name': name}
+            result.update(measure(function, setup, repeat))
+            results.append(result)
+    return results
+
+
+def run_all(repeat=20, directory=benchmarks.fixtures.DIRECTORY, names=None):
+    """Return the results of the fixture benchmarks and of the object
+    benchmarks, with smaller loads than when those are run on their own.
+    """
+    import benchmarks.interning
+    import benchmarks.lazy_objects
+    import benchmarks.object_conversion
+    import benchmarks.slotted_objects
+    return {
+        'fixtures': run(repeat, directory, names),
+        'object_conversion': benchmarks.object_conversion.run(5000),
+        'lazy_objects': benchmarks.lazy_objects.run(100),
+        'slotted_objects': benchmarks.slotted_objects.run(5000),
+        'interning': benchmarks.interning.run(100),
+    }
+
+
+def main(repeat=20, output=None, everything=False, names=None,
+         phases=False):
+    mlbgame.metrics.collect(phases)
+    if everything:
+        results = run_all(repeat, names=names)
+    else:
+        results = {'fixtures': run(repeat, names=names)}
+    if phases:
+        results['phases'] = mlbgame.metrics.counters()
+        mlbgame.metrics.collect(False)
+    results['python'] = platform.python_version()
+    results['mlbgame'] = mlbgame.VERSION
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if output is None:
+        print(text)
+    else:
+        with open(output, 'w') as f:
+            f.write(text + '\n')
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('names', nargs='*',
+                        help='only run benchmarks starting with these names')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output')
+    parser.add_argument('--all', action='store_true', dest='everything')
+    parser.add_argument('--phases', action='store_true')
+    args = parser.parse_args()
+    main(args.repeat, args.output, args.everything, args.names, args.phases)
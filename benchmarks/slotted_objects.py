@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+
+"""Compares the memory used by dict backed objects and by their
+`slotted()` variants.
+
+Run with `python -m benchmarks.slotted_objects`, results are printed
+as JSON.
+"""
+
+from __future__ import print_function
+
+import json
+import tracemalloc
+
+import mlbgame.events
+import mlbgame.game
+import mlbgame.object
+import mlbgame.stats
+
+from benchmarks.object_conversion import BATTER, OVERVIEW, PITCH
+
+CLASSES = [
+    ('Overview', mlbgame.game.Overview, OVERVIEW),
+    ('PlayerStats', mlbgame.stats.PlayerStats, BATTER),
+    ('Pitch', mlbgame.events.Pitch, PITCH),
+]
+
+
+def measure(cls, data, count):
+    # copies of the data are made first so only the objects are counted
+    rows = [dict(data) for x in range(count)]
+    tracemalloc.start()
+    objects = [cls(x) for x in rows]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return float(size) / count
+
+
+def run(count=20000):
+    results = []
+    for name, cls, data in CLASSES:
+        plain = measure(cls, data, count)
+        mlbgame.object.SLOTS = True
+        try:
+            slots = measure(cls, data, count)
+        finally:
+            mlbgame.object.SLOTS = False
+        results.append({
+            'name': name,
+            'objects': count,
+            'dict_bytes_per_object': round(plain),
+            'slots_bytes_per_object': round(slots),
+            'saved': round(1 - slots / plain, 3)
+        })
+    return results
+
+
+def main(count=20000):
+    results = run(count)
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == '__main__':
+    main()
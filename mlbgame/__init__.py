@@ -123,18 +123,43 @@ And the output is:
 
 """
 
-import mlbgame.events
-import mlbgame.game
-import mlbgame.info
-import mlbgame.stats
 import mlbgame.version
 
 import calendar
 from datetime import date, datetime
+import importlib
+import sys
 
 VERSION = mlbgame.version.__version__
 """Installed version of mlbgame."""
 
+SUBMODULES = ('backfill', 'cache', 'data', 'events', 'feed', 'game', 'info',
+              'live', 'metrics', 'object', 'search', 'season', 'serve',
+              'shared', 'snapshots', 'states', 'stats', 'warehouse')
+"""Submodules that are imported the first time they are used, so
+`import mlbgame` does not load lxml and urllib until they are needed.
+Before python 3.7 the others have to be imported, e.g. `import
+mlbgame.cache`."""
+
+
+def __getattr__(name):
+    # only called for names that are not set, i.e. submodules not imported yet
+    if name in SUBMODULES:
+        return importlib.import_module('mlbgame.' + name)
+    raise AttributeError(
+        "module 'mlbgame' has no attribute '{0}'".format(name))
+
+
+def __dir__():
+    return sorted(set(globals()).union(SUBMODULES))
+
+
+if sys.version_info < (3, 7):
+    # module __getattr__ is only supported from python 3.7, so the
+    # submodules the functions below use are imported now
+    for x in ('events', 'game', 'info', 'states', 'stats'):
+        importlib.import_module('mlbgame.' + x)
+
 
 def day(year, month, day, home=None, away=None):
     """Return a list of games for a certain day.
@@ -149,7 +174,10 @@ def day(year, month, day, home=None, away=None):
         return []
     # get data
     data = mlbgame.game.scoreboard(year, month, day, home=home, away=away)
-    return [mlbgame.game.GameScoreboard(data[x]) for x in data]
+    start = mlbgame.metrics.start()
+    output = [mlbgame.game.GameScoreboard(data[x]) for x in data]
+    mlbgame.metrics.stop('construct', 'scoreboard', start, objects=len(output))
+    return output
 
 
 def games(years, months=None, days=None, home=None, away=None):
@@ -188,19 +216,29 @@ def box_score(game_id):
     """Return box score for game matching the game id."""
     # get box score data
     data = mlbgame.game.box_score(game_id)
+    start = mlbgame.metrics.start()
     # create object with data
     obj = mlbgame.game.GameBoxScore(data)
+    mlbgame.metrics.stop('construct', 'box_score', start, built=obj)
     return obj
 
 
 def overview(game_id):
     """Return Overview object that contains game information."""
-    return mlbgame.game.Overview(mlbgame.game.overview(game_id))
+    data = mlbgame.game.overview(game_id)
+    start = mlbgame.metrics.start()
+    obj = mlbgame.game.Overview(data)
+    mlbgame.metrics.stop('construct', 'overview', start, objects=1)
+    return obj
 
 
 def players(game_id):
     """Return list players/coaches/umpires for game matching the game id."""
-    return mlbgame.game.Players(mlbgame.game.players(game_id))
+    data = mlbgame.game.players(game_id)
+    start = mlbgame.metrics.start()
+    obj = mlbgame.game.Players(data)
+    mlbgame.metrics.stop('construct', 'players', start, built=obj)
+    return obj
 
 
 def combine_games(games):
@@ -212,36 +250,104 @@ def player_stats(game_id):
     """Return dictionary of player stats for game matching the game id."""
     # get information for that game
     data = mlbgame.stats.player_stats(game_id)
-    return mlbgame.stats.Stats(data, game_id, True)
+    start = mlbgame.metrics.start()
+    obj = mlbgame.stats.Stats(data, game_id, True)
+    mlbgame.metrics.stop('construct', 'player_stats', start, built=obj)
+    return obj
 
 
 def team_stats(game_id):
     """Return dictionary of team stats for game matching the game id."""
     # get data
     data = mlbgame.stats.team_stats(game_id)
-    return mlbgame.stats.Stats(data, game_id, False)
+    start = mlbgame.metrics.start()
+    obj = mlbgame.stats.Stats(data, game_id, False)
+    mlbgame.metrics.stop('construct', 'team_stats', start, built=obj)
+    return obj
+
+
+def game_stats(game_id):
+    """Return GameStats object that contains both the player and the team
+    stats for game matching the game id.
+
+    Use this instead of calling `player_stats()` and `team_stats()` for the
+    same game, as the box score files are only fetched and parsed once.
+    """
+    data = mlbgame.stats.game_stats(game_id)
+    start = mlbgame.metrics.start()
+    obj = mlbgame.stats.GameStats(data, game_id)
+    mlbgame.metrics.stop('construct', 'game_stats', start, built=obj)
+    return obj
 
 
 def game_events(game_id):
     """Return dictionary of game events for game matching the game id."""
     data = mlbgame.events.game_events(game_id)
-    return [mlbgame.events.Inning(data[x], x) for x in data]
+    start = mlbgame.metrics.start()
+    output = [mlbgame.events.Inning(data[x], x) for x in data]
+    mlbgame.metrics.stop('construct', 'game_events', start,
+                         objects=len(output))
+    return output
+
+
+def base_out_states(game_id):
+    """Return list of base/out state transitions for game matching the
+    game id."""
+    data = mlbgame.states.base_out_states(game_id)
+    return [mlbgame.states.StateTransition(x) for x in data]
+
+
+def run_expectancy(game_ids, truncated=False):
+    """Return RunExpectancy object built from the games matching the
+    game ids.
+
+    Half innings that ended with fewer than three outs, e.g. walk-offs,
+    are only counted if `truncated` is True."""
+    table = mlbgame.states.StateTable()
+    for game_id in game_ids:
+        table.add_game(game_id, mlbgame.states.base_out_states(game_id))
+    return table.run_expectancy(truncated)
 
 
 def league():
     """Return Info object that contains league information"""
-    return mlbgame.info.Info(mlbgame.info.league_info())
+    data = mlbgame.info.league_info()
+    start = mlbgame.metrics.start()
+    obj = mlbgame.info.Info(data)
+    mlbgame.metrics.stop('construct', 'league_info', start, objects=1)
+    return obj
 
 
 def teams():
     """Return list of Info objects for each team"""
-    return [mlbgame.info.Info(x) for x in mlbgame.info.team_info()]
+    data = mlbgame.info.team_info()
+    start = mlbgame.metrics.start()
+    output = [mlbgame.info.Info(x) for x in data]
+    mlbgame.metrics.stop('construct', 'team_info', start, objects=len(output))
+    return output
 
 
 def roster(team_id):
     """Return Roster object that contains roster info for a team"""
     data = mlbgame.info.roster(team_id)
-    return mlbgame.info.Roster(data)
+    start = mlbgame.metrics.start()
+    obj = mlbgame.info.Roster(data)
+    mlbgame.metrics.stop('construct', 'roster', start, built=obj)
+    return obj
+
+
+def rosters(team_ids=None, workers=8):
+    """Return PlayerDirectory object with the players on the rosters of the
+    teams matching the team ids
+
+    Leave `team_ids` empty to get every team. The rosters are fetched
+    concurrently by `workers` threads.
+    """
+    data = mlbgame.info.rosters(team_ids, workers)
+    start = mlbgame.metrics.start()
+    obj = mlbgame.info.PlayerDirectory(data)
+    mlbgame.metrics.stop('construct', 'rosters', start, built=obj)
+    return obj
 
 
 def standings(date=datetime.now()):
@@ -251,10 +357,36 @@ def standings(date=datetime.now()):
     leave empty to get current standings
     """
     data = mlbgame.info.standings(date)
-    return mlbgame.info.Standings(data)
+    start = mlbgame.metrics.start()
+    obj = mlbgame.info.Standings(data)
+    mlbgame.metrics.stop('construct', 'standings', start, built=obj)
+    return obj
+
+
+def standings_series(start, end, games=None, seed=None):
+    """Return list of (date, Standings object) for every day from `start`
+    to `end`
+
+    The standings are computed from the final scores of the games instead
+    of being requested for each day. Unless `seed`, a Standings object with
+    the records before `start`, is given, `start` should be opening day.
+    `games` can be a list of GameScoreboard objects that were already
+    loaded, e.g. from `combine_games()`.
+    """
+    data = mlbgame.info.standings_series(start, end, games, seed)
+    return [(x[0], mlbgame.info.Standings(x[1])) for x in data]
 
 
 def injury():
     """Return Injuries object that contains injury info"""
     data = mlbgame.info.injury()
-    return mlbgame.info.Injuries(data)
+    start = mlbgame.metrics.start()
+    obj = mlbgame.info.Injuries(data)
+    mlbgame.metrics.stop('construct', 'injury', start, built=obj)
+    return obj
+
+
+def injury_watcher():
+    """Return InjuryWatcher object whose `poll()` returns only the injuries
+    that were added, removed or updated since the last poll"""
+    return mlbgame.info.InjuryWatcher()
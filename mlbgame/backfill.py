@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+
+"""Module that backfills historical games in jobs that can be stopped
+and resumed.
+
+    def store(game_id, data):
+        ...  # data['player_stats'], data['game_events']
+
+    runner = mlbgame.backfill.Backfill('backfill.json', store=store)
+    runner.run(range(2007, 2017), months=range(3, 11))
+
+The game ids come from the scoreboard of every day, and the final games
+are processed by a pool of `workers` threads. The outcome of every day
+and game is kept in a JSON checkpoint file, which is replaced atomically
+every `save_every` games, so a run that is stopped or crashes goes on
+where it was: days and games that are done are not fetched again, and
+games that failed are retried until they failed `retries` times.
+"""
+
+import mlbgame.events
+import mlbgame.game
+import mlbgame.info
+import mlbgame.stats
+
+import calendar
+import json
+from multiprocessing.pool import ThreadPool
+import os
+import tempfile
+import time
+
+# looked up when called, so the functions can be replaced
+JOBS = {
+    'player_stats': lambda x: mlbgame.stats.player_stats(x),
+    'game_events': lambda x: mlbgame.events.game_events(x)
+}
+"""Functions called with the id of every game by default, by name."""
+
+
+def _scoreboard(date):
+    # the final games of a day, None if the scoreboard can not be read
+    try:
+        games = mlbgame.game.scoreboard(*[int(x) for x in date.split('-')])
+    except Exception:
+        return date, None
+    if not isinstance(games, dict):
+        # the [] of the fallback file of a scoreboard that was not fetched,
+        # a day without games is {}
+        return date, None
+    return date, sorted(x for x in games
+                        if str(games[x].get('game_status')).upper()
+                        in mlbgame.info.FINAL_STATUSES)
+
+
+def _process(args):
+    # runs in a worker thread, never raises
+    game_id, jobs = args
+    data = {}
+    try:
+        for name in sorted(jobs):
+            data[name] = jobs[name](game_id)
+    except Exception as e:
+        return game_id, None, '{0}: {1}'.format(type(e).__name__, e)
+    return game_id, data, None
+
+
+class Backfill(object):
+    """Resumable backfill of the games of many days
+
+    Properties:
+        checkpoint
+        jobs
+        path
+        retries
+        save_every
+        workers
+    """
+
+    def __init__(self, path, jobs=None, store=None, workers=4, retries=3,
+                 save_every=25):
+        """Creates a backfill whose checkpoint is the file at `path`.
+
+        `jobs` are the functions called with every game id, by name
+        (default `JOBS`), and `store` is called in the main thread with
+        the game id and a dictionary of the results of the jobs.
+        """
+        self.path = path
+        self.jobs = JOBS if jobs is None else jobs
+        self.workers = workers
+        self.retries = retries
+        self.save_every = save_every
+        self.__store = store
+        self.checkpoint = {'days': {}, 'games': {}}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.checkpoint = json.load(f)
+
+    def save(self):
+        """Write the checkpoint file, replacing it atomically."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        handle, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'w') as f:
+                json.dump(self.checkpoint, f, sort_keys=True)
+            getattr(os, 'replace', os.rename)(temporary, self.path)
+        except Exception:
+            os.remove(temporary)
+            raise
+
+    def game_ids(self, years, months=None, days=None):
+        """Return the ids of the final games of the days, like the
+        arguments of `mlbgame.games()`.
+
+        The scoreboards that are not in the checkpoint are read by the
+        pool. Days whose scoreboard can not be read are left out, and read
+        again by the next call.
+        """
+        years = [years] if isinstance(years, int) else years
+        months = range(1, 13) if months is None else \
+            [months] if isinstance(months, int) else months
+        dates = []
+        for year in years:
+            for month in months:
+                last = calendar.monthrange(year, month)[1]
+                for day in (range(1, last + 1) if days is None else
+                            [days] if isinstance(days, int) else days):
+                    if day <= last:
+                        dates.append('{0:04d}-{1:02d}-{2:02d}'.format(
+                            year, month, day))
+        known = self.checkpoint['days']
+        pool = ThreadPool(self.workers)
+        try:
+            for date, game_ids in pool.imap_unordered(
+                    _scoreboard, [x for x in dates if x not in known]):
+                if game_ids is not None:
+                    known[date] = game_ids
+        finally:
+            pool.terminate()
+        return [y for x in dates for y in known.get(x, [])]
+
+    def pending(self, game_ids):
+        """Return the ids in `game_ids` that are not done and did not fail
+        `retries` times yet."""
+        games = self.checkpoint['games']
+        return [x for x in game_ids
+                if games.get(x, {}).get('status') != 'done'
+                and games.get(x, {}).get('attempts', 0) < self.retries]
+
+    def failed(self):
+        """Return the error of every game that failed, by id."""
+        return dict((x, y['error'])
+                    for x, y in self.checkpoint['games'].items()
+                    if y['status'] == 'failed')
+
+    def reset_failed(self):
+        """Let the games that failed `retries` times be tried again."""
+        for x in self.checkpoint['games'].values():
+            if x['status'] == 'failed':
+                x['attempts'] = 0
+
+    def __record(self, game_id, data, error):
+        if error is None and self.__store is not None:
+            try:
+                self.__store(game_id, data)
+            except Exception as e:
+                error = '{0}: {1}'.format(type(e).__name__, e)
+        # recorded once stored, a run stopped while storing redoes the game
+        game = self.checkpoint['games'].setdefault(game_id, {'attempts': 0})
+        game['attempts'] += 1
+        game['status'] = 'failed' if error else 'done'
+        game['error'] = error
+        return error is None
+
+    def run(self, years, months=None, days=None, retry_delay=5):
+        """Process the final games of the days that are not done yet.
+
+        Games that fail are retried after `retry_delay` seconds, until
+        they are done or failed `retries` times. Returns the number of
+        games that were `done` by this run and of those that `failed`.
+        """
+        game_ids = self.game_ids(years, months, days)
+        self.save()
+        done = 0
+        pool = ThreadPool(self.workers)
+        try:
+            pending = self.pending(game_ids)
+            while pending:
+                work = [(x, self.jobs) for x in pending]
+                for i, result in enumerate(
+                        pool.imap_unordered(_process, work), 1):
+                    done += self.__record(*result)
+                    if i % self.save_every == 0:
+                        self.save()
+                self.save()
+                pending = self.pending(game_ids)
+                if pending and retry_delay:
+                    time.sleep(retry_delay)
+        finally:
+            pool.terminate()
+            self.save()
+        failed = self.failed()
+        return {'done': done,
+                'failed': len([x for x in game_ids if x in failed])}
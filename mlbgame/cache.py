@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+
+"""Module that keeps the files fetched by `mlbgame.data` on disk, so
+that several processes can share them.
+
+The cache is off until `DIRECTORY` is set, either here or with the
+`MLBGAME_CACHE_DIR` environment variable:
+
+    mlbgame.cache.DIRECTORY = '/var/cache/mlbgame'
+
+Files are written to a temporary file and renamed into place, so a
+reader never sees half of a file. When a file is missing, the process
+that wants it takes an advisory lock (`fcntl.flock`) while it downloads;
+other processes that want the same file wait for the lock and then read
+what was written instead of downloading it again. The locks are a fixed
+set of 256 files in `locks/`, picked by the hash of the url. Where
+`fcntl` is not available the writes are still atomic, but processes may
+download the same file at the same time.
+
+Scoreboards, linescores, game events and box scores change while games
+are played; they are only used for `LIVE_TTL` seconds, other files for
+`TTL`.
+
+Bodies are stored once per content, compressed with zlib, in `blobs/`
+under the sha1 of the body. Every url has a small index file in `urls/`
+with the hash and size of its body, whose age is the age of the entry.
+A boxscore fetched on many days or the same fallback file of many urls
+thus takes the space of one file. `report()` shows how much that saves:
+
+    python -m mlbgame.cache /var/cache/mlbgame
+"""
+
+from __future__ import print_function
+
+import argparse
+import contextlib
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+import zlib
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+DIRECTORY = os.environ.get('MLBGAME_CACHE_DIR') or None
+"""Directory of the cache, None turns the cache off."""
+
+TTL = 300
+"""Seconds a cached file is used before it is fetched again, None to keep
+files until `clear()` is called."""
+
+LIVE_TTL = 10
+"""Seconds a live file, one that changes while games are played, is used
+before it is fetched again; at most `TTL`. None to use `TTL`."""
+
+COMPRESSION = 6
+"""zlib level of the stored bodies."""
+
+
+def path(url):
+    """Return the name of the index file of `url`."""
+    key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    return os.path.join(DIRECTORY, 'urls', key[:2], key)
+
+
+def _blob(key):
+    return os.path.join(DIRECTORY, 'blobs', key[:2], key)
+
+
+def _makedirs(directory):
+    if not os.path.isdir(directory):
+        try:
+            os.makedirs(directory)
+        except OSError:
+            # made by another process in the meantime
+            if not os.path.isdir(directory):
+                raise
+
+
+def _replace(name, data):
+    # write to a temporary file and rename, readers see the old file or
+    # the new one
+    _makedirs(os.path.dirname(name))
+    handle, temporary = tempfile.mkstemp(dir=os.path.dirname(name),
+                                         suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as f:
+            f.write(data)
+        getattr(os, 'replace', os.rename)(temporary, name)
+    except Exception:
+        os.remove(temporary)
+        raise
+
+
+def _entry(name):
+    # hash and size of the body of an index file
+    with open(name, 'rb') as f:
+        key, size = f.read().decode('ascii').split()
+    return key, int(size)
+
+
+def _ttl(live):
+    # seconds an entry is fresh, None if it always is
+    if not live or LIVE_TTL is None:
+        return TTL
+    return LIVE_TTL if TTL is None else min(TTL, LIVE_TTL)
+
+
+def _read(name, ttl):
+    # the body of a fresh cache entry, None if it is missing or stale
+    try:
+        if ttl is not None and time.time() - os.path.getmtime(name) >= ttl:
+            return None
+        key, size = _entry(name)
+        with open(_blob(key), 'rb') as f:
+            return zlib.decompress(f.read())
+    except (IOError, OSError, ValueError, zlib.error):
+        return None
+
+
+def _write(name, body):
+    key = hashlib.sha1(body).hexdigest()
+    blob = _blob(key)
+    try:
+        # the same body is stored once; touched so prune() keeps it
+        os.utime(blob, None)
+    except OSError:
+        _replace(blob, zlib.compress(body, COMPRESSION))
+    _replace(name, '{0} {1}'.format(key, len(body)).encode('ascii'))
+
+
+@contextlib.contextmanager
+def _locked(name):
+    # urls share lock files by the first byte of their hash, so there is
+    # no lock file per url to clean up
+    if fcntl is None:
+        yield
+        return
+    lock = os.path.join(DIRECTORY, 'locks', os.path.basename(name)[:2])
+    _makedirs(os.path.dirname(lock))
+    with open(lock, 'a') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def fetch(url, download, live=False):
+    """Return the body of `url`, from the cache if it has a fresh copy.
+
+    Otherwise `download()` is called to get the body, which is then
+    cached. Errors of `download()` are not cached. `live` tells that the
+    file changes while games are played, so that its copy is only used
+    for `LIVE_TTL` seconds.
+    """
+    if DIRECTORY is None:
+        return download()
+    ttl = _ttl(live)
+    name = path(url)
+    body = _read(name, ttl)
+    if body is not None:
+        return body
+    with _locked(name):
+        # another process may have fetched it while we waited
+        body = _read(name, ttl)
+        if body is None:
+            body = download()
+            _write(name, body)
+    return body
+
+
+def clear():
+    """Delete every file in the cache."""
+    if DIRECTORY is not None and os.path.isdir(DIRECTORY):
+        for x in os.listdir(DIRECTORY):
+            shutil.rmtree(os.path.join(DIRECTORY, x), ignore_errors=True)
+
+
+def _files(directory):
+    # names of the files in a part of the cache, but temporary files
+    for root, directories, files in os.walk(os.path.join(DIRECTORY,
+                                                         directory)):
+        for x in files:
+            if not x.endswith('.tmp'):
+                yield os.path.join(root, x)
+
+
+def stats():
+    """Return the counts and sizes of the entries in the cache.
+
+    `bytes` is the size of the bodies of every url, `unique_bytes` that
+    of the distinct bodies and `stored_bytes` that of the compressed
+    blobs; `disk_bytes` counts every file of the cache.
+    """
+    output = {'urls': 0, 'blobs': 0, 'bytes': 0, 'unique_bytes': 0,
+              'stored_bytes': 0, 'disk_bytes': 0}
+    sizes = {}
+    for x in _files('urls'):
+        try:
+            key, size = _entry(x)
+        except (IOError, OSError, ValueError):
+            continue
+        output['urls'] += 1
+        output['bytes'] += size
+        sizes[key] = size
+    output['unique_bytes'] = sum(sizes.values())
+    for x in _files('blobs'):
+        output['blobs'] += 1
+        output['stored_bytes'] += os.path.getsize(x)
+    for root, directories, files in os.walk(DIRECTORY):
+        output['disk_bytes'] += sum(os.path.getsize(os.path.join(root, x))
+                                    for x in files)
+    output['dedup_ratio'] = float(output['bytes']) / \
+        (output['unique_bytes'] or 1)
+    output['compression_ratio'] = float(output['unique_bytes']) / \
+        (output['stored_bytes'] or 1)
+    return output
+
+
+def report():
+    """Return the statistics of the cache as a string for printing."""
+    data = stats()
+    return ('{urls} urls, {blobs} blobs\n'
+            'Bodies: {bytes} bytes, {unique_bytes} bytes distinct '
+            '(dedup ratio {dedup_ratio:.2f})\n'
+            'Stored: {stored_bytes} bytes compressed '
+            '(compression ratio {compression_ratio:.2f})\n'
+            'Disk usage: {disk_bytes} bytes').format(**data)
+
+
+def prune(age=60):
+    """Delete the stale index files and the blobs that no index file
+    uses, but those changed in the last `age` seconds, which another
+    process may be about to use."""
+    now = time.time()
+    used = set()
+    for x in _files('urls'):
+        try:
+            if TTL is not None and now - os.path.getmtime(x) >= TTL:
+                os.remove(x)
+            else:
+                used.add(_entry(x)[0])
+        except (IOError, OSError, ValueError):
+            continue
+    for x in _files('blobs'):
+        try:
+            if os.path.basename(x) not in used \
+                    and now - os.path.getmtime(x) >= age:
+                os.remove(x)
+        except OSError:
+            continue
+
+
+def main(args=None):
+    global DIRECTORY
+    parser = argparse.ArgumentParser(
+        prog='python -m mlbgame.cache',
+        description='Statistics of the mlbgame disk cache')
+    parser.add_argument('directory', nargs='?', default=DIRECTORY)
+    parser.add_argument('--prune', action='store_true',
+                        help='delete stale entries and unused blobs first')
+    args = parser.parse_args(args)
+    if args.directory is None:
+        parser.error('no directory given and MLBGAME_CACHE_DIR is not set')
+    DIRECTORY = args.directory
+    if args.prune:
+        prune()
+    print(report())
+
+
+if __name__ == '__main__':
+    main()
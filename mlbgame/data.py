@@ -5,13 +5,19 @@ It checks if the data is cached first, and if not,
 gets the data from mlb.com.
 """
 
+from io import BytesIO
 import os
 
+import mlbgame.cache
+import mlbgame.metrics
+
 try:
-    from urllib.request import urlopen
+    from urllib.request import urlopen, Request
     from urllib.error import HTTPError
+    from urllib.parse import quote
 except ImportError:
-    from urllib2 import urlopen, HTTPError
+    from urllib2 import urlopen, Request, HTTPError
+    from urllib import quote
 
 
 # Templates For URLS
@@ -27,16 +33,91 @@ STANDINGS_URL = ('http://mlb.mlb.com/lookup/json/named.standings_schedule_date.b
 STANDINGS_HISTORICAL_URL = ('http://mlb.mlb.com/lookup/json/named.historical_standings_schedule_date.bam?season={0}&'
                            'game_date=%27{1}%27&sit_code=%27h0%27&league_id=103&'
                            'league_id=104&all_star_sw=%27N%27&version=48')
+# Address of a `python -m mlbgame.serve` proxy that every file is fetched
+# through, e.g. 'http://localhost:8765'; None fetches from mlb.com
+PROXY_URL = os.environ.get('MLBGAME_PROXY') or None
+# endpoints whose files change while games are played, which are only
+# kept in `mlbgame.cache` for `cache.LIVE_TTL` seconds
+LIVE_ENDPOINTS = ('scoreboard', 'overview', 'game_events', 'box_score',
+                  'raw_box_score')
 # Local Directory
 PWD = os.path.join(os.path.dirname(__file__))
+# validators and bodies of files fetched with `get_conditional()`
+_CONDITIONAL = {}
+
+
+def _proxied(url):
+    """Return the url to fetch `url` from, through `PROXY_URL` if set."""
+    if PROXY_URL is None:
+        return url
+    return '{0}/fetch?url={1}'.format(PROXY_URL.rstrip('/'),
+                                      quote(url, safe=''))
+
+
+def _open(url, endpoint):
+    """Return the file at `url`, read into memory.
+
+    The file is read from `mlbgame.cache` when it has a fresh copy, see
+    `LIVE_ENDPOINTS`. The download is measured as the fetch phase of
+    `endpoint`, see `mlbgame.metrics`.
+    """
+    start = mlbgame.metrics.start()
+    body = mlbgame.cache.fetch(url, lambda: urlopen(_proxied(url)).read(),
+                               endpoint in LIVE_ENDPOINTS)
+    mlbgame.metrics.stop('fetch', endpoint, start, bytes=len(body))
+    return BytesIO(body)
+
+
+def get_conditional(url, endpoint='conditional', validators=None):
+    """Return the body of `url` and whether it changed since the last call.
+
+    A copy of the file is kept with its ETag/Last-Modified headers, which
+    are sent with the next request so mlb.com can answer that the file
+    has not changed instead of sending it again. The copies are kept in
+    the dictionary `validators`, by url; callers that need to know what
+    changed since *their* last call should pass their own, as the default
+    one is shared by every caller.
+    """
+    start = mlbgame.metrics.start()
+    if validators is None:
+        validators = _CONDITIONAL
+    cached = validators.get(url)
+    request = Request(_proxied(url))
+    if cached is not None:
+        if cached['etag']:
+            request.add_header('If-None-Match', cached['etag'])
+        if cached['last_modified']:
+            request.add_header('If-Modified-Since', cached['last_modified'])
+    try:
+        response = urlopen(request)
+    except HTTPError as e:
+        if e.code == 304 and cached is not None:
+            mlbgame.metrics.stop('fetch', endpoint, start)
+            return cached['body'], False
+        raise
+    body = response.read()
+    mlbgame.metrics.stop('fetch', endpoint, start, bytes=len(body))
+    headers = response.info()
+    changed = cached is None or cached['body'] != body
+    validators[url] = {
+        'body': body,
+        'etag': headers.get('ETag'),
+        'last_modified': headers.get('Last-Modified')
+    }
+    return body, changed
 
 
 def get_scoreboard(year, month, day):
-    """Return the game file for a certain day matching certain criteria."""
+    """Return the game file for a certain day matching certain criteria.
+
+    A day without a scoreboard (404) gives the empty default file, other
+    HTTP errors are raised."""
     try:
-        data = urlopen(BASE_URL.format(year, month, day
-                                       ) + 'scoreboard.xml')
-    except HTTPError:
+        data = _open(BASE_URL.format(year, month, day) + 'scoreboard.xml',
+                     'scoreboard')
+    except HTTPError as e:
+        if e.code != 404:
+            raise
         data = os.path.join(PWD, 'default.xml')
     return data
 
@@ -45,9 +126,8 @@ def get_box_score(game_id):
     """Return the box score file of a game with matching id."""
     year, month, day = get_date_from_game_id(game_id)
     try:
-        return urlopen(GAME_URL.format(year, month, day,
-                                       game_id,
-                                       'boxscore.xml'))
+        return _open(GAME_URL.format(year, month, day, game_id,
+                                     'boxscore.xml'), 'box_score')
     except HTTPError:
         raise ValueError('Could not find a game with that id.')
 
@@ -55,9 +135,8 @@ def get_raw_box_score(game_id):
     """Return the raw box score file of a game with matching id."""
     year, month, day = get_date_from_game_id(game_id)
     try:
-        return urlopen(GAME_URL.format(year, month, day,
-                                       game_id,
-                                       'rawboxscore.xml'))
+        return _open(GAME_URL.format(year, month, day, game_id,
+                                     'rawboxscore.xml'), 'raw_box_score')
     except HTTPError:
         raise ValueError('Could not find a game with that id.')
 
@@ -66,9 +145,8 @@ def get_game_events(game_id):
     """Return the game events file of a game with matching id."""
     year, month, day = get_date_from_game_id(game_id)
     try:
-        return urlopen(GAME_URL.format(year, month, day,
-                                       game_id,
-                                       'game_events.xml'))
+        return _open(GAME_URL.format(year, month, day, game_id,
+                                     'game_events.xml'), 'game_events')
     except HTTPError:
         raise ValueError('Could not find a game with that id.')
 
@@ -77,9 +155,8 @@ def get_overview(game_id):
     """Return the linescore file of a game with matching id."""
     year, month, day = get_date_from_game_id(game_id)
     try:
-        return urlopen(GAME_URL.format(year, month, day,
-                                       game_id,
-                                       'linescore.xml'))
+        return _open(GAME_URL.format(year, month, day, game_id,
+                                     'linescore.xml'), 'overview')
     except HTTPError:
         raise ValueError('Could not find a game with that id.')
 
@@ -88,9 +165,8 @@ def get_players(game_id):
     """Return the players file of a game with matching id."""
     year, month, day = get_date_from_game_id(game_id)
     try:
-        return urlopen(GAME_URL.format(year, month, day,
-                                       game_id,
-                                       "players.xml"))
+        return _open(GAME_URL.format(year, month, day, game_id,
+                                     'players.xml'), 'players')
     except HTTPError:
         raise ValueError('Could not find a game with that id.')
 
@@ -98,7 +174,7 @@ def get_players(game_id):
 def get_properties():
     """Return the current mlb properties file"""
     try:
-        return urlopen(PROPERTY_URL)
+        return _open(PROPERTY_URL, 'properties')
     # in case mlb.com depricates this functionality
     except HTTPError:
         raise ValueError('Could not find the properties file. '
@@ -109,7 +185,7 @@ def get_properties():
 def get_roster(team_id):
     """Return the roster file of team with matching id."""
     try:
-        return urlopen(ROSTER_URL.format(team_id))
+        return _open(ROSTER_URL.format(team_id), 'roster')
     except HTTPError:
         raise ValueError('Could not find a roster for a team with that id.')
 
@@ -117,7 +193,8 @@ def get_roster(team_id):
 def get_standings(date):
     """Return the standings file for current standings (given current date)."""
     try:
-        return urlopen(STANDINGS_URL.format(date.year, date.strftime('%Y/%m/%d')))
+        return _open(STANDINGS_URL.format(date.year, date.strftime('%Y/%m/%d')),
+                     'standings')
     except HTTPError:
         ValueError('Could not find the standings file. '
                    'mlb.com does not provide the file that '
@@ -127,7 +204,8 @@ def get_standings(date):
 def get_historical_standings(date):
     """Return the historical standings file for specified date."""
     try:
-        return urlopen(STANDINGS_HISTORICAL_URL.format(date.year, date.strftime('%Y/%m/%d')))
+        return _open(STANDINGS_HISTORICAL_URL.format(
+            date.year, date.strftime('%Y/%m/%d')), 'historical_standings')
     except HTTPError:
         ValueError('Could not find standings for that date.')
 
@@ -135,11 +213,11 @@ def get_historical_standings(date):
 def get_injuries():
     """Return the injuries file for specified date."""
     try:
-        return urlopen(INJURY_URL)
+        return BytesIO(get_conditional(INJURY_URL, 'injury')[0])
     except HTTPError:
-        ValueError('Could not find the injuries file. '
-                   'mlb.com does not provide the file that '
-                   'mlbgame needs to perform this operation.')
+        raise ValueError('Could not find the injuries file. '
+                         'mlb.com does not provide the file that '
+                         'mlbgame needs to perform this operation.')
 
 
 def get_date_from_game_id(game_id):
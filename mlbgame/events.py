@@ -5,10 +5,15 @@ that occured throughout games.
 """
 
 import mlbgame.data
+import mlbgame.metrics
 import mlbgame.object
 
 import lxml.etree as etree
 
+# attributes that repeat across games, see `mlbgame.object.intern_value`
+INTERNED_ATBAT = ('event', 'event_es')
+INTERNED_PITCH = ('des', 'des_es', 'pitch_type', 'type')
+
 
 def __inning_info(inning, part):
     # info
@@ -26,7 +31,9 @@ def __inning_info(inning, part):
             # loop through pitch info
             for n in i.attrib:
                 pitch[n] = i.attrib[n]
+            mlbgame.object.intern_values(pitch, INTERNED_PITCH)
             atbat['pitches'].append(pitch)
+        mlbgame.object.intern_values(atbat, INTERNED_ATBAT)
         info.append(atbat)
     return info
 
@@ -35,6 +42,7 @@ def game_events(game_id):
     """Return dictionary of events for a game with matching id."""
     # get data from data module
     data = mlbgame.data.get_game_events(game_id)
+    start = mlbgame.metrics.start()
     # parse XML
     parsed = etree.parse(data)
     root = parsed.getroot()
@@ -47,6 +55,7 @@ def game_events(game_id):
             'top': __inning_info(x, 'top'),
             'bottom': __inning_info(x, 'bottom')
         }
+    mlbgame.metrics.stop('parse', 'game_events', start)
     return output
 
 
@@ -109,6 +118,7 @@ class AtBat(object):
 
         `data` should be a dictionary of values.
         """
+        convert = mlbgame.object.schema(type(self)).convert
         # loop through data
         for x in data:
             # create pitches list if attribute name is pitches
@@ -118,7 +128,7 @@ class AtBat(object):
                     self.pitches.append(Pitch(y))
             else:
                 # set information as correct data type
-                mlbgame.object.setobjattr(self, x, data[x])
+                setattr(self, x, convert(x, data[x]))
 
     def nice_output(self):
         """Prints basic at bat info in a nice way."""
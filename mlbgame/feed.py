@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+
+"""Module that follows the games of a day concurrently with asyncio.
+
+This module needs Python 3.5 or newer.
+
+    async def dashboard():
+        async for update in mlbgame.feed.LiveFeed(2016, 8, 2):
+            print(update)
+
+Every game of `mlbgame.day()` is followed by its own task, on the
+schedule of `mlbgame.live`: not before the first pitch, often during
+innings, less often between innings and during delays, and no more once
+final. The blocking requests run in a thread pool, and no more than
+`concurrency` of them run at once over all the games, so a slate of 15
+games is polled in parallel instead of one game after the other.
+"""
+
+import mlbgame
+import mlbgame.events
+import mlbgame.game
+import mlbgame.live
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+import functools
+
+
+class LiveFeed(object):
+    """Async iterator of the `live.GameUpdate` changes of a day's games
+
+    Properties:
+        concurrency
+        day
+        errors
+        events
+        games
+    """
+
+    def __init__(self, year, month, day, home=None, away=None, events=True,
+                 concurrency=8, clock=mlbgame.live.eastern_now,
+                 sleep=asyncio.sleep):
+        """Creates a feed for the games of a day, of the teams `home` and
+        `away` as in `mlbgame.day()`.
+
+        `events` tells if the game events are fetched when the linescore
+        changed, and `concurrency` is the most requests that run at once.
+        `clock` returns the current Eastern time and `sleep` is a
+        coroutine function that waits a number of seconds.
+        """
+        self.day = (year, month, day)
+        self.events = events
+        self.concurrency = concurrency
+        self.__teams = {'home': home, 'away': away}
+        self.__clock = clock
+        self.__sleep = sleep
+        # game id: status, inning state and last linescore
+        self.games = {}
+        # (game id, exception) of the polls that failed
+        self.errors = []
+        self.__executor = None
+        self.__semaphore = None
+        self.__queue = None
+        self.__tasks = []
+        self.__running = 0
+
+    async def __call(self, function, *args, **kwargs):
+        # run a blocking mlbgame function under the concurrency cap
+        async with self.__semaphore:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(
+                self.__executor, functools.partial(function, *args, **kwargs))
+
+    async def __wait(self, until):
+        seconds = (until - self.__clock()).total_seconds()
+        if seconds > 0:
+            await self.__sleep(seconds)
+
+    async def __poll(self, game_id):
+        game = self.games[game_id]
+        overview = await self.__call(mlbgame.game.overview, game_id)
+        events = None
+        if overview != game['overview'] and self.events:
+            events = await self.__call(mlbgame.events.game_events, game_id)
+        # kept once the events were fetched, so a failure is retried
+        game['status'] = overview.get('status', game['status'])
+        game['inning_state'] = overview.get('inning_state')
+        if overview != game['overview']:
+            game['overview'] = overview
+            await self.__queue.put(
+                mlbgame.live.GameUpdate(game_id, overview, events))
+
+    async def __follow(self, game):
+        game_id = game.game_id
+        try:
+            start = mlbgame.live.start_time(game_id, game.game_start_time)
+            if mlbgame.live.status_key(game.game_status) \
+                    in mlbgame.live.PREGAME and start is not None:
+                # nothing happens before the first pitch
+                await self.__wait(start)
+            # failed polls in a row
+            failures = 0
+            while True:
+                game_data = self.games[game_id]
+                if mlbgame.live.interval(game_data['status']) is None:
+                    return
+                try:
+                    await self.__poll(game_id)
+                except Exception as e:
+                    # polled again later, backing off like `LiveScheduler`
+                    self.errors.append((game_id, e))
+                    failures += 1
+                else:
+                    failures = 0
+                seconds = mlbgame.live.interval(game_data['status'],
+                                                game_data['inning_state'])
+                if seconds is None:
+                    return
+                if failures:
+                    seconds = min(seconds * 2 ** failures,
+                                  mlbgame.live.MAX_BACKOFF)
+                await self.__wait(self.__clock() +
+                                  datetime.timedelta(seconds=seconds))
+        finally:
+            await self.__queue.put(None)
+
+    async def start(self):
+        """Read the games of the day and start following them."""
+        if self.__queue is not None:
+            return
+        self.__queue = asyncio.Queue()
+        self.__semaphore = asyncio.Semaphore(self.concurrency)
+        self.__executor = ThreadPoolExecutor(self.concurrency)
+        games = await self.__call(mlbgame.day, *self.day, **self.__teams)
+        for x in games:
+            self.games[x.game_id] = {'status': x.game_status,
+                                     'inning_state': None, 'overview': None}
+        self.__running = len(games)
+        self.__tasks = [asyncio.ensure_future(self.__follow(x))
+                        for x in games]
+
+    def close(self):
+        """Stop following the games."""
+        for x in self.__tasks:
+            x.cancel()
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await self.start()
+        while self.__running:
+            update = await self.__queue.get()
+            if update is not None:
+                return update
+            # a game is done
+            self.__running -= 1
+        self.close()
+        raise StopAsyncIteration
@@ -5,11 +5,21 @@ such as the scoreboard and the box score.
 """
 
 import mlbgame.data
+import mlbgame.info
+import mlbgame.metrics
 import mlbgame.object
 
 import datetime
 import lxml.etree as etree
 
+# attributes that repeat across games, see `mlbgame.object.intern_value`
+INTERNED_GAME = ('game_tag', 'game_league', 'game_status', 'game_start_time',
+                 'home_team', 'away_team', 'w_pitcher', 'l_pitcher',
+                 'sv_pitcher', 'p_pitcher_home', 'p_pitcher_away')
+INTERNED_PLAYER = ('first', 'last', 'boxname', 'name', 'position',
+                   'current_position', 'status', 'team_abbrev', 'bats', 'rl',
+                   'parent_team_abbrev')
+
 
 def scoreboard(year, month, day, home=None, away=None):
     """Return the scoreboard information for games matching the parameters
@@ -17,22 +27,32 @@ def scoreboard(year, month, day, home=None, away=None):
     """
     # get data
     data = mlbgame.data.get_scoreboard(year, month, day)
+    start = mlbgame.metrics.start()
     # parse data
     parsed = etree.parse(data)
     root = parsed.getroot()
     games = {}
     output = {}
+    # teams can be given by any name, code or id the directory knows, which
+    # is only looked up if the name is not in the scoreboard
+    names = set(x.attrib.get('name') for x in root.iter('team'))
+    homes = aways = ()
+    if home is not None:
+        homes = set([home]) if home in names else mlbgame.info.team_names(home)
+    if away is not None:
+        aways = set([away]) if away in names else mlbgame.info.team_names(away)
     # loop through games
     for game in root:
         if game.tag == 'data':
+            mlbgame.metrics.stop('parse', 'scoreboard', start)
             return []
         # get team names
         teams = game.findall('team')
         home_name = teams[0].attrib['name']
         away_name = teams[1].attrib['name']
         # check if teams match parameters
-        if (home_name == home and home is not None) \
-                or (away_name == away and away is not None) \
+        if home_name in homes \
+                or away_name in aways \
                 or (away is None and home is None):
             # throw all the data into a complicated dictionary
             game_tag = game.tag
@@ -147,8 +167,10 @@ def scoreboard(year, month, day, home=None, away=None):
                     'p_pitcher_away_wins': p_pitcher_away_wins,
                     'p_pitcher_away_losses': p_pitcher_away_losses
                 }
+            mlbgame.object.intern_values(output, INTERNED_GAME)
             # put this dictionary into the larger dictionary
             games[game_id] = output
+    mlbgame.metrics.stop('parse', 'scoreboard', start)
     return games
 
 
@@ -228,6 +250,7 @@ def box_score(game_id):
     """Gets the box score information for the game with matching id."""
     # get data
     data = mlbgame.data.get_box_score(game_id)
+    start = mlbgame.metrics.start()
     # parse data
     parsed = etree.parse(data)
     root = parsed.getroot()
@@ -240,6 +263,7 @@ def box_score(game_id):
         home = x.attrib['home']
         away = x.attrib['away']
         result[int(inning)] = {'home': home, 'away': away}
+    mlbgame.metrics.stop('parse', 'box_score', start)
     return result
 
 
@@ -322,6 +346,7 @@ def overview(game_id):
     """Gets the overview information for the game with matching id."""
     # get data
     data = mlbgame.data.get_overview(game_id)
+    start = mlbgame.metrics.start()
     # parse data
     parsed = etree.parse(data)
     root = parsed.getroot()
@@ -329,6 +354,7 @@ def overview(game_id):
     # get overview attributes
     for x in root.attrib:
         output[x] = root.attrib[x]
+    mlbgame.metrics.stop('parse', 'overview', start)
     return output
 
 
@@ -434,6 +460,7 @@ def players(game_id):
     """Gets player/coach/umpire information for the game with matching id."""
     # get data
     data = mlbgame.data.get_players(game_id)
+    start = mlbgame.metrics.start()
     # parse data
     parsed = etree.parse(data)
     root = parsed.getroot()
@@ -453,12 +480,14 @@ def players(game_id):
             player = {}
             for key in p.keys():
                 player[key] = p.get(key)
+            mlbgame.object.intern_values(player, INTERNED_PLAYER)
             output[type]['players'].append(player)
 
         for c in team.findall('coach'):
             coach = {}
             for key in c.keys():
                 coach[key] = c.get(key)
+            mlbgame.object.intern_values(coach, INTERNED_PLAYER)
             output[type]['coaches'].append(coach)
 
     # get umpire data
@@ -467,8 +496,10 @@ def players(game_id):
         umpire = {}
         for key in u.keys():
             umpire[key] = u.get(key)
+        mlbgame.object.intern_values(umpire, INTERNED_PLAYER)
         output['umpires'].append(umpire)
 
+    mlbgame.metrics.stop('parse', 'players', start)
     return output
 
 
@@ -7,22 +7,57 @@ about the (MLB) league and the teams in it.
 from __future__ import print_function
 
 import mlbgame.data
+import mlbgame.metrics
 import mlbgame.object
 
-from datetime import datetime
+from bisect import bisect_left
+from datetime import datetime, timedelta
 import json
-import lxml.etree as etree
 import sys
+import time
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+PROPERTIES_TTL = 24 * 60 * 60
+"""Seconds the parsed properties file and team directory are kept."""
+PROPERTIES_RETRY = 60
+"""Seconds `team_names()` waits before loading the properties file again
+after it could not be loaded."""
+
+# parsed properties file, with the url it came from and when it expires,
+# and until when team names are not looked up after it could not be loaded
+_PROPERTIES = {'league': None, 'url': None, 'expires': 0, 'directory': None,
+               'failed': 0}
 
 
 def __get_league_object():
     """Returns the xml object corresponding to the league
 
     Only designed for internal use"""
+    # use the parsed file while it is fresh
+    if _PROPERTIES['league'] is not None \
+            and _PROPERTIES['url'] == mlbgame.data.PROPERTY_URL \
+            and _PROPERTIES['expires'] > time.time():
+        return _PROPERTIES['league']
     # get data
+    # lxml is only needed for the properties file, the other info is JSON
+    import lxml.etree as etree
     data = mlbgame.data.get_properties()
+    start = mlbgame.metrics.start()
+    league = etree.parse(data).getroot().find('leagues').find('league')
+    mlbgame.metrics.stop('parse', 'properties', start)
+    _PROPERTIES.update({
+        'league': league,
+        'url': mlbgame.data.PROPERTY_URL,
+        'expires': time.time() + PROPERTIES_TTL,
+        'directory': None,
+        'failed': 0
+    })
     # return league object
-    return etree.parse(data).getroot().find('leagues').find('league')
+    return league
 
 
 def league_info():
@@ -46,6 +81,90 @@ def team_info():
     return output
 
 
+def team_directory():
+    """Returns the `TeamDirectory` built from the properties file
+
+    The directory is kept as long as the parsed properties file."""
+    league = __get_league_object()
+    if _PROPERTIES['directory'] is None \
+            or _PROPERTIES['league'] is not league:
+        _PROPERTIES['directory'] = TeamDirectory(team_info())
+    return _PROPERTIES['directory']
+
+
+def team_names(team):
+    """Returns the set of names a team can be matched by in scoreboards
+
+    `team` can be anything `TeamDirectory.get()` accepts. If the team is
+    unknown or the directory can not be loaded only `team` is returned.
+    The directory is not loaded again for `PROPERTIES_RETRY` seconds
+    after it failed to load."""
+    names = set([team])
+    if _PROPERTIES['failed'] > time.time():
+        return names
+    try:
+        info = team_directory().get(team)
+    except (ValueError, IOError):
+        # not found or not reachable, URLError is an IOError
+        _PROPERTIES['failed'] = time.time() + PROPERTIES_RETRY
+        info = None
+    if info is not None:
+        names.add(info.club_common_name)
+    return names
+
+
+class TeamDirectory(object):
+    """Index of the teams in the properties file
+
+    Teams can be looked up without regard to case by team id, team code,
+    club code, abbreviation, full name and common name.
+
+    Properties:
+        teams
+    """
+
+    # attributes of a team that it can be looked up by
+    KEYS = ('team_id', 'team_code', 'club', 'display_code',
+            'historical_team_code', 'club_full_name', 'club_common_name',
+            'name_display_short', 'name_display_long')
+
+    def __init__(self, teams):
+        """Creates a directory for the teams in `teams`.
+
+        `teams` should be a list of dictionaries from `team_info()`.
+        """
+        self.teams = [Info(x) for x in teams]
+        self.__index = {}
+        for team in self.teams:
+            for key in self.KEYS:
+                value = getattr(team, key, '')
+                if value != '':
+                    self.__index.setdefault(self.__key(value), team)
+
+    @staticmethod
+    def __key(value):
+        return str(value).strip().lower()
+
+    def get(self, key, default=None):
+        """Return the `Info` object of the team matching `key`."""
+        return self.__index.get(self.__key(key), default)
+
+    def __getitem__(self, key):
+        team = self.get(key)
+        if team is None:
+            raise KeyError(key)
+        return team
+
+    def __contains__(self, key):
+        return self.__key(key) in self.__index
+
+    def __iter__(self):
+        return iter(self.teams)
+
+    def __len__(self):
+        return len(self.teams)
+
+
 class Info(mlbgame.object.Object):
     """Holds information about the league or teams
 
@@ -131,8 +250,10 @@ class Info(mlbgame.object.Object):
 def roster(team_id):
     """Returns a dictionary of roster information for team id"""
     data = mlbgame.data.get_roster(team_id)
+    start = mlbgame.metrics.start()
     parsed = json.loads(data.read().decode('utf-8'))
     players = parsed['roster_40']['queryResults']['row']
+    mlbgame.metrics.stop('parse', 'roster', start)
     return {'players': players, 'team_id': team_id}
 
 
@@ -189,19 +310,111 @@ class Player(mlbgame.object.Object):
     pass
 
 
-def standings(date):
-    DIVISIONS = {
-        'AL': {
-            '201': 'AL East',
-            '202': 'AL Central',
-            '200': 'AL West',
-        },
-        'NL': {
-            '204': 'NL East',
-            '205': 'NL Central',
-            '203': 'NL West',
-        }
+def rosters(team_ids=None, workers=8):
+    """Returns a list of roster dictionaries for the team ids
+
+    All teams in the `team_directory()` are used if `team_ids` is None.
+    The rosters are fetched by `workers` threads at once."""
+    if team_ids is None:
+        team_ids = [x.team_id for x in team_directory()]
+    team_ids = list(team_ids)
+    if ThreadPoolExecutor is None or workers <= 1 or len(team_ids) <= 1:
+        return [roster(x) for x in team_ids]
+    with ThreadPoolExecutor(max_workers=min(workers, len(team_ids))) as pool:
+        return list(pool.map(roster, team_ids))
+
+
+class PlayerDirectory(object):
+    """Players of many rosters, without duplicates
+
+    Players are indexed by `player_id` and can be searched by the start
+    of their first, last or full name.
+
+    Properties:
+        players
+        team_ids
+    """
+
+    def __init__(self, rosters):
+        """Creates a directory for the players in `rosters`.
+
+        `rosters` should be a list of dictionaries from `roster()`.
+        """
+        self.team_ids = []
+        self.players = {}
+        for data in rosters:
+            self.team_ids.append(data['team_id'])
+            for x in data['players']:
+                player = Player(x)
+                self.players.setdefault(player.player_id, player)
+        # sorted (name, player_id) pairs for the prefix search
+        names = set()
+        for player in self.players.values():
+            for key in ('name_full', 'name_first', 'name_last', 'name_use',
+                        'name_display_first_last', 'name_display_last_first'):
+                value = getattr(player, key, '')
+                if value != '':
+                    names.add((str(value).lower(), player.player_id))
+        self.__names = sorted(names)
+
+    def get(self, player_id, default=None):
+        """Return the `Player` with matching id."""
+        return self.players.get(int(player_id), default)
+
+    def search(self, prefix, limit=None):
+        """Return the players with a name starting with `prefix`.
+
+        The search does not care about case, and players are returned in
+        order of the name that matched."""
+        prefix = prefix.lower()
+        output = []
+        seen = set()
+        start = bisect_left(self.__names, (prefix,))
+        for name, player_id in self.__names[start:]:
+            if not name.startswith(prefix):
+                break
+            if player_id not in seen:
+                seen.add(player_id)
+                output.append(self.players[player_id])
+                if limit is not None and len(output) >= limit:
+                    break
+        return output
+
+    def __getitem__(self, player_id):
+        return self.players[int(player_id)]
+
+    def __contains__(self, player_id):
+        return int(player_id) in self.players
+
+    def __iter__(self):
+        return iter(self.players.values())
+
+    def __len__(self):
+        return len(self.players)
+
+
+DIVISIONS = {
+    'AL': {
+        '201': 'AL East',
+        '202': 'AL Central',
+        '200': 'AL West',
+    },
+    'NL': {
+        '204': 'NL East',
+        '205': 'NL Central',
+        '203': 'NL West',
     }
+}
+"""Division ids and names, by league."""
+
+# league names used in the properties file
+LEAGUES = {'AL': 'American', 'NL': 'National'}
+
+# statuses of games that count in the standings
+FINAL_STATUSES = ('FINAL', 'GAME_OVER', 'COMPLETED_EARLY')
+
+
+def standings(date):
     now = datetime.now()
     divisions = []
     if date.year == now.year and date.month == now.month and date.day == now.day:
@@ -210,6 +423,7 @@ def standings(date):
     else:
         data = mlbgame.data.get_historical_standings(date)
         standings_schedule_date = 'historical_standings_schedule_date'
+    start = mlbgame.metrics.start()
     parsed = json.loads(data.read().decode('utf-8'))
     sjson = parsed[standings_schedule_date]['standings_all_date_rptr']['standings_all_date']
     for league in sjson:
@@ -224,12 +438,131 @@ def standings(date):
                 'division': divs[division],
                 'teams': teams
             })
+    mlbgame.metrics.stop('parse', 'standings', start)
     return {
         'standings_schedule_date': standings_schedule_date,
         'divisions': divisions,
     }
 
 
+def __division_ids():
+    # ('National', 'West') -> '203'
+    output = {}
+    for league in DIVISIONS:
+        for division in DIVISIONS[league]:
+            name = DIVISIONS[league][division].split(' ', 1)[1]
+            output[(LEAGUES[league], name)] = division
+    return output
+
+
+def __series_teams(directory, seed):
+    divisions = __division_ids()
+    teams = {}
+    for team in directory:
+        division = divisions.get((team.league, team.division))
+        if division is None:
+            continue
+        teams[team.club_common_name] = {
+            'team_id': team.team_id,
+            'team_full': team.club_full_name,
+            'team_short': team.name_display_short,
+            'team_abbrev': str(team.club).upper(),
+            'file_code': team.club,
+            'division_id': division,
+            'division': '{0} League {1}'.format(team.league, team.division),
+            'w': 0,
+            'l': 0
+        }
+    # start from a known record for each team
+    if seed is not None:
+        records = dict((x.team_id, x) for y in seed.divisions for x in y.teams)
+        for team in teams.values():
+            if team['team_id'] in records:
+                team['w'] = records[team['team_id']].w
+                team['l'] = records[team['team_id']].l
+    return teams
+
+
+def __series_divisions(teams):
+    divisions = []
+    for league in ('AL', 'NL'):
+        for division in DIVISIONS[league]:
+            rows = [dict(x) for x in teams.values()
+                    if x['division_id'] == division]
+            for x in rows:
+                games = x['w'] + x['l']
+                x['pct'] = '{0:.3f}'.format(
+                    float(x['w']) / games if games else 0.0)
+            rows.sort(key=lambda x: (-float(x['pct']), -x['w']))
+            for place, x in enumerate(rows, start=1):
+                back = ((rows[0]['w'] - x['w']) + (x['l'] - rows[0]['l'])) / 2.0
+                x['gb'] = '-' if back <= 0 else '{0:.1f}'.format(back)
+                x['place'] = place
+            divisions.append({
+                'division': DIVISIONS[league][division],
+                'teams': rows
+            })
+    return divisions
+
+
+def standings_series(start, end, games=None, seed=None, directory=None):
+    """Returns a list of (date, standings dictionary) for every day from
+    `start` to `end`, computed from the final scores of the games.
+
+    The records count the games from `start` on, so `start` should be
+    opening day, unless `seed` is given: a `Standings` object with the
+    records before `start`, e.g. from `standings()`.
+
+    `games` can be a list of `GameScoreboard` objects that were already
+    loaded; otherwise the scoreboard of each day is fetched. Teams are put
+    in their divisions with the `team_directory()` unless `directory` is
+    given.
+    """
+    if directory is None:
+        directory = team_directory()
+    teams = __series_teams(directory, seed)
+    start = datetime(start.year, start.month, start.day)
+    end = datetime(end.year, end.month, end.day)
+    # group the games by day
+    days = {}
+    if games is not None:
+        for game in games:
+            day = (game.date.year, game.date.month, game.date.day)
+            days.setdefault(day, []).append(game)
+    output = []
+    date = start
+    while date <= end:
+        day = (date.year, date.month, date.day)
+        if games is None:
+            # imported on first use so the JSON info does not need lxml
+            import mlbgame.game
+            data = mlbgame.game.scoreboard(*day)
+            todays = [mlbgame.game.GameScoreboard(data[x]) for x in data]
+        else:
+            todays = days.get(day, [])
+        for game in todays:
+            if str(game.game_status).upper() not in FINAL_STATUSES \
+                    or game.home_team_runs == game.away_team_runs:
+                continue
+            home = teams.get(game.home_team)
+            away = teams.get(game.away_team)
+            if home is None or away is None:
+                # teams from outside the league, e.g. exhibition games
+                continue
+            if game.home_team_runs > game.away_team_runs:
+                home['w'] += 1
+                away['l'] += 1
+            else:
+                away['w'] += 1
+                home['l'] += 1
+        output.append((date, {
+            'standings_schedule_date': 'standings_series',
+            'divisions': __series_divisions(teams)
+        }))
+        date += timedelta(days=1)
+    return output
+
+
 class Standings(object):
     """Holds information about the league standings
 
@@ -314,10 +647,55 @@ class Team(mlbgame.object.Object):
     """
     pass
 
+def __injury_rows(body):
+    parsed = json.loads(body.decode('utf-8'))
+    return parsed['wsfb_news_injury']['queryResults']['row']
+
+
 def injury():
     data = mlbgame.data.get_injuries()
-    parsed = json.loads(data.read().decode('utf-8'))
-    return parsed['wsfb_news_injury']['queryResults']['row']
+    start = mlbgame.metrics.start()
+    output = __injury_rows(data.read())
+    mlbgame.metrics.stop('parse', 'injury', start)
+    return output
+
+
+def injury_changes(previous, validators=None):
+    """Returns the injuries that changed since `previous` and the new index
+
+    `previous` is a dictionary of injury rows keyed by
+    (player_id, insert_ts), as returned by an earlier call, or None. The
+    injuries file is fetched with `data.get_conditional()`. When the
+    caller keeps its own `validators` for it, a file that has not changed
+    since the caller's last fetch is not downloaded or parsed again and no
+    changes are returned; otherwise the file is always compared with
+    `previous`. Changes are (kind, row, previous row) with kind one of
+    'added', 'removed' or 'updated'."""
+    try:
+        body, changed = mlbgame.data.get_conditional(
+            mlbgame.data.INJURY_URL, 'injury', validators)
+    except mlbgame.data.HTTPError:
+        raise ValueError('Could not find the injuries file. '
+                         'mlb.com does not provide the file that '
+                         'mlbgame needs to perform this operation.')
+    if not changed and previous is not None and validators is not None:
+        return [], previous
+    start = mlbgame.metrics.start()
+    previous = previous or {}
+    index = {}
+    for row in __injury_rows(body):
+        index[(row.get('player_id'), row.get('insert_ts'))] = row
+    changes = []
+    for key in index:
+        if key not in previous:
+            changes.append(('added', index[key], None))
+        elif previous[key] != index[key]:
+            changes.append(('updated', index[key], previous[key]))
+    for key in previous:
+        if key not in index:
+            changes.append(('removed', previous[key], previous[key]))
+    mlbgame.metrics.stop('parse', 'injury_changes', start)
+    return changes, index
 
 
 class Injuries(object):
@@ -354,3 +732,60 @@ class Injury(mlbgame.object.Object):
         team_name
     """
     pass
+
+
+class InjuryChange(object):
+    """Represents a change to the MLB Disabled List
+
+    Properties:
+        injury
+        kind
+        previous
+    """
+
+    def __init__(self, kind, injury, previous):
+        """Creates an InjuryChange for the change `kind` of `injury`.
+
+        `injury` and `previous` should be injury dictionaries.
+        """
+        self.kind = kind
+        self.injury = Injury(injury)
+        self.previous = Injury(previous) if previous is not None else None
+
+    def nice_output(self):
+        """Return a string for printing"""
+        return '{0}: {1} {2} ({3})'.format(
+            self.kind.capitalize(), self.injury.name_first,
+            self.injury.name_last, self.injury.injury_status)
+
+    def __str__(self):
+        return self.nice_output()
+
+
+class InjuryWatcher(object):
+    """Follows the MLB Disabled List and reports what changed
+
+    Properties:
+        injuries
+    """
+
+    def __init__(self):
+        # last snapshot of injury rows by (player_id, insert_ts)
+        self.injuries = None
+        # validators of the injuries file as this watcher last saw it
+        self.__validators = {}
+
+    def poll(self):
+        """Return a list of `InjuryChange` objects since the last poll.
+
+        The first poll reports every injury as added."""
+        changes, self.injuries = injury_changes(self.injuries,
+                                                self.__validators)
+        return [InjuryChange(*x) for x in changes]
+
+    def watch(self, interval=300):
+        """Poll every `interval` seconds and yield the changes."""
+        while True:
+            for change in self.poll():
+                yield change
+            time.sleep(interval)
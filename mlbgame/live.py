@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+
+"""Module that follows the games of a day while they are played,
+polling each game only when it can have changed.
+
+    scheduler = mlbgame.live.LiveScheduler(2016, 8, 2, home='Mets')
+    for update in scheduler.run():
+        print(update)
+
+The games and their start times come from `game.scoreboard()`. A game
+is not polled before its start time, is polled every `LIVE_INTERVAL`
+seconds while an inning is being played, every `BREAK_INTERVAL` seconds
+between innings, every `DELAY_INTERVAL` seconds while it is delayed and
+no more once it is final. The game events are only fetched when the
+linescore changed. A game that could not be polled is polled again after
+twice its interval, and so on for every failure in a row.
+
+Start times are US Eastern, as in GameDay, so the clock of the scheduler
+returns naive datetimes in Eastern time. Tests and simulations can pass
+their own `clock` and `sleep`.
+"""
+
+import mlbgame.events
+import mlbgame.game
+
+import datetime
+import time
+
+LIVE_INTERVAL = 15
+"""Seconds between polls while an inning is being played."""
+BREAK_INTERVAL = 90
+"""Seconds between polls between innings, and after the start time of a
+game that has not begun."""
+DELAY_INTERVAL = 300
+"""Seconds between polls while a game is delayed."""
+MAX_BACKOFF = 600
+"""Most seconds between polls of a game whose polls keep failing."""
+
+# statuses of games that will not change any more today
+DONE = ('FINAL', 'GAME_OVER', 'COMPLETED_EARLY', 'POSTPONED', 'CANCELLED',
+        'SUSPENDED', 'FORFEIT')
+# statuses of games that have not begun
+PREGAME = ('PREVIEW', 'PRE_GAME', 'SCHEDULED', 'WARMUP')
+# inning states of the breaks between half innings
+BREAKS = ('MIDDLE', 'END')
+
+
+def status_key(status):
+    """Return `status` in the form of scoreboard.xml, e.g. 'GAME_OVER' for
+    'Game Over'."""
+    return (status or '').strip().upper().replace(' ', '_').replace('-', '_')
+
+
+def interval(status, inning_state=None):
+    """Return the seconds to wait before polling a game with `status`
+    again, None if it does not need to be polled any more."""
+    status = status_key(status)
+    if status in DONE or status.startswith('COMPLETED'):
+        return None
+    if status.startswith('DELAYED'):
+        return DELAY_INTERVAL
+    if status in PREGAME or status_key(inning_state) in BREAKS:
+        return BREAK_INTERVAL
+    return LIVE_INTERVAL
+
+
+def start_time(game_id, game_start_time):
+    """Return the start of a game as a datetime, None if it is not known.
+
+    `game_start_time` is the time of `game.scoreboard()`, e.g. '7:10PM'.
+    """
+    year, month, day = [int(x) for x in game_id.split('_')[:3]]
+    try:
+        hour, minute = game_start_time.strip().split(':')
+        hour = int(hour) % 12 + (12 if minute[2:].upper() == 'PM' else 0)
+        return datetime.datetime(year, month, day, hour, int(minute[:2]))
+    except (AttributeError, ValueError):
+        # 'TBD' and the like
+        return None
+
+
+def eastern_now():
+    """Return the current US Eastern time as a naive datetime."""
+    now = datetime.datetime.utcnow()
+    # daylight saving time from the second Sunday of March to the first
+    # Sunday of November, at 2AM local time
+    march = datetime.datetime(now.year, 3, 8)
+    begin = march + datetime.timedelta(days=(6 - march.weekday()) % 7,
+                                       hours=7)
+    november = datetime.datetime(now.year, 11, 1)
+    end = november + datetime.timedelta(days=(6 - november.weekday()) % 7,
+                                        hours=6)
+    offset = 4 if begin <= now < end else 5
+    return now - datetime.timedelta(hours=offset)
+
+
+class GameUpdate(object):
+    """Represents a change of a game found by a `LiveScheduler`
+
+    Properties:
+        events
+        game_id
+        overview
+    """
+
+    def __init__(self, game_id, overview, events):
+        """Creates a GameUpdate from the dictionaries of
+        `game.overview()` and `events.game_events()`.
+
+        `events` is None when the events were not fetched.
+        """
+        self.game_id = game_id
+        self.overview = mlbgame.game.Overview(overview)
+        self.events = None if events is None else \
+            [mlbgame.events.Inning(events[x], x) for x in events]
+
+    def nice_output(self):
+        """Return a string for printing"""
+        return '{0}: {1} {2} {3}'.format(
+            self.game_id, self.overview.status,
+            getattr(self.overview, 'inning_state', ''),
+            getattr(self.overview, 'inning', '')).strip()
+
+    def __str__(self):
+        return self.nice_output()
+
+
+class LiveScheduler(object):
+    """Polls the games of a day when they can have changed
+
+    Properties:
+        day
+        errors
+        events
+        games
+    """
+
+    def __init__(self, year, month, day, home=None, away=None, events=True,
+                 clock=eastern_now, sleep=time.sleep):
+        """Creates a scheduler for the games of a day, of the teams
+        `home` and `away` as in `game.scoreboard()`.
+
+        `events` tells if the game events are fetched with the linescore.
+        `clock` returns the current Eastern time and `sleep` waits a
+        number of seconds.
+        """
+        self.day = (year, month, day)
+        self.events = events
+        self.__home = home
+        self.__away = away
+        self.__clock = clock
+        self.__sleep = sleep
+        # game id: status, inning state, next poll, last linescore and
+        # failed polls in a row
+        self.games = {}
+        # (game id, exception) of the polls that failed
+        self.errors = []
+
+    def refresh(self):
+        """Read the scoreboard and schedule the games that are new."""
+        now = self.__clock()
+        data = mlbgame.game.scoreboard(*self.day, home=self.__home,
+                                       away=self.__away)
+        for game_id, x in (data or {}).items():
+            if game_id in self.games:
+                continue
+            start = start_time(game_id, x.get('game_start_time'))
+            status = x.get('game_status')
+            if status_key(status) in PREGAME and start is not None:
+                # nothing happens before the first pitch
+                next_poll = max(start, now)
+            elif interval(status) is None:
+                next_poll = None
+            else:
+                next_poll = now
+            self.games[game_id] = {'status': status, 'inning_state': None,
+                                   'next_poll': next_poll, 'overview': None,
+                                   'failures': 0}
+        return self.games
+
+    def due(self):
+        """Return the ids of the games that should be polled now."""
+        now = self.__clock()
+        return sorted(x for x, game in self.games.items()
+                      if game['next_poll'] is not None
+                      and game['next_poll'] <= now)
+
+    def next_poll(self):
+        """Return when the next game should be polled, None if every game
+        is done."""
+        times = [x['next_poll'] for x in self.games.values()
+                 if x['next_poll'] is not None]
+        return min(times) if times else None
+
+    def poll(self, game_id):
+        """Poll a game and schedule its next poll.
+
+        Return a `GameUpdate` if its linescore changed, None otherwise.
+        If the game could not be polled the error is added to `errors`
+        and the game is polled again later.
+        """
+        game = self.games[game_id]
+        try:
+            overview = mlbgame.game.overview(game_id)
+            events = None
+            if overview != game['overview'] and self.events:
+                events = mlbgame.events.game_events(game_id)
+        except Exception as e:
+            self.errors.append((game_id, e))
+            game['failures'] += 1
+            seconds = (interval(game['status'], game['inning_state']) or
+                       LIVE_INTERVAL) * 2 ** game['failures']
+            game['next_poll'] = self.__clock() + datetime.timedelta(
+                seconds=min(seconds, MAX_BACKOFF))
+            return None
+        game['failures'] = 0
+        game['status'] = overview.get('status', game['status'])
+        game['inning_state'] = overview.get('inning_state')
+        seconds = interval(game['status'], game['inning_state'])
+        game['next_poll'] = None if seconds is None else \
+            self.__clock() + datetime.timedelta(seconds=seconds)
+        if overview == game['overview']:
+            return None
+        game['overview'] = overview
+        return GameUpdate(game_id, overview, events)
+
+    def run(self):
+        """Poll the games until they are all done and yield a
+        `GameUpdate` for every change."""
+        if not self.games:
+            self.refresh()
+        while True:
+            for game_id in self.due():
+                update = self.poll(game_id)
+                if update is not None:
+                    yield update
+            next_poll = self.next_poll()
+            if next_poll is None:
+                return
+            seconds = (next_poll - self.__clock()).total_seconds()
+            if seconds > 0:
+                self.__sleep(seconds)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+
+"""Module that records where mlbgame spends its time.
+
+Every call of the main functions goes through up to three phases:
+
+    fetch       downloading a file from mlb.com
+    parse       turning the file into dictionaries
+    construct   creating the objects returned to the user
+
+Each phase is measured by endpoint, the name of the function or file it
+belongs to (e.g. `box_score`, `raw_box_score` and `player_stats` for a
+call of `mlbgame.player_stats()`). Measurements can be passed to
+callbacks added with `register()` or summed up with `collect()`:
+
+    mlbgame.metrics.collect()
+    mlbgame.player_stats('2016_08_02_nyamlb_nynmlb_1')
+    mlbgame.metrics.counters()['player_stats']['parse']['seconds']
+
+Nothing is measured until a callback is registered or collecting is
+turned on, the only cost is then a check of a module variable.
+"""
+
+import threading
+import timeit
+
+PHASES = ('fetch', 'parse', 'construct')
+"""Names of the phases that are measured."""
+
+# functions called with every measurement
+_CALLBACKS = []
+# totals by endpoint and phase, see `counters()`
+_COUNTERS = {}
+_LOCK = threading.Lock()
+_COLLECT = False
+# True when there is anything to measure for
+_ENABLED = False
+
+
+def __update():
+    global _ENABLED
+    _ENABLED = _COLLECT or bool(_CALLBACKS)
+
+
+def register(callback):
+    """Call `callback(phase, endpoint, seconds, bytes, objects)` with
+    every measurement.
+
+    `bytes` is the size of the downloaded file for the fetch phase and
+    `objects` the number of objects built for the construct phase,
+    otherwise they are 0. Callbacks are called from the thread that made
+    the measurement.
+    """
+    with _LOCK:
+        _CALLBACKS.append(callback)
+        __update()
+
+
+def unregister(callback):
+    """Stop calling a callback added with `register()`."""
+    with _LOCK:
+        if callback in _CALLBACKS:
+            _CALLBACKS.remove(callback)
+        __update()
+
+
+def collect(enabled=True):
+    """Turn adding measurements to `counters()` on or off."""
+    global _COLLECT
+    with _LOCK:
+        _COLLECT = enabled
+        __update()
+
+
+def counters():
+    """Return the totals of the measurements added since `collect()` was
+    turned on, as a dictionary of endpoint -> phase -> values.
+
+    The values are `calls`, `seconds`, `bytes` and `objects`.
+    """
+    with _LOCK:
+        return dict((x, dict((y, dict(_COUNTERS[x][y]))
+                             for y in _COUNTERS[x]))
+                    for x in _COUNTERS)
+
+
+def reset():
+    """Clear the totals returned by `counters()`."""
+    with _LOCK:
+        _COUNTERS.clear()
+
+
+def start():
+    """Return the start time of a measurement, or None when nothing is
+    measured."""
+    if _ENABLED:
+        return timeit.default_timer()
+    return None
+
+
+def count(value):
+    """Return the number of objects of mlbgame classes in `value`, itself
+    included, following their attributes, lists and dictionaries."""
+    output = 0
+    seen = set()
+    stack = [value]
+    while stack:
+        x = stack.pop()
+        if isinstance(x, dict):
+            stack.extend(x.values())
+        elif isinstance(x, (list, tuple)):
+            stack.extend(x)
+        elif type(x).__module__.startswith('mlbgame.') and id(x) not in seen:
+            seen.add(id(x))
+            output += 1
+            stack.extend(getattr(x, '__dict__', {}).values())
+    return output
+
+
+def stop(phase, endpoint, start, bytes=0, objects=0, built=None):
+    """Finish the measurement of `phase` for `endpoint` started with
+    `start()`.
+
+    `built` is what the construct phase made; its objects are counted
+    with `count()`, after the time is taken, instead of giving `objects`.
+    """
+    if start is None:
+        return
+    seconds = timeit.default_timer() - start
+    if built is not None:
+        objects = count(built)
+    with _LOCK:
+        if _COLLECT:
+            phases = _COUNTERS.setdefault(endpoint, {})
+            totals = phases.get(phase)
+            if totals is None:
+                totals = phases[phase] = {'calls': 0, 'seconds': 0.0,
+                                          'bytes': 0, 'objects': 0}
+            totals['calls'] += 1
+            totals['seconds'] += seconds
+            totals['bytes'] += bytes
+            totals['objects'] += objects
+        callbacks = list(_CALLBACKS)
+    for callback in callbacks:
+        callback(phase, endpoint, seconds, bytes, objects)
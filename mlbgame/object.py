@@ -2,30 +2,298 @@
 
 """Module that is used for holding basic objects"""
 
+import keyword
+import re
 
-def setobjattr(obj, key, value):
-    """Sets an object attribute with the correct data type."""
+try:
+    _TEXT = (str, unicode)
+except NameError:
+    _TEXT = (str,)
+
+# any digit, a value without one can only be a number if it is special
+_DIGIT = re.compile(r'\d')
+_SPECIAL = re.compile(r'\s*[-+]?(inf|nan)', re.IGNORECASE)
+# plain integers and floats, as accepted by `int()` and `float()`
+_INT = re.compile(r'\s*[-+]?\d+\s*\Z')
+_FLOAT = re.compile(r'\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*\Z')
+# things `int()`/`float()` also accept, left to `infer()`
+_UNUSUAL = re.compile(r'\d_\d|[^\x00-\x7f]')
+
+try:
+    _isdecimal = str.isdecimal
+except AttributeError:
+    # python 2 strings have no isdecimal
+    _isdecimal = re.compile(r'[0-9]+\Z').match
+
+# schemas that have been built, by class
+_SCHEMAS = {}
+# slotted variants that have been generated, by class
+_SLOTTED = {}
+# strings shared between parsed objects
+_INTERNED = {}
+
+LAZY = False
+"""Default for the `lazy` argument of `Object`. When True, objects keep
+the raw values and only convert each attribute the first time it is read.
+"""
+
+SLOTS = False
+"""When True, `Object` subclasses are created as their `slotted()` variant,
+which keeps the documented properties in `__slots__` instead of a dict.
+"""
+
+
+INTERN_SIZE = 65536
+"""Maximum number of strings kept by `intern_value()`. Once the table is
+full new strings are no longer added; set to 0 to turn interning off.
+"""
+
+
+def intern_value(value):
+    """Return the shared copy of the string `value`.
+
+    Parsers call this for attributes that repeat across many objects,
+    such as pitch descriptions and positions, so equal values are stored
+    once instead of once per object.
+    """
+    interned = _INTERNED.get(value)
+    if interned is not None:
+        return interned
+    if len(_INTERNED) < INTERN_SIZE:
+        _INTERNED[value] = value
+    return value
+
+
+def intern_values(data, keys):
+    """Intern the values of `keys` in the dictionary `data` in place."""
+    for x in keys:
+        if x in data:
+            data[x] = intern_value(data[x])
+    return data
+
+
+def clear_interned():
+    """Empty the table used by `intern_value()`."""
+    _INTERNED.clear()
+
+
+def infer(value):
+    """Return `value` converted to the data type it looks like."""
     try:
-        setattr(obj, key, int(value))
+        return int(value)
     except ValueError:
         try:
-            setattr(obj, key, float(value))
+            return float(value)
         except ValueError:
             # string if not number
             try:
-                setattr(obj, key, str(value))
+                return str(value)
             except UnicodeEncodeError:
-                setattr(obj, key, value)
+                return value
+
+
+def setobjattr(obj, key, value):
+    """Sets an object attribute with the correct data type."""
+    setattr(obj, key, infer(value))
+
+
+def _to_any(value):
+    if _isdecimal(value):
+        return int(value)
+    if _DIGIT.search(value) is None:
+        if _SPECIAL.match(value):
+            return infer(value)
+        return _to_text(value)
+    if _INT.match(value):
+        return int(value)
+    if _FLOAT.match(value):
+        return float(value)
+    if _UNUSUAL.search(value):
+        return infer(value)
+    return _to_text(value)
+
+
+def _to_int(value):
+    if _isdecimal(value):
+        return int(value)
+    return _to_any(value)
+
+
+def _to_float(value):
+    whole, dot, fraction = value.partition('.')
+    if whole[:1] == '-':
+        whole = whole[1:]
+    if dot and _isdecimal(fraction) and (not whole or _isdecimal(whole)):
+        return float(value)
+    return _to_any(value)
+
+
+def _to_str(value):
+    if _DIGIT.search(value) is None and not _SPECIAL.match(value):
+        return _to_text(value)
+    return _to_any(value)
+
+
+def _to_text(value):
+    if isinstance(value, str):
+        return value
+    return infer(value)
+
+
+_CONVERTERS = {int: _to_int, float: _to_float}
+
+
+def properties(cls):
+    """Return the property names documented in the docstring of `cls`."""
+    doc = cls.__dict__.get('__doc__') or ''
+    if 'Properties:' not in doc:
+        return []
+    output = []
+    for line in doc.split('Properties:', 1)[1].splitlines():
+        name = line.strip()
+        # skip blank lines and headings such as `Batter:`
+        if re.match(r'[A-Za-z_]\w*\Z', name) and name not in output:
+            output.append(name)
+    return output
+
+
+class Schema(object):
+    """Converters for the documented properties of a class.
+
+    The converter of a property is picked from the first value seen for
+    it and checks the text with a precompiled pattern, so no exceptions
+    are needed to find the type. Values that do not look like that type
+    are passed on to the general rules, so the results are always the
+    same as `setobjattr()`. Properties that are not documented use
+    `infer()` directly.
+
+    Properties:
+        class_attributes
+        converters
+        fields
+    """
+
+    def __init__(self, fields, class_attributes=()):
+        self.fields = frozenset(fields)
+        self.class_attributes = frozenset(class_attributes)
+        self.converters = {}
+
+    def convert(self, key, value):
+        """Return `value` of property `key` as the correct data type."""
+        if not isinstance(value, _TEXT):
+            return infer(value)
+        converter = self.converters.get(key)
+        if converter is not None:
+            return converter(value)
+        if key not in self.fields:
+            return infer(value)
+        value = _to_any(value)
+        self.converters[key] = _CONVERTERS.get(type(value), _to_str)
+        return value
+
+
+def schema(cls):
+    """Return the `Schema` of class `cls`, building it the first time."""
+    try:
+        return _SCHEMAS[cls]
+    except KeyError:
+        fields = []
+        for x in reversed(cls.__mro__):
+            fields.extend(properties(x))
+        _SCHEMAS[cls] = Schema(fields, dir(cls))
+        return _SCHEMAS[cls]
+
+
+def _new_slotted(cls):
+    return object.__new__(slotted(cls))
+
+
+def _slotted_reduce(self, protocol):
+    # pickle as the original class so the variant does not need a name
+    cls = type(self)
+    state = {}
+    for x in cls.__slots__:
+        try:
+            state[x] = cls.__dict__[x].__get__(self, cls)
+        except AttributeError:
+            pass
+    return (_new_slotted, (cls.__base__,),
+            (self.__dict__ or None, state))
+
+
+def slotted(cls):
+    """Return a variant of `cls` that stores its documented properties
+    in `__slots__`.
+
+    The variant is a subclass of `cls` generated the first time it is
+    asked for. Values that are not documented still go to the instance
+    dict, which is only created when such a value is set.
+    """
+    if '_slotted' in cls.__dict__:
+        return cls
+    try:
+        return _SLOTTED[cls]
+    except KeyError:
+        names = set(['_raw'])
+        for x in schema(cls).fields:
+            # methods and other class attributes must not be hidden
+            if not keyword.iskeyword(x) and not hasattr(cls, x):
+                names.add(x)
+        variant = type(cls.__name__, (cls,), {
+            '__slots__': tuple(sorted(names)),
+            '__doc__': cls.__doc__,
+            '__module__': cls.__module__,
+            '__reduce_ex__': _slotted_reduce,
+            '_slotted': True
+        })
+        # the variant converts exactly like the original class
+        _SCHEMAS[variant] = schema(cls)
+        _SLOTTED[cls] = variant
+        return variant
 
 
 class Object(object):
     """Basic class"""
 
-    def __init__(self, data):
+    def __new__(cls, *args, **kwargs):
+        if SLOTS:
+            cls = slotted(cls)
+        return object.__new__(cls)
+
+    def __init__(self, data, lazy=None):
         """Creates an object that matches the corresponding values in `data`.
 
         `data` should be a dictionary of values.
+
+        If `lazy` is True (it defaults to `LAZY`), `data` is kept as it is
+        and each attribute is converted and stored the first time it is
+        read, which saves the work for attributes that are never used.
         """
+        cls_schema = schema(type(self))
+        convert = cls_schema.convert
+        if LAZY if lazy is None else lazy:
+            self._raw = data
+            # values named like class attributes would not reach __getattr__
+            for x in cls_schema.class_attributes.intersection(data):
+                setattr(self, x, convert(x, data[x]))
+            return
+        converters = cls_schema.converters
         # loop through data
         for x in data:
-            setobjattr(self, x, data[x])
+            value = data[x]
+            converter = converters.get(x)
+            if converter is not None and type(value) is str:
+                setattr(self, x, converter(value))
+            else:
+                setattr(self, x, convert(x, value))
+
+    def __getattr__(self, name):
+        # only called for attributes that have not been set yet
+        if name == '_raw':
+            raise AttributeError(name)
+        raw = getattr(self, '_raw', None)
+        if raw is None or name not in raw:
+            raise AttributeError(name)
+        value = schema(type(self)).convert(name, raw[name])
+        setattr(self, name, value)
+        return value
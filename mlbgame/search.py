@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+
+"""Module that keeps a full-text index of the at bat descriptions of
+games, so plays can be searched without parsing game_events.xml again.
+
+    index = mlbgame.search.PlayIndex('plays.db')
+    index.add_game('2016_08_02_nyamlb_nynmlb_1')
+    index.search('"grounds into a double play" Reyes')
+    index.search('homer*')
+
+Queries are words and "quoted phrases" that must all be in the
+description; a word ending with * matches every word that starts with
+it. Words are compared in lower case, without punctuation. The index is
+an inverted index in a SQLite database: every word of a description is
+stored with its position, which is what phrases are matched on.
+
+Games are added one at a time; a `Warehouse` created with an index adds
+every game it ingests. The tables of the index are named `play_*`, so it
+can be kept in the database of a warehouse by sharing its connection:
+
+    warehouse = mlbgame.warehouse.Warehouse('mlb.db', index=True)
+    warehouse.index.search('homer*')
+
+An index opened by path on its own connection should use a file of its
+own; two connections writing to one SQLite file wait for each other.
+"""
+
+import mlbgame.events
+
+import re
+import sqlite3
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS play_atbats (id INTEGER PRIMARY KEY, '
+    'game_id TEXT NOT NULL, num INTEGER NOT NULL, inning INTEGER NOT NULL, '
+    'half TEXT NOT NULL, batter, pitcher, event, des, UNIQUE (game_id, '
+    'num))',
+    'CREATE TABLE IF NOT EXISTS play_terms (term TEXT NOT NULL, atbat '
+    'INTEGER NOT NULL, position INTEGER NOT NULL, PRIMARY KEY (term, atbat, '
+    'position))',
+    'CREATE INDEX IF NOT EXISTS play_terms_atbat ON play_terms (atbat)',
+]
+"""Statements that create the tables of the index."""
+# columns of the at bats that are returned by searches
+COLUMNS = ('game_id', 'inning', 'half', 'num', 'batter', 'pitcher', 'event',
+           'des')
+# words, with the apostrophes of names such as O'Neill
+_WORD = re.compile(r"\w+(?:'\w+)*", re.UNICODE)
+_CLAUSE = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def tokenize(text):
+    """Return the lower case words of `text`."""
+    return [x.lower() for x in _WORD.findall(text or '')]
+
+
+def _clauses(query):
+    # the lists of words that must be found next to each other
+    output = []
+    for phrase, word in _CLAUSE.findall(query):
+        if phrase:
+            words = tokenize(phrase)
+        else:
+            words = tokenize(word)
+            if word.endswith('*') and len(words) == 1:
+                words = [words[0] + '*']
+        if words:
+            output.append(words)
+    return output
+
+
+def _clause_sql(words):
+    # ids of the at bats with `words` at consecutive positions
+    tables = []
+    where = []
+    params = []
+    for i, x in enumerate(words):
+        tables.append('play_terms t{0}'.format(i))
+        if x.endswith('*'):
+            # prefix match on the index of terms
+            where.append('t{0}.term >= ? AND t{0}.term < ?'.format(i))
+            params.extend([x[:-1], x[:-1] + u'\uffff'])
+        else:
+            where.append('t{0}.term = ?'.format(i))
+            params.append(x)
+        if i:
+            where.append('t{0}.atbat = t0.atbat AND t{0}.position = '
+                         't0.position + {0}'.format(i))
+    sql = 'SELECT t0.atbat FROM {0} WHERE {1}'.format(
+        ', '.join(tables), ' AND '.join(where))
+    return sql, params
+
+
+class PlayIndex(object):
+    """SQLite inverted index of at bat descriptions.
+
+    Properties:
+        connection
+        path
+    """
+
+    def __init__(self, path=':memory:', connection=None):
+        """Opens the index at `path`, creating the tables if needed.
+
+        If `connection` is an open `sqlite3` connection, such as that of
+        a `Warehouse`, the index is kept in its database instead and
+        `path` is ignored.
+        """
+        self.path = path
+        self.__owned = connection is None
+        if connection is None:
+            connection = sqlite3.connect(path)
+        self.connection = connection
+        with self.connection:
+            for x in SCHEMA:
+                self.connection.execute(x)
+
+    def close(self):
+        """Close the database, unless its connection was given."""
+        if self.__owned:
+            self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def is_indexed(self, game_id):
+        """Return True if the at bats of the game are in the index."""
+        return self.connection.execute(
+            'SELECT 1 FROM play_atbats WHERE game_id = ? LIMIT 1',
+            (game_id,)).fetchone() is not None
+
+    def add_game(self, game_id, events=None, force=False):
+        """Add the at bats of a game to the index.
+
+        `events` is the dictionary of `events.game_events()`, which is
+        fetched if not given. Returns False without doing anything if the
+        game is already indexed, unless `force` is True, in which case
+        its at bats are replaced.
+        """
+        if not force and self.is_indexed(game_id):
+            return False
+        if events is None:
+            events = mlbgame.events.game_events(game_id)
+        with self.connection:
+            self.connection.execute(
+                'DELETE FROM play_terms WHERE atbat IN (SELECT id FROM '
+                'play_atbats WHERE game_id = ?)', (game_id,))
+            self.connection.execute(
+                'DELETE FROM play_atbats WHERE game_id = ?', (game_id,))
+            for inning in events:
+                for half in ('top', 'bottom'):
+                    for x in events[inning][half]:
+                        self.__add_atbat(game_id, int(inning), half, x)
+        return True
+
+    def __add_atbat(self, game_id, inning, half, atbat):
+        cursor = self.connection.execute(
+            'INSERT INTO play_atbats (game_id, num, inning, half, batter, '
+            'pitcher, event, des) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (game_id, int(atbat['num']), inning, half, atbat.get('batter'),
+             atbat.get('pitcher'), atbat.get('event'), atbat.get('des')))
+        self.connection.executemany(
+            'INSERT INTO play_terms VALUES (?, ?, ?)',
+            [(x, cursor.lastrowid, i)
+             for i, x in enumerate(tokenize(atbat.get('des')))])
+
+    def search(self, query, game_id=None, limit=None):
+        """Return the at bats whose description matches `query`, as
+        dictionaries, in the order of the games and at bats.
+
+        `game_id` limits the search to a game.
+        """
+        clauses = _clauses(query)
+        if not clauses:
+            return []
+        parts = [_clause_sql(x) for x in clauses]
+        sql = 'SELECT {0} FROM play_atbats WHERE id IN ({1})'.format(
+            ', '.join(COLUMNS), ' INTERSECT '.join(x[0] for x in parts))
+        params = [y for x in parts for y in x[1]]
+        if game_id is not None:
+            sql += ' AND game_id = ?'
+            params.append(game_id)
+        sql += ' ORDER BY game_id, num'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        # by position, the row factory of a shared connection is unknown
+        return [dict(zip(COLUMNS, x))
+                for x in self.connection.execute(sql, params)]
@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+
+"""Module that keeps running season totals built from the stats
+of individual games.
+
+Totals are updated one game at a time, so a finished game can be added
+without going back through the rest of the season.
+"""
+
+# counting stats kept for batters and team batting
+BATTING = ('ab', 'r', 'h', 'd', 't', 'hr', 'rbi', 'bb', 'so', 'sb', 'cs',
+           'hbp', 'sac', 'sf', 'lob')
+# counting stats kept for pitchers and team pitching
+PITCHING = ('out', 'bf', 'h', 'r', 'er', 'bb', 'so', 'hr', 'np')
+
+
+def _count(stats, key):
+    value = getattr(stats, key, 0)
+    # missing stats come through as empty strings
+    return value if isinstance(value, int) else 0
+
+
+def team_codes(game_id):
+    """Return the (away, home) team codes found in a game id."""
+    away, home = game_id.split('_')[3:5]
+    if away.endswith('mlb'):
+        away = away[:-3]
+    if home.endswith('mlb'):
+        home = home[:-3]
+    return (away, home)
+
+
+def _ratio(numerator, denominator, scale=1):
+    if not denominator:
+        return 0.0
+    return round(float(numerator) * scale / denominator, 3)
+
+
+class Totals(object):
+    """Base class for running counting totals."""
+
+    FIELDS = ()
+
+    def __init__(self, id):
+        self.id = id
+        self.g = 0
+        for x in self.FIELDS:
+            setattr(self, x, 0)
+
+    def add(self, stats):
+        """Add the counting stats of a single game."""
+        self.g += 1
+        for x in self.FIELDS:
+            setattr(self, x, getattr(self, x) + _count(stats, x))
+
+
+class BattingTotals(Totals):
+    """Running batting totals for a player or a team.
+
+    Properties:
+        ab
+        avg
+        bb
+        cs
+        d
+        g
+        h
+        hbp
+        hr
+        id
+        lob
+        name
+        obp
+        ops
+        r
+        rbi
+        sac
+        sb
+        sf
+        slg
+        so
+        t
+        team
+    """
+
+    FIELDS = BATTING
+
+    def __init__(self, id):
+        Totals.__init__(self, id)
+        self.name = ''
+        self.team = ''
+
+    @property
+    def avg(self):
+        return _ratio(self.h, self.ab)
+
+    @property
+    def obp(self):
+        return _ratio(self.h + self.bb + self.hbp,
+                      self.ab + self.bb + self.hbp + self.sf)
+
+    @property
+    def slg(self):
+        bases = self.h + self.d + 2 * self.t + 3 * self.hr
+        return _ratio(bases, self.ab)
+
+    @property
+    def ops(self):
+        return round(self.obp + self.slg, 3)
+
+    def nice_output(self):
+        """Prints basic batting totals in a nice way."""
+        return '{0} - {1} for {2} with {3} Home Runs ({4:.3f})'.format(
+            self.name or self.id, self.h, self.ab, self.hr, self.avg)
+
+    def __str__(self):
+        return self.nice_output()
+
+
+class PitchingTotals(Totals):
+    """Running pitching totals for a player or a team.
+
+    Properties:
+        bb
+        bf
+        er
+        era
+        g
+        h
+        hr
+        id
+        ip
+        k9
+        losses
+        name
+        np
+        out
+        r
+        saves
+        so
+        team
+        whip
+        wins
+    """
+
+    FIELDS = PITCHING
+
+    def __init__(self, id):
+        Totals.__init__(self, id)
+        self.name = ''
+        self.team = ''
+        self.wins = 0
+        self.losses = 0
+        self.saves = 0
+
+    def add(self, stats):
+        """Add the counting stats and decision of a single game."""
+        Totals.add(self, stats)
+        # the w/l/sv attributes hold season numbers, the flags the decision
+        if getattr(stats, 'win', '') == 'true':
+            self.wins += 1
+        if getattr(stats, 'loss', '') == 'true':
+            self.losses += 1
+        if getattr(stats, 'save', '') == 'true':
+            self.saves += 1
+
+    @property
+    def ip(self):
+        """Innings pitched written the usual way, e.g. 119.2"""
+        return self.out // 3 + (self.out % 3) / 10.0
+
+    @property
+    def era(self):
+        return _ratio(self.er, self.out, 27)
+
+    @property
+    def whip(self):
+        return _ratio(self.h + self.bb, self.out, 3)
+
+    @property
+    def k9(self):
+        return _ratio(self.so, self.out, 27)
+
+    def nice_output(self):
+        """Prints basic pitching totals in a nice way."""
+        return '{0} - {1} IP, {2} ER, {3:.2f} ERA'.format(
+            self.name or self.id, self.ip, self.er, self.era)
+
+    def __str__(self):
+        return self.nice_output()
+
+
+class TeamTotals(object):
+    """Running totals for a team.
+
+    Properties:
+        batting
+        g
+        id
+        losses
+        pitching
+        wins
+    """
+
+    def __init__(self, id):
+        self.id = id
+        self.wins = 0
+        self.losses = 0
+        self.batting = BattingTotals(id)
+        self.pitching = PitchingTotals(id)
+
+    @property
+    def g(self):
+        return self.wins + self.losses
+
+    def nice_output(self):
+        """Prints the team record in a nice way."""
+        return '{0} ({1}-{2})'.format(self.id, self.wins, self.losses)
+
+    def __str__(self):
+        return self.nice_output()
+
+
+class SeasonAggregator(object):
+    """Keeps running per-player and per-team totals for a season.
+
+    Properties:
+        batters
+        game_ids
+        pitchers
+        teams
+    """
+
+    def __init__(self):
+        self.batters = {}
+        self.pitchers = {}
+        self.teams = {}
+        self.game_ids = set()
+        self.__player_games = set()
+        self.__team_games = set()
+
+    def __player(self, totals, cls, stats, team):
+        obj = totals.get(stats.id)
+        if obj is None:
+            obj = totals[stats.id] = cls(stats.id)
+        obj.name = getattr(stats, 'name_display_first_last', obj.name)
+        obj.team = team
+        obj.add(stats)
+
+    def __team(self, code):
+        if code not in self.teams:
+            self.teams[code] = TeamTotals(code)
+        return self.teams[code]
+
+    def add_player_stats(self, stats):
+        """Add a game from `mlbgame.player_stats()` to the totals.
+
+        Returns False if the game was already added.
+        """
+        if stats.game_id in self.__player_games:
+            return False
+        self.__player_games.add(stats.game_id)
+        self.game_ids.add(stats.game_id)
+        away, home = team_codes(stats.game_id)
+        for x in stats.home_batting:
+            self.__player(self.batters, BattingTotals, x, home)
+        for x in stats.away_batting:
+            self.__player(self.batters, BattingTotals, x, away)
+        for x in stats.home_pitching:
+            self.__player(self.pitchers, PitchingTotals, x, home)
+        for x in stats.away_pitching:
+            self.__player(self.pitchers, PitchingTotals, x, away)
+        return True
+
+    def add_team_stats(self, stats):
+        """Add a game from `mlbgame.team_stats()` to the totals.
+
+        Returns False if the game was already added.
+        """
+        if stats.game_id in self.__team_games:
+            return False
+        self.__team_games.add(stats.game_id)
+        self.game_ids.add(stats.game_id)
+        away, home = team_codes(stats.game_id)
+        home_team = self.__team(home)
+        away_team = self.__team(away)
+        home_team.batting.add(stats.home_batting)
+        home_team.pitching.add(stats.home_pitching)
+        away_team.batting.add(stats.away_batting)
+        away_team.pitching.add(stats.away_pitching)
+        home_runs = _count(stats.home_batting, 'r')
+        away_runs = _count(stats.away_batting, 'r')
+        if home_runs > away_runs:
+            home_team.wins += 1
+            away_team.losses += 1
+        elif away_runs > home_runs:
+            away_team.wins += 1
+            home_team.losses += 1
+        return True
+
+    def add_game_stats(self, stats):
+        """Add a game from `mlbgame.game_stats()` to the totals.
+
+        Returns False if the game was already added.
+        """
+        added = self.add_player_stats(stats.player_stats)
+        return self.add_team_stats(stats.team_stats) or added
+
+    def batter(self, player_id):
+        """Return the BattingTotals of the player with matching id."""
+        return self.batters.get(int(player_id))
+
+    def pitcher(self, player_id):
+        """Return the PitchingTotals of the player with matching id."""
+        return self.pitchers.get(int(player_id))
+
+    def team(self, code):
+        """Return the TeamTotals of the team with matching code."""
+        return self.teams.get(code)
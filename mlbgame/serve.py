@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+
+"""Module that runs a caching proxy for the files mlbgame gets from
+mlb.com, so many processes can share one cache.
+
+Start the proxy with:
+
+    python -m mlbgame.serve --port 8765
+
+and point the processes at it before they fetch anything:
+
+    mlbgame.data.PROXY_URL = 'http://localhost:8765'
+
+or set the `MLBGAME_PROXY` environment variable to the same address.
+Every `data.get_*()` call then asks the proxy, which keeps the files for
+`ttl` seconds, sends a single upstream request when several clients ask
+for the same file at the same time, and never has more than `upstream`
+requests to mlb.com open at once. Only hosts in `ALLOWED_HOSTS` are
+fetched.
+"""
+
+from __future__ import print_function
+
+import mlbgame.data
+
+import argparse
+from collections import OrderedDict
+import hashlib
+import json
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs, urlparse
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qs, urlparse
+
+ALLOWED_HOSTS = ('gd-terr-origin.mlb.com', 'gd2.mlb.com', 'mlb.mlb.com')
+"""Hosts the proxy fetches from, those used by `mlbgame.data`."""
+
+
+class _Pending(object):
+    # an upstream request that other clients wait for
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry = None
+        self.error = None
+
+
+class CachingProxy(object):
+    """Cache of upstream files shared by the clients of the proxy.
+
+    Properties:
+        allowed_hosts
+        max_entries
+        stats
+        timeout
+        ttl
+    """
+
+    def __init__(self, ttl=60, upstream=4, max_entries=10000,
+                 allowed_hosts=ALLOWED_HOSTS, timeout=30):
+        """Creates a cache that keeps files for `ttl` seconds, up to
+        `max_entries` of them, with at most `upstream` requests to
+        mlb.com at once.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.allowed_hosts = frozenset(allowed_hosts)
+        self.timeout = timeout
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0,
+                      'upstream': 0, 'errors': 0}
+        self.__entries = OrderedDict()
+        self.__pending = {}
+        self.__lock = threading.Lock()
+        self.__upstream = threading.BoundedSemaphore(upstream)
+
+    def allowed(self, url):
+        """Return True if the proxy may fetch `url`."""
+        parsed = urlparse(url)
+        return parsed.scheme in ('http', 'https') \
+            and parsed.hostname in self.allowed_hosts
+
+    def __fetch(self, url):
+        with self.__upstream:
+            self.__count('upstream')
+            try:
+                try:
+                    response = mlbgame.data.urlopen(url,
+                                                    timeout=self.timeout)
+                    status = 200
+                    body = response.read()
+                except mlbgame.data.HTTPError as e:
+                    # a missing file is an answer, other errors are not
+                    if e.code != 404:
+                        raise
+                    status = e.code
+                    body = e.read()
+            except Exception as e:
+                # unreachable or failing upstream, the clients get a 502
+                # that is not cached
+                self.__count('errors')
+                return {'status': 502, 'body': str(e).encode('utf-8'),
+                        'etag': None, 'expires': 0}
+        etag = '"{0}"'.format(hashlib.sha1(body).hexdigest())
+        return {'status': status, 'body': body, 'etag': etag,
+                'expires': time.time() + self.ttl}
+
+    def __count(self, name):
+        with self.__lock:
+            self.stats[name] += 1
+
+    def get(self, url):
+        """Return the cache entry of `url` and whether it was a hit.
+
+        Entries are dictionaries with the `status`, `body` and `etag` of
+        the upstream response. If the upstream request failed in another
+        way its error is raised, to every client that waited for it.
+        """
+        with self.__lock:
+            entry = self.__entries.get(url)
+            if entry is not None and entry['expires'] > time.time():
+                # most recently used files are evicted last
+                self.__entries[url] = self.__entries.pop(url)
+                self.stats['hits'] += 1
+                return entry, True
+            pending = self.__pending.get(url)
+            if pending is None:
+                pending = self.__pending[url] = _Pending()
+                owner = True
+                self.stats['misses'] += 1
+            else:
+                owner = False
+                self.stats['coalesced'] += 1
+        if not owner:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.entry, True
+        entry = None
+        try:
+            entry = self.__fetch(url)
+        except Exception as e:
+            self.__count('errors')
+            pending.error = e
+            raise
+        finally:
+            with self.__lock:
+                pending.entry = entry
+                del self.__pending[url]
+                if entry is not None and entry['expires']:
+                    self.__entries.pop(url, None)
+                    self.__entries[url] = entry
+                    while len(self.__entries) > self.max_entries:
+                        self.__entries.popitem(last=False)
+            pending.done.set()
+        return entry, False
+
+    def clear(self):
+        """Drop every cached file."""
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self):
+        return len(self.__entries)
+
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    """Answers `GET /fetch?url=...` from the `proxy` of the server, and
+    `GET /stats` with the counters of the cache."""
+
+    def __send(self, status, body, headers=()):
+        self.send_response(status)
+        for x in headers:
+            self.send_header(*x)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        proxy = self.server.proxy
+        parsed = urlparse(self.path)
+        if parsed.path == '/stats':
+            stats = dict(proxy.stats, entries=len(proxy))
+            self.__send(200, json.dumps(stats).encode('utf-8'),
+                        [('Content-Type', 'application/json')])
+            return
+        url = parse_qs(parsed.query).get('url', [None])[0]
+        if parsed.path != '/fetch' or not url:
+            self.__send(404, b'Use /fetch?url=<url> or /stats')
+            return
+        if not proxy.allowed(url):
+            self.__send(403, b'Host not allowed')
+            return
+        try:
+            entry, hit = proxy.get(url)
+        except Exception as e:
+            self.__send(502, str(e).encode('utf-8'))
+            return
+        headers = [('X-Cache', 'HIT' if hit else 'MISS')]
+        if entry['etag'] is not None:
+            headers.append(('ETag', entry['etag']))
+            if entry['status'] == 200 \
+                    and self.headers.get('If-None-Match') == entry['etag']:
+                self.__send(304, b'', headers)
+                return
+        self.__send(entry['status'], entry['body'], headers)
+
+    def log_message(self, *args):
+        if self.server.verbose:
+            BaseHTTPRequestHandler.log_message(self, *args)
+
+
+class ProxyServer(ThreadingMixIn, HTTPServer):
+    """Threaded HTTP server for a `CachingProxy`.
+
+    Properties:
+        proxy
+        verbose
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, proxy=None, verbose=False):
+        HTTPServer.__init__(self, address, ProxyHandler)
+        self.proxy = proxy if proxy is not None else CachingProxy()
+        self.verbose = verbose
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m mlbgame.serve',
+        description='Caching proxy for the files mlbgame gets from mlb.com')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--ttl', type=float, default=60,
+                        help='seconds files are cached')
+    parser.add_argument('--upstream', type=int, default=4,
+                        help='maximum concurrent requests to mlb.com')
+    parser.add_argument('--max-entries', type=int, default=10000)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args(args)
+    proxy = CachingProxy(args.ttl, args.upstream, args.max_entries)
+    server = ProxyServer((args.host, args.port), proxy, args.verbose)
+    print('Serving mlbgame proxy on http://{0}:{1}'.format(
+        *server.server_address[:2]))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
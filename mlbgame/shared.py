@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+
+"""Module that shares parsed season data between processes as columnar
+tables in a memory-mapped file.
+
+One process builds the tables from the output of `game.scoreboard()` and
+`stats.player_stats()` and publishes them, preferably to a memory backed
+filesystem such as /dev/shm:
+
+    tables = mlbgame.shared.season_tables(scoreboards, player_stats)
+    mlbgame.shared.publish('/dev/shm/mlb-2016', tables)
+
+Every worker then attaches to the same pages of memory instead of
+keeping its own copy:
+
+    season = mlbgame.shared.attach('/dev/shm/mlb-2016')
+    games = season['games']
+    runs = games.column('home_team_runs')  # read-only view, no copy
+    games.row(0)['home_team']
+
+Numbers are stored as 64 bit integers or floats, in the byte order of
+the machine. Strings are stored as 32 bit codes into a list of the
+distinct values of the column, which is kept in the header of the file.
+Missing values are `MISSING` in integer columns, NaN in float columns
+and -1 in string columns, and None in rows.
+"""
+
+import mlbgame.object
+
+from array import array
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+MAGIC = b'MLBGTBL1'
+# magic followed by the length of the JSON header
+_PREFIX = struct.Struct('<8sQ')
+MISSING = -2 ** 63
+"""Value of missing numbers in integer columns."""
+# array typecodes of the column types
+TYPECODES = {'int': 'q', 'float': 'd', 'str': 'i'}
+
+
+def _values(rows, name):
+    values = []
+    for x in rows:
+        value = x.get(name)
+        if value is None or value == '':
+            values.append(None)
+        elif isinstance(value, (int, float)):
+            values.append(value)
+        else:
+            values.append(mlbgame.object.infer(value))
+    return values
+
+
+def _column(values):
+    # column type and array of a list of values, None for missing ones
+    kinds = set(type(x) for x in values if x is not None)
+    if kinds and kinds <= set([int, bool]) \
+            and all(MISSING < x < 2 ** 63 for x in values if x is not None):
+        return 'int', array('q', [MISSING if x is None else x
+                                  for x in values]), None
+    if kinds and kinds <= set([int, bool, float]):
+        return 'float', array('d', [float('nan') if x is None else x
+                                    for x in values]), None
+    strings = {}
+    codes = array('i')
+    for x in values:
+        if x is None:
+            codes.append(-1)
+        else:
+            codes.append(strings.setdefault(str(x), len(strings)))
+    return 'str', codes, sorted(strings, key=strings.get)
+
+
+def season_tables(scoreboards, player_stats):
+    """Return the rows of the `games`, `batting` and `pitching` tables.
+
+    `scoreboards` are results of `game.scoreboard()` and `player_stats`
+    maps game ids to the result of `stats.player_stats()`. Player rows
+    are the joined `batters` and `pitchers` records, with the `game_id`
+    and the `team` ('home' or 'away') of the player.
+    """
+    games = []
+    for x in scoreboards:
+        games.extend(x[y] for y in sorted(x))
+    tables = {'games': games, 'batting': [], 'pitching': []}
+    for game_id in sorted(player_stats):
+        stats = player_stats[game_id]
+        for table, joined in (('batting', 'batters'),
+                              ('pitching', 'pitchers')):
+            for team in ('home', 'away'):
+                for x in stats['{0}_{1}'.format(team, table)]:
+                    row = dict(stats[joined].get(x.get('id'), x))
+                    row['game_id'] = game_id
+                    row['team'] = team
+                    tables[table].append(row)
+    return tables
+
+
+def publish(path, tables):
+    """Write `tables`, a dictionary of table names and lists of rows, to
+    the file at `path`.
+
+    The file is replaced atomically, so processes attached to an older
+    version keep reading it until they attach again.
+    """
+    header = {'byteorder': sys.byteorder, 'tables': {}}
+    blocks = []
+    for name in sorted(tables):
+        rows = tables[name]
+        names = sorted(set(y for x in rows for y in x))
+        columns = []
+        for x in names:
+            kind, data, strings = _column(_values(rows, x))
+            columns.append({'name': x, 'type': kind, 'strings': strings})
+            blocks.append(data)
+        header['tables'][name] = {'rows': len(rows), 'columns': columns}
+    # offsets are from the end of the header, each aligned to 8 bytes
+    offset = 0
+    columns = [y for x in sorted(header['tables'])
+               for y in header['tables'][x]['columns']]
+    for column, data in zip(columns, blocks):
+        column['offset'] = offset
+        offset += len(data) * data.itemsize
+        offset += -offset % 8
+    encoded = json.dumps(header).encode('utf-8')
+    encoded += b' ' * (-(_PREFIX.size + len(encoded)) % 8)
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as f:
+            f.write(_PREFIX.pack(MAGIC, len(encoded)))
+            f.write(encoded)
+            start = f.tell()
+            for column, data in zip(columns, blocks):
+                f.write(b'\0' * (start + column['offset'] - f.tell()))
+                data.tofile(f)
+        getattr(os, 'replace', os.rename)(temporary, path)
+    except Exception:
+        os.remove(temporary)
+        raise
+
+
+class Table(object):
+    """Columns of a table in an attached file.
+
+    Properties:
+        columns
+        name
+        rows
+    """
+
+    def __init__(self, name, rows, columns, buffer):
+        # `buffer` starts at the first column
+        self.name = name
+        self.rows = rows
+        self.columns = [x['name'] for x in columns]
+        self.__columns = dict((x['name'], x) for x in columns)
+        self.__buffer = buffer
+        self.__views = {}
+
+    def __len__(self):
+        return self.rows
+
+    def type(self, name):
+        """Return the type of column `name`: 'int', 'float' or 'str'."""
+        return self.__columns[name]['type']
+
+    def strings(self, name):
+        """Return the distinct values of the string column `name`, in the
+        order of their codes."""
+        return self.__columns[name]['strings']
+
+    def column(self, name):
+        """Return a read-only memoryview of column `name`.
+
+        The view points into the shared file, nothing is copied. String
+        columns are viewed as their codes, see `strings()`.
+        """
+        view = self.__views.get(name)
+        if view is None:
+            column = self.__columns[name]
+            typecode = TYPECODES[column['type']]
+            end = column['offset'] + self.rows * array(typecode).itemsize
+            view = self.__buffer[column['offset']:end].cast(typecode)
+            self.__views[name] = view
+        return view
+
+    def value(self, name, index):
+        """Return the value of column `name` in row `index`."""
+        value = self.column(name)[index]
+        kind = self.type(name)
+        if kind == 'int':
+            return None if value == MISSING else value
+        if kind == 'float':
+            return None if value != value else value
+        return None if value < 0 else self.strings(name)[value]
+
+    def row(self, index):
+        """Return row `index` as a dictionary."""
+        if not -self.rows <= index < self.rows:
+            raise IndexError('row index out of range')
+        index %= self.rows
+        return dict((x, self.value(x, index)) for x in self.columns)
+
+    def __iter__(self):
+        for x in range(self.rows):
+            yield self.row(x)
+
+    def release(self):
+        """Release the views of the columns, which can no longer be read."""
+        for x in self.__views.values():
+            x.release()
+        self.__views.clear()
+        self.__buffer.release()
+
+
+class SharedSeason(object):
+    """Tables of a file published with `publish()`, mapped read-only.
+
+    Properties:
+        path
+        tables
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.__map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__buffer = memoryview(self.__map)
+        magic, length = _PREFIX.unpack_from(self.__map)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError('Not a mlbgame table file: ' + path)
+        start = _PREFIX.size
+        header = json.loads(
+            self.__map[start:start + length].decode('utf-8'))
+        if header['byteorder'] != sys.byteorder:
+            self.close()
+            raise ValueError('Table file written with another byte order')
+        self.tables = {}
+        for name, table in header['tables'].items():
+            self.tables[name] = Table(name, table['rows'], table['columns'],
+                                      self.__buffer[start + length:])
+
+    def __getitem__(self, name):
+        return self.tables[name]
+
+    def close(self):
+        """Release the columns and unmap the file."""
+        for x in getattr(self, 'tables', {}).values():
+            x.release()
+        self.__buffer.release()
+        self.__map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def attach(path):
+    """Return the `SharedSeason` of the file at `path`."""
+    return SharedSeason(path)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+
+"""Module that archives the snapshots of `events.game_events()` polled
+during live games, so the games can be replayed.
+
+Every snapshot of game_events.xml repeats the at bats of the earlier
+ones. The store keeps each snapshot as a delta against the one before:
+the number of at bats that did not change and the at bats after them.
+Every `keyframe_interval` snapshots a full copy is stored, so any
+snapshot is rebuilt from at most that many rows:
+
+    store = mlbgame.snapshots.SnapshotStore('snapshots.db')
+    # at every poll
+    store.add(game_id, mlbgame.events.game_events(game_id))
+    # the game as it was at the 120th poll
+    store.snapshot(game_id, 120)
+
+Rows are zlib-compressed JSON in a SQLite database.
+"""
+
+import json
+import sqlite3
+import time
+import zlib
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS snapshots (game_id TEXT NOT NULL, seq '
+    'INTEGER NOT NULL, taken REAL NOT NULL, keyframe INTEGER NOT NULL, '
+    'size INTEGER NOT NULL, data BLOB NOT NULL, PRIMARY KEY (game_id, seq))',
+]
+"""Statements that create the table of the store."""
+HALVES = ('top', 'bottom')
+
+
+def _flatten(events):
+    # inning numbers and the list of [inning, half, at bat] of a snapshot
+    innings = sorted(events, key=int)
+    atbats = [[x, y, z] for x in innings for y in HALVES
+              for z in events[x][y]]
+    return innings, atbats
+
+
+def _unflatten(innings, atbats):
+    output = dict((x, {'top': [], 'bottom': []}) for x in innings)
+    for inning, half, atbat in atbats:
+        output[inning][half].append(atbat)
+    return output
+
+
+def _encode(data):
+    return zlib.compress(json.dumps(data, separators=(',', ':'))
+                         .encode('utf-8'))
+
+
+def _decode(data):
+    return json.loads(zlib.decompress(data).decode('utf-8'))
+
+
+def _delta(previous, current):
+    # the at bats of `current` after those it shares with `previous`
+    keep = 0
+    for x, y in zip(previous[1], current[1]):
+        if x != y:
+            break
+        keep += 1
+    delta = {'keep': keep, 'atbats': current[1][keep:]}
+    if current[0] != previous[0]:
+        delta['innings'] = current[0]
+    return delta
+
+
+def _apply(previous, delta):
+    return (delta.get('innings', previous[0]),
+            previous[1][:delta['keep']] + delta['atbats'])
+
+
+class SnapshotStore(object):
+    """SQLite store of delta-compressed game_events snapshots.
+
+    Properties:
+        connection
+        keyframe_interval
+        path
+    """
+
+    def __init__(self, path=':memory:', keyframe_interval=50):
+        """Opens the store at `path`, creating the table if needed."""
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            for x in SCHEMA:
+                self.connection.execute(x)
+        # last flattened snapshot and its number, by game id
+        self.__last = {}
+
+    def close(self):
+        """Close the database."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def count(self, game_id):
+        """Return the number of snapshots of a game."""
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM snapshots WHERE game_id = ?',
+            (game_id,)).fetchone()[0]
+
+    def game_ids(self):
+        """Return the ids of the games with snapshots."""
+        return [x[0] for x in self.connection.execute(
+            'SELECT DISTINCT game_id FROM snapshots ORDER BY game_id')]
+
+    def __flat(self, game_id, seq):
+        # rebuild a snapshot from the keyframe before it
+        rows = self.connection.execute(
+            'SELECT seq, keyframe, data FROM snapshots WHERE game_id = ? AND '
+            'seq <= ? AND seq >= (SELECT MAX(seq) FROM snapshots WHERE '
+            'game_id = ? AND seq <= ? AND keyframe) ORDER BY seq',
+            (game_id, seq, game_id, seq)).fetchall()
+        if not rows or rows[-1][0] != seq:
+            raise ValueError('Could not find the snapshot of that game.')
+        flat = None
+        for x, keyframe, data in rows:
+            data = _decode(data)
+            flat = tuple(data) if keyframe else _apply(flat, data)
+        return flat
+
+    def add(self, game_id, events, taken=None):
+        """Store a snapshot of `events`, the dictionary returned by
+        `events.game_events()`, taken at `taken` (default: now).
+
+        Returns the number of the snapshot, counted from 0.
+        """
+        last = self.__last.get(game_id)
+        if last is None:
+            seq = self.count(game_id)
+            if seq:
+                last = (seq - 1, self.__flat(game_id, seq - 1))
+        seq = 0 if last is None else last[0] + 1
+        current = _flatten(events)
+        keyframe = seq % self.keyframe_interval == 0
+        data = list(current) if keyframe else _delta(last[1], current)
+        size = len(json.dumps(events, separators=(',', ':')))
+        with self.connection:
+            self.connection.execute(
+                'INSERT INTO snapshots VALUES (?, ?, ?, ?, ?, ?)',
+                (game_id, seq, time.time() if taken is None else taken,
+                 int(keyframe), size, sqlite3.Binary(_encode(data))))
+        self.__last[game_id] = (seq, current)
+        return seq
+
+    def snapshot(self, game_id, seq):
+        """Return snapshot `seq` of a game as it was given to `add()`."""
+        return _unflatten(*self.__flat(game_id, seq))
+
+    def times(self, game_id):
+        """Return the times the snapshots of a game were taken."""
+        return [x[0] for x in self.connection.execute(
+            'SELECT taken FROM snapshots WHERE game_id = ? ORDER BY seq',
+            (game_id,))]
+
+    def replay(self, game_id):
+        """Yield every snapshot of a game in order, with the time it was
+        taken.
+
+        Snapshots share the at bats that did not change, so they should
+        not be modified.
+        """
+        flat = None
+        for taken, keyframe, data in self.connection.execute(
+                'SELECT taken, keyframe, data FROM snapshots WHERE game_id = '
+                '? ORDER BY seq', (game_id,)).fetchall():
+            data = _decode(data)
+            flat = tuple(data) if keyframe else _apply(flat, data)
+            yield taken, _unflatten(*flat)
+
+    def stats(self, game_id=None):
+        """Return the number of snapshots, the `bytes` of their JSON and
+        the `stored_bytes` of the rows, of a game or of every game."""
+        sql = 'SELECT COUNT(*), SUM(size), SUM(LENGTH(data)) FROM snapshots'
+        params = ()
+        if game_id is not None:
+            sql += ' WHERE game_id = ?'
+            params = (game_id,)
+        count, size, stored = self.connection.execute(sql, params).fetchone()
+        return {'snapshots': count, 'bytes': size or 0,
+                'stored_bytes': stored or 0,
+                'ratio': float(size or 0) / (stored or 1)}
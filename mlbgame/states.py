@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+
+"""Module that is used for following the base/out state of games
+and for building run expectancy from those states.
+
+A base/out state is stored as a single code: the occupied bases as bit
+flags (1 for first, 2 for second and 4 for third) plus 8 for every out.
+That gives the 24 standard states (0-23) and `END` for a finished half
+inning.
+
+Run expectancy leaves out the half innings that end with fewer than
+three outs, such as walk-offs and games called early, as standard tables
+do: their runs to the end of the inning are cut short.
+"""
+
+import mlbgame.events
+import mlbgame.object
+
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# bit flags for occupied bases
+FIRST = 1
+SECOND = 2
+THIRD = 4
+# code used once the third out has been made
+END = 24
+# number of real base/out states
+STATES = 24
+
+
+def state_code(bases, outs):
+    """Return the state code for the bases bit flags and number of outs."""
+    if outs >= 3:
+        return END
+    return bases + 8 * outs
+
+
+def __occupied(value):
+    # GameDay leaves the base empty or puts the id of the runner on it
+    return value not in ('', None, 0, '0')
+
+
+def __bases(atbat):
+    bases = 0
+    if __occupied(atbat.get('b1')):
+        bases |= FIRST
+    if __occupied(atbat.get('b2')):
+        bases |= SECOND
+    if __occupied(atbat.get('b3')):
+        bases |= THIRD
+    return bases
+
+
+def __half_states(atbats, inning, half, score):
+    # the away team hits in the top, the home team in the bottom
+    side = 'away_team_runs' if half == 'top' else 'home_team_runs'
+    output = []
+    bases = 0
+    outs = 0
+    for atbat in atbats:
+        end_bases = __bases(atbat)
+        end_outs = int(atbat.get('o') or 0)
+        runs_after = atbat.get(side)
+        runs_after = score[side] if runs_after in (None, '') \
+            else int(runs_after)
+        output.append({
+            'inning': inning,
+            'half': half,
+            'num': int(atbat.get('num') or 0),
+            'batter': atbat.get('batter', ''),
+            'pitcher': atbat.get('pitcher', ''),
+            'event': atbat.get('event', ''),
+            'start_bases': bases,
+            'start_outs': outs,
+            'start_state': state_code(bases, outs),
+            'end_bases': end_bases if end_outs < 3 else 0,
+            'end_outs': end_outs,
+            'end_state': state_code(end_bases, end_outs),
+            'runs': runs_after - score[side],
+        })
+        score[side] = runs_after
+        bases = end_bases if end_outs < 3 else 0
+        outs = end_outs
+    # runs scored from each plate appearance to the end of the half inning
+    remaining = 0
+    for x in reversed(output):
+        remaining += x['runs']
+        x['runs_to_end'] = remaining
+        x['complete'] = outs >= 3
+    return output
+
+
+def game_states(data):
+    """Return the list of base/out state transitions for a game.
+
+    `data` should be the dictionary returned by `events.game_events()`.
+    The at bats are walked once, in order, keeping the running score so
+    that the runs scored on every plate appearance can be derived.
+    """
+    score = {'away_team_runs': 0, 'home_team_runs': 0}
+    output = []
+    for inning in sorted(data, key=int):
+        for half in ('top', 'bottom'):
+            output.extend(__half_states(data[inning][half], int(inning),
+                                        half, score))
+    return output
+
+
+def base_out_states(game_id):
+    """Return the base/out state transitions for a game with matching id."""
+    return game_states(mlbgame.events.game_events(game_id))
+
+
+class StateTransition(mlbgame.object.Object):
+    """Holds the change in base/out state caused by a plate appearance.
+
+    Properties:
+        batter
+        complete
+        end_bases
+        end_outs
+        end_state
+        event
+        half
+        inning
+        num
+        pitcher
+        runs
+        runs_to_end
+        start_bases
+        start_outs
+        start_state
+    """
+
+    def nice_output(self):
+        """Prints basic transition info in a nice way."""
+        return '{0} {1}: {2} -> {3} ({4} runs)'.format(
+            self.half.capitalize(), self.inning, self.start_state,
+            self.end_state, self.runs)
+
+    def __str__(self):
+        return self.nice_output()
+
+
+class StateTable(object):
+    """Columnar table of base/out transitions for many games.
+
+    Each column is a compact `array` so a season of plate appearances
+    can be held and aggregated without keeping a dictionary per at bat.
+
+    Properties:
+        complete
+        end_state
+        game_ids
+        runs
+        runs_to_end
+        start_state
+    """
+
+    def __init__(self):
+        self.game_ids = []
+        self.start_state = array('b')
+        self.end_state = array('b')
+        self.runs = array('b')
+        self.runs_to_end = array('b')
+        # 1 if the half inning of the transition ended with three outs
+        self.complete = array('b')
+
+    def __len__(self):
+        return len(self.start_state)
+
+    def add_game(self, game_id, transitions):
+        """Append the transitions of a game to the table.
+
+        `transitions` should come from `game_states()`.
+        """
+        self.game_ids.append(game_id)
+        self.start_state.extend(x['start_state'] for x in transitions)
+        self.end_state.extend(x['end_state'] for x in transitions)
+        self.runs.extend(x['runs'] for x in transitions)
+        self.runs_to_end.extend(x['runs_to_end'] for x in transitions)
+        self.complete.extend(int(x.get('complete', True))
+                             for x in transitions)
+
+    def run_expectancy(self, truncated=False):
+        """Return the `RunExpectancy` matrix for the table.
+
+        The half innings that ended with fewer than three outs are only
+        counted if `truncated` is True.
+        """
+        if numpy is not None:
+            states = numpy.frombuffer(self.start_state, dtype=numpy.int8)
+            runs = numpy.frombuffer(self.runs_to_end, dtype=numpy.int8)
+            if not truncated:
+                keep = numpy.frombuffer(self.complete,
+                                        dtype=numpy.int8).astype(bool)
+                states = states[keep]
+                runs = runs[keep]
+            counts = numpy.bincount(states, minlength=END + 1)
+            totals = numpy.bincount(states, weights=runs,
+                                    minlength=END + 1)
+            counts = [int(x) for x in counts[:STATES]]
+            totals = [int(x) for x in totals[:STATES]]
+        else:
+            counts = [0] * (END + 1)
+            totals = [0] * (END + 1)
+            for state, runs, complete in zip(self.start_state,
+                                             self.runs_to_end,
+                                             self.complete):
+                if complete or truncated:
+                    counts[state] += 1
+                    totals[state] += runs
+            counts = counts[:STATES]
+            totals = totals[:STATES]
+        return RunExpectancy(counts, totals)
+
+
+class RunExpectancy(object):
+    """Average runs scored from each base/out state to the end of the
+    half inning.
+
+    Properties:
+        counts
+        totals
+    """
+
+    def __init__(self, counts, totals):
+        """Creates a run expectancy matrix from the plate appearance
+        `counts` and the `totals` of runs scored, indexed by state code.
+        """
+        self.counts = counts
+        self.totals = totals
+
+    def get(self, bases, outs):
+        """Return the expected runs for the bases flags and outs."""
+        state = state_code(bases, outs)
+        if state == END or not self.counts[state]:
+            return 0.0
+        return float(self.totals[state]) / self.counts[state]
+
+    def nice_output(self):
+        """Prints the matrix with a row per base state."""
+        output = 'Bases\t0 out\t1 out\t2 out\n'
+        for bases in range(8):
+            label = ''.join(x if bases & y else '-'
+                            for x, y in (('1', FIRST), ('2', SECOND),
+                                         ('3', THIRD)))
+            output += label + '\t' + '\t'.join(
+                '{0:.3f}'.format(self.get(bases, outs))
+                for outs in range(3)) + '\n'
+        return output
+
+    def __str__(self):
+        return self.nice_output()
@@ -4,10 +4,14 @@
 information."""
 
 import mlbgame.data
+import mlbgame.metrics
 import mlbgame.object
 
 import lxml.etree as etree
 
+# attributes that repeat across games, see `mlbgame.object.intern_value`
+INTERNED = ('name', 'name_display_first_last', 'pos', 'team_flag')
+
 def __player_stats_info(data, name):
     home = []
     away = []
@@ -18,6 +22,7 @@ def __player_stats_info(data, name):
             # loop through and save stats
             for i in x.attrib:
                 stats[i] = x.attrib[i]
+            mlbgame.object.intern_values(stats, INTERNED)
             # apply to correct list
             home.append(stats) if y.attrib['team_flag'] == 'home' else away.append(stats)
     return (home, away)
@@ -35,6 +40,7 @@ def __raw_player_stats_info(data):
             stats = {}
             for i in pitcher.attrib:
                 stats[i] = pitcher.attrib[i]
+            mlbgame.object.intern_values(stats, INTERNED)
             home_pitchers.append(stats) if home_flag else away_pitchers.append(stats)
 
         batting = team.find('batting')
@@ -42,6 +48,7 @@ def __raw_player_stats_info(data):
             stats = {}
             for i in batter.attrib:
                 stats[i] = batter.attrib[i]
+            mlbgame.object.intern_values(stats, INTERNED)
             home_batters.append(stats) if home_flag else away_batters.append(stats)
     home = {
         'pitchers': home_pitchers,
@@ -54,19 +61,24 @@ def __raw_player_stats_info(data):
     }
     return (home, away)
 
-def player_stats(game_id):
-    """Return dictionary of individual stats of a game with matching id.
+def __joined_player_stats(rows, additional_rows):
+    # index the rawboxscore rows by player id for the hash join
+    index = {}
+    for x in additional_rows:
+        index[x.get('id')] = x
+    output = {}
+    for x in rows:
+        stats = dict(index.get(x.get('id'), {}))
+        # boxscore values win over the rawboxscore ones
+        stats.update(x)
+        output[x.get('id')] = stats
+    # players that are only in the rawboxscore
+    for x in index:
+        if x not in output:
+            output[x] = dict(index[x])
+    return output
 
-       The additional pitching/batting is mostly the same stats, except it contains
-       some useful stats such as groundouts/flyouts per pitcher (go/ao). MLB decided
-       to have two box score files, thus we return the data from both.
-    """
-    # get data from data module
-    box_score = mlbgame.data.get_box_score(game_id)
-    raw_box_score = mlbgame.data.get_raw_box_score(game_id)
-    # parse XML
-    box_score_tree = etree.parse(box_score).getroot()
-    raw_box_score_tree = etree.parse(raw_box_score).getroot()
+def __player_stats(box_score_tree, raw_box_score_tree):
     # get pitching and batting info
     pitching = box_score_tree.findall('pitching')
     batting = box_score_tree.findall('batting')
@@ -88,16 +100,49 @@ def player_stats(game_id):
         'home_additional_pitching': addl_home_pitching,
         'away_additional_pitching': addl_away_pitching,
         'home_additional_batting': addl_home_batting,
-        'away_additional_batting': addl_away_batting
+        'away_additional_batting': addl_away_batting,
+        'pitchers': __joined_player_stats(
+            pitching_info[0] + pitching_info[1],
+            addl_home_pitching + addl_away_pitching),
+        'batters': __joined_player_stats(
+            batting_info[0] + batting_info[1],
+            addl_home_batting + addl_away_batting)
     }
     return output
 
+def __box_score_trees(game_id):
+    # get data from data module
+    box_score = mlbgame.data.get_box_score(game_id)
+    raw_box_score = mlbgame.data.get_raw_box_score(game_id)
+    # the parse phase starts once both files are fetched
+    start = mlbgame.metrics.start()
+    # parse XML
+    box_score_tree = etree.parse(box_score).getroot()
+    raw_box_score_tree = etree.parse(raw_box_score).getroot()
+    return (box_score_tree, raw_box_score_tree, start)
+
+def player_stats(game_id):
+    """Return dictionary of individual stats of a game with matching id.
+
+       The additional pitching/batting is mostly the same stats, except it contains
+       some useful stats such as groundouts/flyouts per pitcher (go/ao). MLB decided
+       to have two box score files, thus we return the data from both.
+
+       The rows of both files are also joined by player id into a single
+       record per batter and per pitcher (`batters` and `pitchers`).
+    """
+    box_score_tree, raw_box_score_tree, start = __box_score_trees(game_id)
+    output = __player_stats(box_score_tree, raw_box_score_tree)
+    mlbgame.metrics.stop('parse', 'player_stats', start)
+    return output
+
 def __team_stats_info(data, output, output_key):
     for x in data:
         stats = {}
         # loop through stats and save
         for y in x.attrib:
             stats[y] = x.attrib[y]
+        mlbgame.object.intern_values(stats, INTERNED)
         # apply to correct team
         if x.attrib['team_flag'] == 'home':
             # Example: 'home_batting' when output_key is 'batting'
@@ -128,18 +173,7 @@ def __raw_team_stats_info(data, output):
             output['away_additional_batting'] = stats
     return output
 
-def team_stats(game_id):
-    """Return team stats of a game with matching id.
-
-    The additional pitching/batting is mostly the same stats. MLB decided
-    to have two box score files, thus we return the data from both.
-    """
-    # get data from data module
-    box_score = mlbgame.data.get_box_score(game_id)
-    raw_box_score = mlbgame.data.get_raw_box_score(game_id)
-    # parse XML
-    box_score_tree = etree.parse(box_score).getroot()
-    raw_box_score_tree = etree.parse(raw_box_score).getroot()
+def __team_stats(box_score_tree, raw_box_score_tree):
     # get pitching and batting ingo
     pitching = box_score_tree.findall('pitching')
     batting = box_score_tree.findall('batting')
@@ -150,6 +184,31 @@ def team_stats(game_id):
     output = __raw_team_stats_info(raw_box_score_tree, output)
     return output
 
+def team_stats(game_id):
+    """Return team stats of a game with matching id.
+
+    The additional pitching/batting is mostly the same stats. MLB decided
+    to have two box score files, thus we return the data from both.
+    """
+    box_score_tree, raw_box_score_tree, start = __box_score_trees(game_id)
+    output = __team_stats(box_score_tree, raw_box_score_tree)
+    mlbgame.metrics.stop('parse', 'team_stats', start)
+    return output
+
+def game_stats(game_id):
+    """Return player and team stats of a game with matching id.
+
+    Both box score files are fetched and parsed once and used for
+    the player stats and the team stats.
+    """
+    box_score_tree, raw_box_score_tree, start = __box_score_trees(game_id)
+    output = {
+        'player': __player_stats(box_score_tree, raw_box_score_tree),
+        'team': __team_stats(box_score_tree, raw_box_score_tree)
+    }
+    mlbgame.metrics.stop('parse', 'game_stats', start)
+    return output
+
 class Stats(object):
     """Hold stats information for a game.
 
@@ -163,6 +222,8 @@ class Stats(object):
         away_additional_batting
         home_additional_pitching
         home_additional_batting
+        batters
+        pitchers
     """
 
     def __init__(self, data, game_id, player):
@@ -174,7 +235,16 @@ class Stats(object):
         output = {'home_pitching': [], 'away_pitching': [], 'home_batting': [],
                   'away_batting': [], 'home_additional_pitching': [], 'home_additional_batting': [],
                   'away_additional_pitching': [], 'away_additional_batting': []}
+        # joined boxscore and rawboxscore records keyed by player id
+        self.batters = {}
+        self.pitchers = {}
         for y in data:
+            if y == 'batters' or y == 'pitchers':
+                joined = getattr(self, y)
+                for x in data[y].values():
+                    obj = PlayerStats(x)
+                    joined[obj.id] = obj
+                continue
             # create objects for all data
             if player:
                 for x in data[y]:
@@ -192,6 +262,38 @@ class Stats(object):
         self.home_additional_batting = output['home_additional_batting']
         self.away_additional_batting = output['away_additional_batting']
 
+    def batter(self, player_id):
+        """Return the joined batting stats of the player with matching id.
+
+        Returns `None` if the player did not bat in the game.
+        """
+        return self.batters.get(int(player_id))
+
+    def pitcher(self, player_id):
+        """Return the joined pitching stats of the player with matching id.
+
+        Returns `None` if the player did not pitch in the game.
+        """
+        return self.pitchers.get(int(player_id))
+
+class GameStats(object):
+    """Hold player and team stats information for a game.
+
+    Properties:
+        game_id
+        player_stats
+        team_stats
+    """
+
+    def __init__(self, data, game_id):
+        """Creates a game stats object from the info in `data`.
+        `data` should come from the `game_stats()` function.
+        'game_id' should be the id for the game.
+        """
+        self.game_id = game_id
+        self.player_stats = Stats(data['player'], game_id, True)
+        self.team_stats = Stats(data['team'], game_id, False)
+
 class PlayerStats(mlbgame.object.Object):
     """Holds stats information for a player.
     Properties:
@@ -0,0 +1,426 @@
+#!/usr/bin/env python
+
+"""Module that keeps GameDay data in a local SQLite database.
+
+Games are ingested with the same functions that the rest of mlbgame
+uses to read mlb.com (`game.scoreboard()`, `game.box_score()`,
+`stats.game_stats()`, `game.players()` and `events.game_events()`), so a
+season can be loaded once and then queried without fetching the files
+again:
+
+    warehouse = mlbgame.warehouse.Warehouse('mlb.db')
+    warehouse.ingest_days(2015, 6)
+    june = warehouse.games(date(2015, 6, 1), date(2015, 6, 30),
+                           home='Mets', away='Mets')
+    log = warehouse.game_log(592450)
+
+Ingesting is incremental by game id: the details of a final game are
+stored once, in a single transaction, and skipped when it is seen again.
+"""
+
+import mlbgame.data
+import mlbgame.events
+import mlbgame.game
+import mlbgame.info
+import mlbgame.object
+import mlbgame.search
+import mlbgame.season
+import mlbgame.stats
+
+import calendar
+import sqlite3
+
+# columns of the games table, the keys of `game.scoreboard()`
+GAME_COLUMNS = (
+    'game_id', 'game_tag', 'game_league', 'game_status', 'game_start_time',
+    'home_team', 'home_team_runs', 'home_team_hits', 'home_team_errors',
+    'away_team', 'away_team_runs', 'away_team_hits', 'away_team_errors',
+    'w_pitcher', 'w_pitcher_wins', 'w_pitcher_losses',
+    'l_pitcher', 'l_pitcher_wins', 'l_pitcher_losses',
+    'sv_pitcher', 'sv_pitcher_saves',
+    'p_pitcher_home', 'p_pitcher_home_wins', 'p_pitcher_home_losses',
+    'p_pitcher_away', 'p_pitcher_away_wins', 'p_pitcher_away_losses')
+# player columns kept next to the counting stats
+PLAYER_COLUMNS = ('name', 'name_display_first_last', 'pos')
+ROSTER_COLUMNS = ('first', 'last', 'num', 'position', 'bats', 'rl',
+                  'team_abbrev', 'status')
+ATBAT_COLUMNS = ('batter', 'pitcher', 'event', 'des', 'b', 's', 'o', 'b1',
+                 'b2', 'b3', 'home_team_runs', 'away_team_runs')
+PITCH_COLUMNS = ('sv_id', 'des', 'type', 'pitch_type', 'start_speed')
+# pitching decisions, 'true' in the raw box score
+DECISIONS = ('win', 'loss', 'save')
+# tables with the details of ingested games
+DETAILS = ('innings', 'batting', 'pitching', 'team_batting', 'team_pitching',
+           'players', 'atbats', 'pitches')
+
+
+def _columns(names):
+    return ', '.join(names)
+
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS games (date TEXT NOT NULL, ingested '
+    'INTEGER NOT NULL DEFAULT 0, {0}, PRIMARY KEY (game_id))'.format(
+        _columns(GAME_COLUMNS)),
+    'CREATE INDEX IF NOT EXISTS games_home ON games (home_team, date)',
+    'CREATE INDEX IF NOT EXISTS games_away ON games (away_team, date)',
+    'CREATE INDEX IF NOT EXISTS games_date ON games (date)',
+    'CREATE TABLE IF NOT EXISTS innings (game_id TEXT NOT NULL, inning '
+    'INTEGER NOT NULL, home, away, PRIMARY KEY (game_id, inning))',
+    'CREATE TABLE IF NOT EXISTS batting (game_id TEXT NOT NULL, player_id '
+    'INTEGER NOT NULL, team TEXT NOT NULL, {0}, PRIMARY KEY (game_id, '
+    'player_id))'.format(_columns(PLAYER_COLUMNS + mlbgame.season.BATTING)),
+    'CREATE INDEX IF NOT EXISTS batting_player ON batting (player_id)',
+    'CREATE TABLE IF NOT EXISTS pitching (game_id TEXT NOT NULL, player_id '
+    'INTEGER NOT NULL, team TEXT NOT NULL, {0}, PRIMARY KEY (game_id, '
+    'player_id))'.format(_columns(PLAYER_COLUMNS +
+                                  mlbgame.season.PITCHING + DECISIONS)),
+    'CREATE INDEX IF NOT EXISTS pitching_player ON pitching (player_id)',
+    'CREATE TABLE IF NOT EXISTS team_batting (game_id TEXT NOT NULL, team '
+    'TEXT NOT NULL, {0}, PRIMARY KEY (game_id, team))'.format(
+        _columns(mlbgame.season.BATTING)),
+    'CREATE TABLE IF NOT EXISTS team_pitching (game_id TEXT NOT NULL, team '
+    'TEXT NOT NULL, {0}, PRIMARY KEY (game_id, team))'.format(
+        _columns(mlbgame.season.PITCHING)),
+    'CREATE TABLE IF NOT EXISTS players (game_id TEXT NOT NULL, player_id '
+    'INTEGER NOT NULL, team TEXT NOT NULL, {0}, PRIMARY KEY (game_id, '
+    'player_id))'.format(_columns(ROSTER_COLUMNS)),
+    'CREATE INDEX IF NOT EXISTS players_player ON players (player_id)',
+    'CREATE TABLE IF NOT EXISTS atbats (game_id TEXT NOT NULL, num INTEGER '
+    'NOT NULL, inning INTEGER NOT NULL, half TEXT NOT NULL, {0}, PRIMARY '
+    'KEY (game_id, num))'.format(_columns(ATBAT_COLUMNS)),
+    'CREATE INDEX IF NOT EXISTS atbats_batter ON atbats (batter)',
+    'CREATE INDEX IF NOT EXISTS atbats_pitcher ON atbats (pitcher)',
+    'CREATE TABLE IF NOT EXISTS pitches (game_id TEXT NOT NULL, num INTEGER '
+    'NOT NULL, seq INTEGER NOT NULL, {0}, PRIMARY KEY (game_id, num, '
+    'seq))'.format(_columns(PITCH_COLUMNS)),
+    # lower case names, codes and abbreviations of the stored team names
+    'CREATE TABLE IF NOT EXISTS teams (key TEXT NOT NULL, name TEXT NOT '
+    'NULL, PRIMARY KEY (key, name))',
+]
+"""Statements that create the tables and indexes of the warehouse."""
+
+
+def _value(value):
+    # numbers are stored as numbers, missing stats as NULL
+    if value is None or value == '':
+        return None
+    return mlbgame.object.infer(value)
+
+
+def _row(prefix, data, columns):
+    return tuple(prefix) + tuple(_value(data.get(x)) for x in columns)
+
+
+def _insert(table, width):
+    return 'INSERT OR REPLACE INTO {0} VALUES ({1})'.format(
+        table, ', '.join(['?'] * width))
+
+
+def _date(value):
+    return '{0:04d}-{1:02d}-{2:02d}'.format(value.year, value.month,
+                                            value.day)
+
+
+def _team_keys(name, *keys):
+    # rows of the teams table for a team name and its codes
+    return set((x.lower(), name) for x in (name,) + keys if x)
+
+
+def _game_date(game_id):
+    # game ids start with the zero padded date, e.g. 2016_08_02
+    return '-'.join(game_id.split('_')[:3])
+
+
+class Warehouse(object):
+    """SQLite database of ingested games.
+
+    Properties:
+        connection
+        index
+        path
+    """
+
+    def __init__(self, path=':memory:', index=None):
+        """Opens the database at `path`, creating the tables if needed.
+
+        If `index` is a `search.PlayIndex`, the at bats of every ingested
+        game are added to it; it must not be on the same file. If `index`
+        is True, a `search.PlayIndex` is kept in this database, on the
+        same connection.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            for x in SCHEMA:
+                self.connection.execute(x)
+        if index is True:
+            index = mlbgame.search.PlayIndex(path, self.connection)
+        self.index = index
+
+    def close(self):
+        """Close the database."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def is_ingested(self, game_id):
+        """Return True if the details of the game have been stored."""
+        row = self.connection.execute(
+            'SELECT ingested FROM games WHERE game_id = ?',
+            (game_id,)).fetchone()
+        return row is not None and bool(row['ingested'])
+
+    def ingested_ids(self):
+        """Return the set of ids of the games whose details are stored."""
+        return set(x[0] for x in self.connection.execute(
+            'SELECT game_id FROM games WHERE ingested = 1'))
+
+    def __ingested(self, game_ids):
+        # the ids in `game_ids` whose details are stored
+        game_ids = list(game_ids)
+        if not game_ids:
+            return set()
+        return set(x[0] for x in self.connection.execute(
+            'SELECT game_id FROM games WHERE ingested = 1 AND game_id IN '
+            '({0})'.format(', '.join(['?'] * len(game_ids))), game_ids))
+
+    def __store_scoreboard(self, games):
+        # replacing a row must not lose whether the game was ingested
+        ingested = self.__ingested(games)
+        rows = []
+        teams = set()
+        for x in games:
+            rows.append((_game_date(x), int(x in ingested)) +
+                        tuple(games[x].get(y) for y in GAME_COLUMNS))
+            # game ids hold the away and home codes, e.g. phimlb_nynmlb
+            for code, side in zip(x.split('_')[3:5], ('away', 'home')):
+                name = games[x].get(side + '_team')
+                if name:
+                    teams.update(_team_keys(name, code, code[:3]))
+        self.connection.executemany(
+            _insert('games', len(GAME_COLUMNS) + 2), rows)
+        self.connection.executemany(
+            'INSERT OR IGNORE INTO teams VALUES (?, ?)', sorted(teams))
+
+    def __store_details(self, game_id, box_score, stats, players, events):
+        for x in DETAILS:
+            self.connection.execute(
+                'DELETE FROM {0} WHERE game_id = ?'.format(x), (game_id,))
+        execute = self.connection.executemany
+        execute(_insert('innings', 4), [
+            (game_id, x, _value(box_score[x]['home']),
+             _value(box_score[x]['away']))
+            for x in box_score if x != 'game_id'])
+        player = stats['player']
+        for kind, table, columns in (
+                ('batting', 'batting', mlbgame.season.BATTING),
+                ('pitching', 'pitching',
+                 mlbgame.season.PITCHING + DECISIONS)):
+            # the joined rows have no team, it comes from the lists
+            home = set(x.get('id') for x in
+                       player['home_' + kind] +
+                       player['home_additional_' + kind])
+            rows = player['batters' if kind == 'batting' else 'pitchers']
+            execute(_insert(table, len(PLAYER_COLUMNS + columns) + 3), [
+                _row((game_id, int(x), 'home' if x in home else 'away'),
+                     rows[x], PLAYER_COLUMNS + columns) for x in rows])
+        team = stats['team']
+        for kind, columns in (('batting', mlbgame.season.BATTING),
+                              ('pitching', mlbgame.season.PITCHING)):
+            execute(_insert('team_' + kind, len(columns) + 2), [
+                _row((game_id, x), team[x + '_' + kind], columns)
+                for x in ('home', 'away') if x + '_' + kind in team])
+        roster = []
+        for x in ('home', 'away'):
+            for y in players.get(x + '_team', {}).get('players', []):
+                roster.append(_row((game_id, int(y['id']), x), y,
+                                   ROSTER_COLUMNS))
+        execute(_insert('players', len(ROSTER_COLUMNS) + 3), roster)
+        names = self.connection.execute(
+            'SELECT away_team, home_team FROM games WHERE game_id = ?',
+            (game_id,)).fetchone()
+        teams = set()
+        for x in ('home', 'away'):
+            name = names[x + '_team'] if names is not None else None
+            if name:
+                teams.update(_team_keys(name, *set(
+                    y.get('team_abbrev') for y in
+                    players.get(x + '_team', {}).get('players', []))))
+        execute('INSERT OR IGNORE INTO teams VALUES (?, ?)', sorted(teams))
+        atbats = []
+        pitches = []
+        for inning in events:
+            for half in ('top', 'bottom'):
+                for x in events[inning][half]:
+                    num = int(x['num'])
+                    atbats.append(_row((game_id, num, int(inning), half), x,
+                                       ATBAT_COLUMNS))
+                    pitches.extend(_row((game_id, num, seq), y,
+                                        PITCH_COLUMNS)
+                                   for seq, y in enumerate(x['pitches']))
+        execute(_insert('atbats', len(ATBAT_COLUMNS) + 4), atbats)
+        execute(_insert('pitches', len(PITCH_COLUMNS) + 3), pitches)
+        self.connection.execute(
+            'UPDATE games SET ingested = 1 WHERE game_id = ?', (game_id,))
+        if self.index is not None:
+            self.index.add_game(game_id, events, force=True)
+
+    def ingest_game(self, game_id, force=False):
+        """Store the box score, stats, players and events of a game.
+
+        Returns False without fetching anything if the game was already
+        ingested, unless `force` is True, and False after storing only
+        its scoreboard row if the game is not final. Raises ValueError if
+        a file of the game can not be found; nothing is stored in that
+        case.
+        """
+        if not force and self.is_ingested(game_id):
+            return False
+        year, month, day = mlbgame.data.get_date_from_game_id(game_id)
+        games = mlbgame.game.scoreboard(year, month, day)
+        if game_id not in games:
+            raise ValueError('Could not find a game with that id.')
+        status = str(games[game_id].get('game_status')).upper()
+        if status not in mlbgame.info.FINAL_STATUSES:
+            # the details of a live game would be stored half way through
+            with self.connection:
+                self.__store_scoreboard({game_id: games[game_id]})
+            return False
+        # fetch everything first so a missing file leaves no partial game
+        box_score = mlbgame.game.box_score(game_id)
+        stats = mlbgame.stats.game_stats(game_id)
+        players = mlbgame.game.players(game_id)
+        events = mlbgame.events.game_events(game_id)
+        with self.connection:
+            self.__store_scoreboard({game_id: games[game_id]})
+            self.__store_details(game_id, box_score, stats, players, events)
+        return True
+
+    def ingest_day(self, year, month, day):
+        """Store the scoreboard of a day and the details of its final games.
+
+        The scoreboard rows are always updated; the details are only
+        fetched for final games that were not ingested yet. Games whose
+        files can not be found are left to be ingested by a later call.
+        Returns the list of ids of the games that were ingested.
+        """
+        games = mlbgame.game.scoreboard(year, month, day)
+        if not games:
+            return []
+        with self.connection:
+            self.__store_scoreboard(games)
+        ingested = self.__ingested(games)
+        output = []
+        for game_id in sorted(games):
+            status = str(games[game_id].get('game_status')).upper()
+            if game_id in ingested \
+                    or status not in mlbgame.info.FINAL_STATUSES:
+                continue
+            try:
+                box_score = mlbgame.game.box_score(game_id)
+                stats = mlbgame.stats.game_stats(game_id)
+                players = mlbgame.game.players(game_id)
+                events = mlbgame.events.game_events(game_id)
+            except ValueError:
+                continue
+            with self.connection:
+                self.__store_details(game_id, box_score, stats, players,
+                                     events)
+            output.append(game_id)
+        return output
+
+    def ingest_days(self, year, month, days=None):
+        """Ingest every day in `days` (default: the whole month).
+
+        Returns the list of ids of the games that were ingested.
+        """
+        if days is None:
+            days = range(1, calendar.monthrange(year, month)[1] + 1)
+        output = []
+        for x in days:
+            output.extend(self.ingest_day(year, month, x))
+        return output
+
+    def games(self, start=None, end=None, home=None, away=None):
+        """Return the stored games from `start` to `end` as
+        `GameScoreboard` objects, in order.
+
+        `home` and `away` work like they do for `mlbgame.day()`: if both
+        are the same team, every game of that team is returned. Teams are
+        matched as by `team_names()`.
+        """
+        where = []
+        params = []
+        if start is not None:
+            where.append('date >= ?')
+            params.append(_date(start))
+        if end is not None:
+            where.append('date <= ?')
+            params.append(_date(end))
+        teams = []
+        for column, team in (('home_team', home), ('away_team', away)):
+            if team is None:
+                continue
+            names = sorted(self.team_names(team))
+            teams.append('{0} IN ({1})'.format(
+                column, ', '.join(['?'] * len(names))))
+            params.extend(names)
+        if teams:
+            where.append('(' + ' OR '.join(teams) + ')')
+        sql = 'SELECT {0} FROM games'.format(_columns(GAME_COLUMNS))
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY date, game_id'
+        output = []
+        for row in self.connection.execute(sql, params):
+            data = dict((x, row[x]) for x in GAME_COLUMNS
+                        if row[x] is not None)
+            output.append(mlbgame.game.GameScoreboard(data))
+        return output
+
+    def team_names(self, team):
+        """Return the set of names `team` is stored under in the games.
+
+        `team` can be a name, the code of the team in game ids (e.g. 'nyn')
+        or its abbreviation in the rosters of ingested games (e.g. 'NYM'),
+        in any case. Only `team` is returned if no stored game knows it.
+        """
+        names = set([team])
+        names.update(x[0] for x in self.connection.execute(
+            'SELECT name FROM teams WHERE key = ?', (str(team).lower(),)))
+        return names
+
+    def __log(self, table, columns, player_id):
+        sql = ('SELECT g.date, s.game_id, s.team, g.home_team, g.away_team, '
+               '{0} FROM {1} s JOIN games g ON g.game_id = s.game_id '
+               'WHERE s.player_id = ? ORDER BY g.date, s.game_id').format(
+                   ', '.join('s.' + x for x in PLAYER_COLUMNS + columns),
+                   table)
+        output = []
+        for row in self.connection.execute(sql, (int(player_id),)):
+            data = dict(zip(row.keys(), tuple(row)))
+            home = data.pop('home_team')
+            away = data.pop('away_team')
+            data['opponent'] = away if data['team'] == 'home' else home
+            output.append(data)
+        return output
+
+    def batting_log(self, player_id):
+        """Return the batting lines of a player, one dictionary per game."""
+        return self.__log('batting', mlbgame.season.BATTING, player_id)
+
+    def pitching_log(self, player_id):
+        """Return the pitching lines of a player, one dictionary per game."""
+        return self.__log('pitching', mlbgame.season.PITCHING + DECISIONS,
+                          player_id)
+
+    def game_log(self, player_id):
+        """Return the batting and pitching logs of a player."""
+        return {'batting': self.batting_log(player_id),
+                'pitching': self.pitching_log(player_id)}
@@ -0,0 +1,6 @@
+import sys
+
+# the tests of coroutines are not valid syntax before Python 3.5
+collect_ignore = []
+if sys.version_info < (3, 5):
+    collect_ignore.append('test_feed.py')
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import mlbgame
+import mlbgame.backfill
+
+MISSING_ID = '2016_08_02_bosmlb_seamlb_1'
+
+
+def scoreboard(year, month, day, home=None, away=None):
+    if day == 4:
+        raise IOError('unreachable')
+    if day == 5:
+        # no games
+        return {}
+    if day == 6:
+        # the fallback file, the scoreboard could not be fetched
+        return []
+    games = {}
+    for home, away, status in (('nyn', 'nya', 'FINAL'),
+                               ('sea', 'bos', 'FINAL'),
+                               ('chn', 'mil', 'POSTPONED')):
+        game_id = '2016_08_{0:02d}_{1}mlb_{2}mlb_1'.format(day, away, home)
+        games[game_id] = {'game_id': game_id, 'game_status': status}
+    return games
+
+
+class TestBackfill(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'backfill.json')
+        self.lock = threading.Lock()
+        self.calls = []
+        self.stored = []
+        self.saved = [(mlbgame.game, 'scoreboard', mlbgame.game.scoreboard),
+                      (mlbgame.stats, 'player_stats',
+                       mlbgame.stats.player_stats),
+                      (mlbgame.events, 'game_events',
+                       mlbgame.events.game_events)]
+        mlbgame.game.scoreboard = scoreboard
+        mlbgame.stats.player_stats = self.player_stats
+        mlbgame.events.game_events = lambda x: {'1': {'top': [],
+                                                      'bottom': []}}
+
+    def tearDown(self):
+        for module, name, function in self.saved:
+            setattr(module, name, function)
+        shutil.rmtree(self.directory)
+
+    def player_stats(self, game_id):
+        with self.lock:
+            self.calls.append(game_id)
+        if game_id == MISSING_ID:
+            raise ValueError('Could not find a game with that id.')
+        return {'game_id': game_id}
+
+    def store(self, game_id, data):
+        self.stored.append(game_id)
+        if len(self.stored) == 3:
+            raise KeyboardInterrupt
+
+    def test_resume(self):
+        runner = mlbgame.backfill.Backfill(self.path, store=self.store,
+                                           workers=2, save_every=1)
+        # stopped while the third game is stored
+        self.assertRaises(KeyboardInterrupt, runner.run, 2016, 8,
+                          [1, 2, 3], retry_delay=0)
+        with open(self.path) as f:
+            checkpoint = json.load(f)
+        self.assertEqual(len(checkpoint['days']), 3)
+        done = [x for x, y in checkpoint['games'].items()
+                if y['status'] == 'done']
+        self.assertLessEqual(len(done), 2)
+        # a new runner goes on from the checkpoint
+        self.stored = []
+        self.calls = []
+        runner = mlbgame.backfill.Backfill(
+            self.path, store=lambda x, y: self.stored.append(x), workers=2)
+        result = runner.run(2016, 8, [1, 2, 3, 4, 5, 6], retry_delay=0)
+        self.assertEqual(result, {'done': 5 - len(done), 'failed': 1})
+        self.assertFalse(set(done) & set(self.stored))
+        # the failing game was tried until it failed 3 times in all
+        self.assertEqual(runner.checkpoint['games'][MISSING_ID]['attempts'],
+                         3)
+        self.assertIn('Could not find a game',
+                      runner.failed()[MISSING_ID])
+        # the unreachable days are read again, the day without games is not
+        self.assertNotIn('2016-08-04', runner.checkpoint['days'])
+        self.assertNotIn('2016-08-06', runner.checkpoint['days'])
+        self.assertEqual(runner.checkpoint['days']['2016-08-05'], [])
+        # nothing is left to do, unless the failures are reset
+        self.calls = []
+        self.assertEqual(runner.run(2016, 8, [1, 2, 3], retry_delay=0),
+                         {'done': 0, 'failed': 1})
+        self.assertEqual(self.calls, [])
+        runner.reset_failed()
+        runner.run(2016, 8, [1, 2, 3], retry_delay=0)
+        self.assertEqual(self.calls, [MISSING_ID] * 3)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import mlbgame
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+GAME_URL = 'http://127.0.0.1:{0}/year_{{0}}/month_{{1:02d}}/' \
+           'day_{{2:02d}}/gid_{{3}}/{{4}}'
+# the same file for every game
+PLAYERS = b'<game>' + b'<player id="1" first="Jose" last="Reyes"/>' * 50 + \
+    b'</game>'
+# one game a day of a short season
+SEASON = ['2016_04_{0:02d}_nyamlb_nynmlb_1'.format(x) for x in range(3, 15)]
+
+
+class UpstreamHandler(BaseHTTPRequestHandler):
+    """Serves linescore files slowly, so processes ask for them at once,
+    `PLAYERS` for players files and 404 otherwise."""
+
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        if self.path.endswith('players.xml'):
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(PLAYERS)
+            return
+        if not self.path.endswith('linescore.xml'):
+            self.send_response(404)
+            self.end_headers()
+            return
+        time.sleep(0.05)
+        body = '<game id="{0}"/>'.format(self.path).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def fetch_season(args):
+    # runs in a worker process, which gets every file of the season
+    directory, port = args
+    mlbgame.cache.DIRECTORY = directory
+    mlbgame.data.GAME_URL = GAME_URL.format(port)
+    return [mlbgame.data.get_overview(x).read() for x in SEASON]
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        UpstreamHandler.requests = []
+        self.server = Server(('127.0.0.1', 0), UpstreamHandler)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.directory = tempfile.mkdtemp()
+        self.saved = (mlbgame.cache.DIRECTORY, mlbgame.cache.TTL,
+                      mlbgame.cache.LIVE_TTL, mlbgame.data.GAME_URL)
+        mlbgame.cache.DIRECTORY = self.directory
+        mlbgame.data.GAME_URL = GAME_URL.format(self.server.server_address[1])
+
+    def tearDown(self):
+        (mlbgame.cache.DIRECTORY, mlbgame.cache.TTL, mlbgame.cache.LIVE_TTL,
+         mlbgame.data.GAME_URL) = self.saved
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def test_processes(self):
+        pool = multiprocessing.Pool(8)
+        try:
+            results = pool.map(fetch_season, [
+                (self.directory, self.server.server_address[1])] * 16)
+        finally:
+            pool.close()
+            pool.join()
+        # every process read the whole files, which were downloaded once
+        self.assertEqual(len(set(tuple(x) for x in results)), 1)
+        self.assertEqual(len(UpstreamHandler.requests), len(SEASON))
+        self.assertEqual(len(set(UpstreamHandler.requests)), len(SEASON))
+        for x in results[0]:
+            self.assertTrue(x.startswith(b'<game id="/year_2016'))
+        # the only files of the urls are their index files
+        names = [x for root, directories, files in os.walk(
+            os.path.join(self.directory, 'urls')) for x in files]
+        self.assertEqual(len(names), len(SEASON))
+        self.assertLessEqual(len(os.listdir(os.path.join(self.directory,
+                                                         'locks'))),
+                             len(SEASON))
+
+    def test_ttl(self):
+        url = mlbgame.data.GAME_URL.format(2016, 4, 3, SEASON[0],
+                                           'linescore.xml')
+        mlbgame.data.get_overview(SEASON[0])
+        mlbgame.data.get_overview(SEASON[0])
+        self.assertEqual(len(UpstreamHandler.requests), 1)
+        self.assertTrue(os.path.exists(mlbgame.cache.path(url)))
+        # stale files are fetched again
+        mlbgame.cache.TTL = 0
+        mlbgame.data.get_overview(SEASON[0])
+        self.assertEqual(len(UpstreamHandler.requests), 2)
+        mlbgame.cache.TTL = None
+        mlbgame.cache.clear()
+        self.assertEqual(os.listdir(self.directory), [])
+        mlbgame.data.get_overview(SEASON[0])
+        self.assertEqual(len(UpstreamHandler.requests), 3)
+        # errors are not cached
+        for x in range(2):
+            self.assertRaises(ValueError, mlbgame.data.get_box_score,
+                              SEASON[0])
+        self.assertEqual(len(UpstreamHandler.requests), 5)
+
+    def test_live_ttl(self):
+        mlbgame.data.get_overview(SEASON[0])
+        mlbgame.data.get_players(SEASON[0])
+        mlbgame.data.get_overview(SEASON[0])
+        self.assertEqual(len(UpstreamHandler.requests), 2)
+        # linescores go stale long before other files
+        mlbgame.cache.LIVE_TTL = 0
+        mlbgame.data.get_overview(SEASON[0])
+        mlbgame.data.get_players(SEASON[0])
+        self.assertEqual(len(UpstreamHandler.requests), 3)
+        self.assertTrue(UpstreamHandler.requests[-1].endswith(
+            'linescore.xml'))
+        # and live files are never kept longer than the others
+        mlbgame.cache.LIVE_TTL = None
+        mlbgame.cache.TTL = 0
+        mlbgame.data.get_overview(SEASON[0])
+        self.assertEqual(len(UpstreamHandler.requests), 4)
+
+    def test_dedup(self):
+        for x in SEASON[:4]:
+            self.assertEqual(mlbgame.data.get_players(x).read(), PLAYERS)
+        mlbgame.data.get_overview(SEASON[0])
+        stats = mlbgame.cache.stats()
+        # the players files are stored once, compressed
+        self.assertEqual(stats['urls'], 5)
+        self.assertEqual(stats['blobs'], 2)
+        self.assertEqual(stats['bytes'] - stats['unique_bytes'],
+                         3 * len(PLAYERS))
+        self.assertGreater(stats['dedup_ratio'], 3)
+        self.assertGreater(stats['compression_ratio'], 1)
+        self.assertGreater(stats['disk_bytes'], stats['stored_bytes'])
+        self.assertIn('dedup ratio', mlbgame.cache.report())
+        # unused blobs go once their index files are stale
+        mlbgame.cache.prune(age=0)
+        self.assertEqual(mlbgame.cache.stats()['blobs'], 2)
+        mlbgame.cache.TTL = 0
+        mlbgame.cache.prune(age=0)
+        stats = mlbgame.cache.stats()
+        self.assertEqual((stats['urls'], stats['blobs']), (0, 0))
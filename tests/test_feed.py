@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+import asyncio
+import datetime
+import threading
+import time
+import unittest
+
+import mlbgame
+import mlbgame.feed
+import mlbgame.live
+
+START = datetime.datetime(2016, 8, 2, 19, 10)
+GAME_IDS = ['2016_08_02_t{0:02d}mlb_h{0:02d}mlb_1'.format(x)
+            for x in range(15)]
+
+
+class Game(object):
+
+    def __init__(self, game_id, status):
+        self.game_id = game_id
+        self.game_status = status
+        self.game_start_time = '7:10PM'
+
+
+class TestFeed(unittest.TestCase):
+
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.most = 0
+        self.polls = {}
+        self.events = []
+        self.failed = []
+        self.saved = [(mlbgame, 'day', mlbgame.day),
+                      (mlbgame.game, 'overview', mlbgame.game.overview),
+                      (mlbgame.events, 'game_events',
+                       mlbgame.events.game_events)]
+        games = [Game(x, 'PRE_GAME') for x in GAME_IDS] + \
+            [Game('2016_08_02_finmlb_finmlb_1', 'FINAL')]
+        mlbgame.day = lambda year, month, day, home, away: games
+        mlbgame.game.overview = self.overview
+        mlbgame.events.game_events = self.game_events
+
+    def tearDown(self):
+        for module, name, function in self.saved:
+            setattr(module, name, function)
+
+    def overview(self, game_id):
+        with self.lock:
+            self.running += 1
+            self.most = max(self.most, self.running)
+            polls = self.polls[game_id] = self.polls.get(game_id, 0) + 1
+        time.sleep(0.05)
+        with self.lock:
+            self.running -= 1
+        if game_id == GAME_IDS[0] and polls == 1:
+            raise ValueError('Could not find a game with that id.')
+        if polls < 3:
+            return {'status': 'In Progress', 'inning_state': 'Top',
+                    'outs': '1'}
+        return {'status': 'Final'}
+
+    def game_events(self, game_id):
+        if game_id == GAME_IDS[1] and GAME_IDS[1] not in self.failed:
+            self.failed.append(game_id)
+            raise ValueError('Could not find a game with that id.')
+        self.events.append(game_id)
+        return {}
+
+    def test_feed(self):
+        slept = []
+
+        async def sleep(seconds):
+            slept.append(seconds)
+
+        async def collect(feed):
+            output = []
+            async for update in feed:
+                output.append(update)
+            return output
+
+        feed = mlbgame.feed.LiveFeed(2016, 8, 2, concurrency=5,
+                                     clock=lambda: START, sleep=sleep)
+        loop = asyncio.new_event_loop()
+        try:
+            updates = loop.run_until_complete(collect(feed))
+        finally:
+            loop.close()
+        # the final game is never polled, the others until they are final
+        self.assertEqual(sorted(self.polls), GAME_IDS)
+        self.assertEqual(set(self.polls.values()), set([3]))
+        # an unchanged linescore is no update, a failed poll is retried,
+        # also when only the events could not be fetched
+        self.assertEqual(len(updates), 2 * 15)
+        self.assertEqual(len(self.events), len(updates))
+        self.assertEqual(sorted(x for x, e in feed.errors), GAME_IDS[:2])
+        self.assertIn(mlbgame.live.BREAK_INTERVAL * 2, slept)
+        self.assertEqual(self.most, 5)
+        self.assertIn(mlbgame.live.LIVE_INTERVAL, slept)
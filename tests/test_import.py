@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+
+import os
+import subprocess
+import sys
+import unittest
+
+import mlbgame
+
+# imports mlbgame in a fresh interpreter, then prints the seconds it took
+# and the modules that were loaded
+SCRIPT = """
+import sys, timeit
+start = timeit.default_timer()
+import mlbgame
+seconds = timeit.default_timer() - start
+sys.stdout.write('\\n'.join([str(seconds)] + sorted(sys.modules)))
+"""
+# dependencies that should only be loaded when they are used
+HEAVY = ('lxml', 'lxml.etree', 'json', 'urllib.request', 'http.client',
+         'numpy', 'sqlite3')
+
+
+def fresh_import():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.check_output([sys.executable, '-c', SCRIPT],
+                                     cwd=root)
+    lines = output.decode('utf-8').splitlines()
+    return float(lines[0]), set(lines[1:])
+
+
+@unittest.skipIf(sys.version_info < (3, 7),
+                 'submodules are imported eagerly before python 3.7')
+class TestImport(unittest.TestCase):
+
+    def test_lazy_import(self):
+        seconds, modules = fresh_import()
+        for x in HEAVY:
+            self.assertNotIn(x, modules)
+        for x in mlbgame.SUBMODULES:
+            self.assertNotIn('mlbgame.' + x, modules)
+        self.assertIn('mlbgame.version', modules)
+        # took about 90ms with every submodule, and about 15ms without
+        self.assertLess(seconds, 1.0)
+
+    def test_submodules(self):
+        for x in mlbgame.SUBMODULES:
+            self.assertIs(getattr(mlbgame, x), sys.modules['mlbgame.' + x])
+            self.assertIn(x, dir(mlbgame))
+        self.assertRaises(AttributeError, getattr, mlbgame, 'unknown')
@@ -1,11 +1,44 @@
 #!/usr/bin/env python
 
+import io
+import json
+import threading
+import time
 import unittest
 
 import mlbgame
 
 from datetime import datetime
 
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+
+class InjuryHandler(BaseHTTPRequestHandler):
+    """Serves `rows` as the injury file, with an ETag of `version`."""
+
+    rows = []
+    version = 1
+    requests = []
+
+    def do_GET(self):
+        etag = '"{0}"'.format(self.version)
+        self.requests.append(self.headers.get('If-None-Match'))
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps({'wsfb_news_injury': {'queryResults': {'row': self.rows}}})
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body.encode('utf-8'))
+
+    def log_message(self, *args):
+        pass
+
 
 class TestInfo(unittest.TestCase):
 
@@ -432,3 +465,226 @@ class TestInfo(unittest.TestCase):
             self.assertIsInstance(player.position, str)
             self.assertIsInstance(player.team_id, int)
             self.assertIsInstance(player.team_name, str)
+
+    def test_team_directory(self):
+        teams = [
+            {'team_id': '121', 'team_code': 'nyn', 'club': 'nym',
+             'display_code': 'nym', 'historical_team_code': 'NYN',
+             'club_full_name': 'New York Mets', 'club_common_name': 'Mets',
+             'name_display_short': 'NY Mets', 'name_display_long': 'The New York Mets'},
+            {'team_id': '147', 'team_code': 'nya', 'club': 'nyy',
+             'display_code': 'nyy', 'historical_team_code': 'NYA',
+             'club_full_name': 'New York Yankees', 'club_common_name': 'Yankees',
+             'name_display_short': 'NY Yankees', 'name_display_long': 'The New York Yankees'}
+        ]
+        directory = mlbgame.info.TeamDirectory(teams)
+        self.assertEqual(len(directory), 2)
+        for key in (121, '121', 'nyn', 'NYM', 'New York Mets', 'mets', 'NY Mets'):
+            self.assertEqual(directory[key].club_common_name, 'Mets')
+        self.assertEqual(directory.get('nya').team_id, 147)
+        self.assertIn('Yankees', directory)
+        self.assertIsNone(directory.get('Red Sox'))
+        self.assertRaises(KeyError, lambda: directory['Red Sox'])
+        team_directory = mlbgame.info.team_directory
+        mlbgame.info.team_directory = lambda: directory
+        try:
+            self.assertEqual(mlbgame.info.team_names('NYM'), set(['NYM', 'Mets']))
+            self.assertEqual(mlbgame.info.team_names('Giants'), set(['Giants']))
+        finally:
+            mlbgame.info.team_directory = team_directory
+
+    def test_team_names_failure(self):
+        calls = []
+
+        def get_properties():
+            calls.append(1)
+            raise ValueError('Could not find the properties file.')
+
+        def get_scoreboard(year, month, day):
+            return io.BytesIO(
+                b'<scoreboard><go_game><game id="2016_08_02_nyamlb_nynmlb_1" '
+                b'league="AN" status="FINAL" start_time="7:10"/>'
+                b'<team name="Mets"><gameteam R="1" H="5" E="0"/></team>'
+                b'<team name="Yankees"><gameteam R="2" H="6" E="1"/></team>'
+                b'</go_game></scoreboard>')
+        saved = (mlbgame.data.get_properties, mlbgame.data.get_scoreboard,
+                 dict(mlbgame.info._PROPERTIES))
+        mlbgame.data.get_properties = get_properties
+        mlbgame.data.get_scoreboard = get_scoreboard
+        mlbgame.info._PROPERTIES.update({'league': None, 'failed': 0})
+        try:
+            # names in the scoreboard are matched without the directory
+            games = mlbgame.game.scoreboard(2016, 8, 2, home='Mets')
+            self.assertEqual(list(games), ['2016_08_02_nyamlb_nynmlb_1'])
+            self.assertEqual(calls, [])
+            # a failed load is not retried for every lookup
+            for x in range(5):
+                self.assertEqual(mlbgame.game.scoreboard(2016, 8, 2,
+                                                         home='NYM'), {})
+                self.assertEqual(mlbgame.info.team_names('NYM'),
+                                 set(['NYM']))
+            self.assertEqual(calls, [1])
+            # but only for a while
+            mlbgame.info._PROPERTIES['failed'] = time.time() - 1
+            mlbgame.info.team_names('NYM')
+            self.assertEqual(calls, [1, 1])
+            self.assertLess(mlbgame.info._PROPERTIES['failed'],
+                            time.time() + 2 * mlbgame.info.PROPERTIES_RETRY)
+        finally:
+            (mlbgame.data.get_properties, mlbgame.data.get_scoreboard,
+             properties) = saved
+            mlbgame.info._PROPERTIES.update(properties)
+
+    def test_rosters(self):
+        def row(player_id, first, last, team_id):
+            return {'player_id': str(player_id), 'name_first': first,
+                    'name_last': last, 'name_use': first,
+                    'name_full': first + ' ' + last, 'team_id': str(team_id)}
+        data = {
+            121: [row(594798, 'Jacob', 'deGrom', 121), row(1, 'Yoenis', 'Cespedes', 121)],
+            147: [row(2, 'Jacoby', 'Ellsbury', 147), row(1, 'Yoenis', 'Cespedes', 121)]
+        }
+        roster = mlbgame.info.roster
+        mlbgame.info.roster = lambda x: {'players': data[x], 'team_id': x}
+        try:
+            directory = mlbgame.rosters([121, 147], workers=2)
+        finally:
+            mlbgame.info.roster = roster
+        self.assertEqual(sorted(directory.team_ids), [121, 147])
+        self.assertEqual(len(directory), 3)
+        self.assertIn(594798, directory)
+        self.assertEqual(directory['594798'].name_last, 'deGrom')
+        self.assertIsNone(directory.get(3))
+        names = [x.name_first for x in directory.search('jac')]
+        self.assertEqual(names, ['Jacob', 'Jacoby'])
+        self.assertEqual(len(directory.search('jac', limit=1)), 1)
+        self.assertEqual(directory.search('degr')[0].player_id, 594798)
+        self.assertEqual(directory.search('yoenis c')[0].player_id, 1)
+        self.assertEqual(directory.search('zzz'), [])
+
+    def test_standings_series(self):
+        def team(team_id, name, league, division):
+            return {'team_id': str(team_id), 'club': name[:3].lower(),
+                    'club_common_name': name, 'club_full_name': 'The ' + name,
+                    'name_display_short': name, 'league': league,
+                    'division': division}
+        directory = mlbgame.info.TeamDirectory([
+            team(121, 'Mets', 'National', 'East'),
+            team(143, 'Phillies', 'National', 'East'),
+            team(137, 'Giants', 'National', 'West'),
+            team(147, 'Yankees', 'American', 'East')
+        ])
+
+        class Game(object):
+            def __init__(self, day, home, away, home_runs, away_runs, status='FINAL'):
+                self.date = datetime(2016, 4, day, 19, 10)
+                self.home_team = home
+                self.away_team = away
+                self.home_team_runs = home_runs
+                self.away_team_runs = away_runs
+                self.game_status = status
+
+        games = [
+            Game(3, 'Mets', 'Phillies', 5, 3),
+            Game(4, 'Mets', 'Phillies', 1, 2),
+            Game(4, 'Giants', 'Yankees', 4, 0),
+            Game(5, 'Mets', 'Phillies', 7, 1),
+            Game(5, 'Giants', 'Yankees', 0, 3, 'IN_PROGRESS'),
+        ]
+        data = mlbgame.info.standings_series(datetime(2016, 4, 3), datetime(2016, 4, 5),
+                                             games, directory=directory)
+        series = [(x[0], mlbgame.info.Standings(x[1])) for x in data]
+        self.assertEqual([x[0].day for x in series], [3, 4, 5])
+        last = dict((x.name, x) for x in series[-1][1].divisions)
+        self.assertEqual(len(last), 6)
+        east = last['NL East'].teams
+        self.assertEqual([x.team_short for x in east], ['Mets', 'Phillies'])
+        self.assertEqual((east[0].w, east[0].l, east[0].pct, east[0].gb), (2, 1, .667, '-'))
+        self.assertEqual((east[1].w, east[1].l, east[1].gb, east[1].place), (1, 2, 1.0, 2))
+        self.assertEqual(east[0].division_id, 204)
+        self.assertEqual(last['NL West'].teams[0].w, 1)
+        self.assertEqual(last['AL East'].teams[0].l, 1)
+        first = dict((x.name, x) for x in series[0][1].divisions)
+        self.assertEqual(first['NL East'].teams[0].w, 1)
+        self.assertEqual(first['NL West'].teams[0].w, 0)
+
+    def test_standings_series_historical(self):
+        # opening day 2016 was April 3rd, the endpoint gives the records
+        # from before the games of the date
+        series = mlbgame.standings_series(datetime(2016, 4, 3), datetime(2016, 4, 10))
+        historical = mlbgame.standings(datetime(2016, 4, 11))
+        records = dict((x.team_id, (x.w, x.l)) for y in historical.divisions for x in y.teams)
+        for division in series[-1][1].divisions:
+            for team in division.teams:
+                self.assertEqual((team.w, team.l), records[team.team_id])
+
+    def test_injury_watcher(self):
+        def row(player_id, status, update='', insert_ts='2016-08-01'):
+            return {'player_id': str(player_id), 'insert_ts': insert_ts,
+                    'name_first': 'First', 'name_last': str(player_id),
+                    'injury_status': status, 'injury_update': update}
+        server = HTTPServer(('127.0.0.1', 0), InjuryHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        url = mlbgame.data.INJURY_URL
+        mlbgame.data.INJURY_URL = 'http://127.0.0.1:{0}/'.format(server.server_address[1])
+        try:
+            InjuryHandler.rows = [row(1, '10-day DL'), row(2, '60-day DL')]
+            watcher = mlbgame.injury_watcher()
+            changes = watcher.poll()
+            self.assertEqual(sorted(x.kind for x in changes), ['added', 'added'])
+            self.assertEqual(watcher.poll(), [])
+            self.assertEqual(InjuryHandler.requests[-1], '"1"')
+            InjuryHandler.version = 2
+            InjuryHandler.rows = [row(1, '10-day DL', 'Rehab'), row(3, 'Day-to-day')]
+            changes = dict((x.kind, x) for x in watcher.poll())
+            self.assertEqual(sorted(changes), ['added', 'removed', 'updated'])
+            self.assertEqual(changes['added'].injury.player_id, 3)
+            self.assertEqual(changes['removed'].injury.player_id, 2)
+            self.assertEqual(changes['updated'].injury.injury_update, 'Rehab')
+            self.assertEqual(changes['updated'].previous.injury_update, '')
+            self.assertEqual(changes['added'].__str__(), 'Added: First 3 (Day-to-day)')
+            self.assertEqual(len(mlbgame.injury().injuries), 2)
+        finally:
+            mlbgame.data.INJURY_URL = url
+            server.shutdown()
+            server.server_close()
+
+    def test_injury_consumers(self):
+        def row(player_id):
+            return {'player_id': str(player_id), 'insert_ts': '2016-08-01',
+                    'injury_status': '10-day DL'}
+        server = HTTPServer(('127.0.0.1', 0), InjuryHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        url = mlbgame.data.INJURY_URL
+        mlbgame.data.INJURY_URL = 'http://127.0.0.1:{0}/'.format(server.server_address[1])
+        try:
+            InjuryHandler.version = 1
+            InjuryHandler.rows = [row(1)]
+            first = mlbgame.injury_watcher()
+            second = mlbgame.injury_watcher()
+            self.assertEqual(len(first.poll()), 1)
+            InjuryHandler.version = 2
+            InjuryHandler.rows = [row(1), row(2)]
+            # other consumers of the file do not hide the change
+            self.assertEqual(len(mlbgame.injury().injuries), 2)
+            self.assertEqual(len(second.poll()), 2)
+            changes = first.poll()
+            self.assertEqual([(x.kind, x.injury.player_id) for x in changes],
+                             [('added', 2)])
+            self.assertEqual(first.poll(), [])
+            # without validators of its own a caller diffs the file
+            index = mlbgame.info.injury_changes(None)[1]
+            InjuryHandler.rows = [row(2)]
+            InjuryHandler.version = 3
+            mlbgame.injury()
+            changes = mlbgame.info.injury_changes(index)[0]
+            self.assertEqual([x[0] for x in changes], ['removed'])
+        finally:
+            InjuryHandler.version = 1
+            mlbgame.data.INJURY_URL = url
+            server.shutdown()
+            server.server_close()
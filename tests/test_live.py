@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+
+import datetime
+import unittest
+
+import mlbgame
+import mlbgame.live
+
+GAME_ID = '2016_08_02_nyamlb_nynmlb_1'
+FINAL_ID = '2016_08_02_bosmlb_seamlb_1'
+START = datetime.datetime(2016, 8, 2, 19, 10)
+
+
+def scoreboard(year, month, day, home=None, away=None):
+    return {
+        GAME_ID: {'game_id': GAME_ID, 'game_status': 'PRE_GAME',
+                  'game_start_time': '7:10PM'},
+        FINAL_ID: {'game_id': FINAL_ID, 'game_status': 'FINAL',
+                   'game_start_time': '1:05PM'}
+    }
+
+
+class Clock(object):
+    """Time that only moves when the scheduler sleeps."""
+
+    def __init__(self, now):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += datetime.timedelta(seconds=seconds)
+
+
+class TestLive(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock(datetime.datetime(2016, 8, 2, 12))
+        self.polls = []
+        self.events = []
+        self.saved = [(mlbgame.game, 'scoreboard', mlbgame.game.scoreboard),
+                      (mlbgame.game, 'overview', mlbgame.game.overview),
+                      (mlbgame.events, 'game_events',
+                       mlbgame.events.game_events)]
+        mlbgame.game.scoreboard = scoreboard
+        mlbgame.game.overview = self.overview
+        mlbgame.events.game_events = lambda x: self.events.append(x) or {}
+
+    def tearDown(self):
+        for module, name, function in self.saved:
+            setattr(module, name, function)
+
+    def overview(self, game_id):
+        self.polls.append(self.clock.now)
+        minutes = (self.clock.now - START).total_seconds() / 60
+        if minutes < 10:
+            return {'status': 'Warmup'}
+        if minutes < 20:
+            return {'status': 'In Progress', 'inning': '1',
+                    'inning_state': 'Top', 'outs': str(int(minutes) % 3)}
+        if minutes < 30:
+            return {'status': 'In Progress', 'inning': '1',
+                    'inning_state': 'Middle'}
+        if minutes < 60:
+            return {'status': 'Delayed', 'reason': 'Rain'}
+        return {'status': 'Final', 'inning': '9'}
+
+    def test_intervals(self):
+        self.assertIsNone(mlbgame.live.interval('FINAL'))
+        self.assertIsNone(mlbgame.live.interval('Game Over'))
+        self.assertEqual(mlbgame.live.interval('Delayed Start'),
+                         mlbgame.live.DELAY_INTERVAL)
+        self.assertEqual(mlbgame.live.interval('In Progress', 'Bottom'),
+                         mlbgame.live.LIVE_INTERVAL)
+        self.assertEqual(mlbgame.live.interval('IN_PROGRESS', 'End'),
+                         mlbgame.live.BREAK_INTERVAL)
+        self.assertEqual(mlbgame.live.start_time(GAME_ID, '7:10PM'), START)
+        self.assertEqual(mlbgame.live.start_time(GAME_ID, '12:05PM').hour,
+                         12)
+        self.assertIsNone(mlbgame.live.start_time(GAME_ID, 'TBD'))
+
+    def test_run(self):
+        scheduler = mlbgame.live.LiveScheduler(
+            2016, 8, 2, clock=self.clock, sleep=self.clock.sleep)
+        updates = list(scheduler.run())
+        # nothing before the first pitch, and the final game never
+        self.assertEqual(self.polls[0], START)
+        self.assertEqual(self.clock.sleeps[0], 7 * 3600 + 600)
+        self.assertTrue(all(x.game_id == GAME_ID for x in updates))
+        self.assertEqual(updates[-1].overview.status, 'Final')
+        self.assertEqual(scheduler.next_poll(), None)
+        gaps = [(y - x).total_seconds()
+                for x, y in zip(self.polls, self.polls[1:])]
+        # fast in the inning, slow between innings and during the delay
+        live = [x for x, y in zip(gaps, self.polls)
+                if START + datetime.timedelta(minutes=10) <= y
+                < START + datetime.timedelta(minutes=20)]
+        self.assertEqual(set(live), set([mlbgame.live.LIVE_INTERVAL]))
+        self.assertIn(mlbgame.live.BREAK_INTERVAL, gaps)
+        self.assertIn(mlbgame.live.DELAY_INTERVAL, gaps)
+        # events are only fetched when the linescore changed
+        self.assertEqual(len(self.events), len(updates))
+        self.assertLess(len(updates), len(self.polls))
+
+    def test_errors(self):
+        bad_id = '2016_08_02_texmlb_houmlb_1'
+
+        def scoreboard_with_bad_game(year, month, day, home=None, away=None):
+            games = scoreboard(year, month, day)
+            games[bad_id] = {'game_id': bad_id, 'game_status': 'PRE_GAME',
+                             'game_start_time': '7:10PM'}
+            return games
+        bad_polls = []
+
+        def overview(game_id):
+            if game_id != bad_id:
+                return self.overview(game_id)
+            bad_polls.append(self.clock.now)
+            if len(bad_polls) < 5:
+                raise ValueError('Could not find a game with that id.')
+            return {'status': 'Final', 'inning': '9'}
+        mlbgame.game.scoreboard = scoreboard_with_bad_game
+        mlbgame.game.overview = overview
+        scheduler = mlbgame.live.LiveScheduler(
+            2016, 8, 2, clock=self.clock, sleep=self.clock.sleep)
+        updates = list(scheduler.run())
+        # the other game is followed to the end
+        self.assertEqual([x.overview.status for x in updates
+                          if x.game_id == GAME_ID][-1], 'Final')
+        self.assertEqual([x for x, e in scheduler.errors], [bad_id] * 4)
+        # failing polls back off, and the game is polled until it worked
+        gaps = [(y - x).total_seconds()
+                for x, y in zip(bad_polls, bad_polls[1:])]
+        interval = mlbgame.live.BREAK_INTERVAL
+        self.assertEqual(gaps, [interval * 2, interval * 4,
+                                mlbgame.live.MAX_BACKOFF,
+                                mlbgame.live.MAX_BACKOFF])
+        self.assertEqual(updates[-1].game_id, GAME_ID)
+        self.assertEqual(scheduler.games[bad_id]['status'], 'Final')
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+
+import io
+import unittest
+
+import mlbgame
+
+
+OVERVIEW = b'<game id="2016/08/02/nyamlb-nynmlb-1" home_team_runs="7"/>'
+
+
+class TestMetrics(unittest.TestCase):
+
+    def tearDown(self):
+        mlbgame.metrics.collect(False)
+        mlbgame.metrics.reset()
+
+    def test_disabled(self):
+        self.assertIsNone(mlbgame.metrics.start())
+        mlbgame.metrics.collect()
+        self.assertIsNotNone(mlbgame.metrics.start())
+        mlbgame.metrics.collect(False)
+        self.assertIsNone(mlbgame.metrics.start())
+        # stopping a measurement that was not started does nothing
+        mlbgame.metrics.stop('parse', 'overview', None)
+        self.assertEqual(mlbgame.metrics.counters(), {})
+
+    def test_phases(self):
+        calls = []
+
+        def callback(phase, endpoint, seconds, bytes, objects):
+            calls.append((phase, endpoint, bytes, objects))
+
+        urlopen = mlbgame.data.urlopen
+        mlbgame.data.urlopen = lambda x: io.BytesIO(OVERVIEW)
+        mlbgame.metrics.register(callback)
+        mlbgame.metrics.collect()
+        try:
+            overview = mlbgame.overview('2016_08_02_nyamlb_nynmlb_1')
+            mlbgame.overview('2016_08_02_nyamlb_nynmlb_1')
+        finally:
+            mlbgame.data.urlopen = urlopen
+            mlbgame.metrics.unregister(callback)
+        self.assertEqual(overview.home_team_runs, 7)
+        self.assertEqual(calls[:3], [
+            ('fetch', 'overview', len(OVERVIEW), 0),
+            ('parse', 'overview', 0, 0),
+            ('construct', 'overview', 0, 1),
+        ])
+        self.assertEqual(len(calls), 6)
+        counters = mlbgame.metrics.counters()['overview']
+        self.assertEqual(sorted(counters), ['construct', 'fetch', 'parse'])
+        self.assertEqual(counters['fetch']['calls'], 2)
+        self.assertEqual(counters['fetch']['bytes'], 2 * len(OVERVIEW))
+        self.assertEqual(counters['construct']['objects'], 2)
+        self.assertGreaterEqual(counters['parse']['seconds'], 0)
+        mlbgame.metrics.reset()
+        self.assertEqual(mlbgame.metrics.counters(), {})
+
+    def test_objects(self):
+        data = {'home_batting': [{'id': '1', 'name': 'Reyes'}],
+                'away_batting': [{'id': '2', 'name': 'Gardner'}],
+                'batters': {'1': {'id': '1', 'name': 'Reyes'},
+                            '2': {'id': '2', 'name': 'Gardner'}},
+                'pitchers': {}}
+        player_stats = mlbgame.stats.player_stats
+        mlbgame.stats.player_stats = lambda x: data
+        mlbgame.metrics.collect()
+        try:
+            stats = mlbgame.player_stats('2016_08_02_nyamlb_nynmlb_1')
+        finally:
+            mlbgame.stats.player_stats = player_stats
+        # the container and the rows of the lists and of the joined stats
+        self.assertEqual(len(stats.batters), 2)
+        counters = mlbgame.metrics.counters()['player_stats']
+        self.assertEqual(counters['construct']['objects'], 5)
+        self.assertEqual(mlbgame.metrics.count([stats, stats]), 5)
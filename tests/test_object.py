@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 
+import pickle
 import unittest
 
 import mlbgame
@@ -26,3 +27,100 @@ class TestObject(unittest.TestCase):
         self.assertEqual(obj.int, 10)
         self.assertEqual(obj.float, 10.1)
         self.assertEqual(obj.unicode, u'\xe7\x8c\xab')
+
+    def test_schema(self):
+        def documented():
+            class Documented(mlbgame.object.Object):
+                """Documented object
+
+                Properties:
+                    Numbers:
+                        number
+                        decimal
+                    text
+                """
+            return Documented
+        self.assertEqual(mlbgame.object.properties(documented()),
+                         ['number', 'decimal', 'text'])
+        values = ['10', '10.1', ' -7 ', '1e5', '.300', '', 'string',
+                  'Hernandez', 'inf', '1_000', '2016_08_02_nyamlb_nynmlb_1',
+                  '(W, 7-5)', '2016-08-02T23:11:05Z', u'\xe7\x8c\xab']
+        for first in values:
+            # the first value picks the converter of each property
+            cls = documented()
+            cls({'number': first, 'decimal': first, 'text': first})
+            for value in values:
+                data = {'number': value, 'decimal': value, 'text': value,
+                        'unknown': value}
+                obj = cls(data)
+                expected = mlbgame.object.infer(value)
+                for key in data:
+                    self.assertEqual(getattr(obj, key), expected)
+                    self.assertIs(type(getattr(obj, key)), type(expected))
+
+    def test_lazy_object(self):
+        data = {
+            'string': 'string',
+            'int': '10',
+            'float': '10.1'
+        }
+        obj = mlbgame.object.Object(data, lazy=True)
+        self.assertNotIn('int', obj.__dict__)
+        self.assertEqual(obj.int, 10)
+        self.assertIsInstance(obj.int, int)
+        self.assertIn('int', obj.__dict__)
+        self.assertEqual(obj.float, 10.1)
+        self.assertEqual(getattr(obj, 'string'), 'string')
+        self.assertFalse(hasattr(obj, 'missing'))
+        self.assertRaises(AttributeError, lambda: obj.missing)
+        stats = mlbgame.stats.PlayerStats(
+            {'name_display_first_last': 'Jacob deGrom', 'pos': 'P'}, lazy=True)
+        self.assertEqual(stats.__str__(), 'Jacob deGrom (P)')
+
+    def test_slotted_object(self):
+        cls = mlbgame.object.slotted(mlbgame.stats.PlayerStats)
+        self.assertIs(cls, mlbgame.object.slotted(mlbgame.stats.PlayerStats))
+        self.assertIs(cls, mlbgame.object.slotted(cls))
+        self.assertIn('ab', cls.__slots__)
+        self.assertNotIn('nice_output', cls.__slots__)
+        data = {'name_display_first_last': 'Jacob deGrom', 'pos': 'P',
+                'ab': '3', 'unexpected': 'value'}
+        mlbgame.object.SLOTS = True
+        try:
+            obj = mlbgame.stats.PlayerStats(data)
+            lazy = mlbgame.stats.PlayerStats(data, lazy=True)
+        finally:
+            mlbgame.object.SLOTS = False
+        self.assertIs(type(obj), cls)
+        self.assertIsInstance(obj, mlbgame.stats.PlayerStats)
+        self.assertEqual(obj.ab, 3)
+        self.assertEqual(obj.unexpected, 'value')
+        self.assertEqual(obj.__dict__, {'unexpected': 'value'})
+        self.assertEqual(obj.__str__(), 'Jacob deGrom (P)')
+        self.assertEqual(lazy.ab, 3)
+        self.assertEqual(lazy.unexpected, 'value')
+        self.assertRaises(AttributeError, lambda: obj.h)
+        copy = pickle.loads(pickle.dumps(obj))
+        self.assertIs(type(copy), cls)
+        self.assertEqual(copy.ab, 3)
+        self.assertEqual(copy.unexpected, 'value')
+
+    def test_intern_value(self):
+        mlbgame.object.clear_interned()
+        first = ''.join(['Called ', 'Strike'])
+        second = ''.join(['Called ', 'Strike'])
+        self.assertIsNot(first, second)
+        self.assertIs(mlbgame.object.intern_value(first), first)
+        self.assertIs(mlbgame.object.intern_value(second), first)
+        data = {'des': second, 'type': 'S'}
+        mlbgame.object.intern_values(data, ('des', 'missing'))
+        self.assertIs(data['des'], first)
+        size = mlbgame.object.INTERN_SIZE
+        mlbgame.object.INTERN_SIZE = 1
+        try:
+            other = ''.join(['Ba', 'll'])
+            self.assertIs(mlbgame.object.intern_value(other), other)
+            self.assertIsNot(mlbgame.object.intern_value(''.join(['Ba', 'll'])), other)
+        finally:
+            mlbgame.object.INTERN_SIZE = size
+            mlbgame.object.clear_interned()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import mlbgame
+import mlbgame.search
+
+GAME_ID = '2016_08_02_nyamlb_nynmlb_1'
+OTHER_ID = '2016_08_03_nyamlb_nynmlb_1'
+EVENTS = {
+    '1': {
+        'top': [
+            {'num': '1', 'batter': '457727', 'pitcher': '594798',
+             'event': 'Groundout',
+             'des': 'Brett Gardner grounds out, second baseman Neil Walker '
+                    'to first baseman James Loney.', 'pitches': []},
+            {'num': '2', 'batter': '516770', 'pitcher': '594798',
+             'event': 'Grounded Into DP',
+             'des': 'Starlin Castro grounds into a double play, shortstop '
+                    'Asdrubal Cabrera to second baseman Neil Walker to '
+                    'first baseman James Loney.', 'pitches': []}],
+        'bottom': [
+            {'num': '3', 'batter': '431151', 'pitcher': '425844',
+             'event': 'Home Run',
+             'des': 'Jose Reyes homers (4) on a fly ball to left field.',
+             'pitches': []}]
+    },
+    '2': {
+        'top': [
+            {'num': '4', 'batter': '543305', 'pitcher': '594798',
+             'event': 'Single',
+             'des': "Brian McCann singles on a line drive to left fielder "
+                    "Yoenis Cespedes.", 'pitches': []}],
+        'bottom': []
+    }
+}
+OTHER = {'1': {'top': [], 'bottom': [
+    {'num': '1', 'batter': '431151', 'pitcher': '425844',
+     'event': 'Home Run', 'des': 'Jose Reyes homered to right field.',
+     'pitches': []}]}}
+
+
+class TestSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'plays.db')
+        self.index = mlbgame.search.PlayIndex(self.path)
+        self.index.add_game(GAME_ID, EVENTS)
+        self.index.add_game(OTHER_ID, OTHER)
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.directory)
+
+    def nums(self, query, **kwargs):
+        return [(x['game_id'][8:10], x['num'])
+                for x in self.index.search(query, **kwargs)]
+
+    def test_queries(self):
+        self.assertEqual(self.nums('homers'), [('02', 3)])
+        self.assertEqual(self.nums('homer*'), [('02', 3), ('03', 1)])
+        self.assertEqual(self.nums('Neil Walker'), [('02', 1), ('02', 2)])
+        self.assertEqual(self.nums('"grounds into a double play" WALKER'),
+                         [('02', 2)])
+        # words of a phrase must be next to each other and in order
+        self.assertEqual(self.nums('"double grounds"'), [])
+        self.assertEqual(self.nums('"Walker Neil"'), [])
+        self.assertEqual(self.nums('reyes', game_id=OTHER_ID), [('03', 1)])
+        self.assertEqual(self.nums('reyes', limit=1), [('02', 3)])
+        self.assertEqual(self.nums('""'), [])
+        row = self.index.search('Cespedes.')[0]
+        self.assertEqual((row['inning'], row['half'], row['batter']),
+                         (2, 'top', '543305'))
+
+    def test_incremental(self):
+        # games are indexed once, unless forced
+        self.assertFalse(self.index.add_game(GAME_ID, {}))
+        self.assertTrue(self.index.add_game(GAME_ID, OTHER, force=True))
+        self.assertEqual(self.nums('walker'), [])
+        self.assertEqual(self.nums('homered'), [('02', 1), ('03', 1)])
+        self.index.close()
+        # the index is kept on disk
+        self.index = mlbgame.search.PlayIndex(self.path)
+        self.assertTrue(self.index.is_indexed(OTHER_ID))
+        self.assertEqual(len(self.index.search('reyes')), 2)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+import unittest
+
+import mlbgame
+import mlbgame.season
+
+GAME_ID = '2016_08_02_nyamlb_nynmlb_1'
+
+
+def player_data(ab, h, hr, out, er, win):
+    return {
+        'home_batting': [{'id': '1', 'name_display_first_last': 'Home Batter',
+                          'ab': str(ab), 'h': str(h), 'd': '1', 't': '0',
+                          'hr': str(hr), 'bb': '1', 'hbp': '0', 'sf': '0',
+                          'so': '1'}],
+        'away_batting': [{'id': '2', 'name_display_first_last': 'Away Batter',
+                          'ab': '4', 'h': '0', 'hr': '0', 'bb': ''}],
+        'home_pitching': [{'id': '3', 'name_display_first_last': 'Home Pitcher',
+                           'out': str(out), 'er': str(er), 'h': '5',
+                           'bb': '1', 'so': '7', 'w': '12',
+                           'win': 'true' if win else ''}],
+        'away_pitching': [{'id': '4', 'name_display_first_last': 'Away Pitcher',
+                           'out': '24', 'er': '3', 'loss': 'true' if win else ''}],
+    }
+
+
+def team_data(home_runs, away_runs):
+    return {
+        'home_batting': {'ab': '32', 'r': str(home_runs), 'h': '8'},
+        'away_batting': {'ab': '30', 'r': str(away_runs), 'h': '5'},
+        'home_pitching': {'out': '27', 'er': str(away_runs)},
+        'away_pitching': {'out': '24', 'er': str(home_runs)},
+    }
+
+
+class TestSeason(unittest.TestCase):
+
+    def test_season_aggregator(self):
+        season = mlbgame.season.SeasonAggregator()
+        first = mlbgame.stats.Stats(player_data(4, 2, 1, 27, 1, True), GAME_ID, True)
+        second = mlbgame.stats.Stats(player_data(3, 1, 0, 18, 2, False),
+                                     GAME_ID.replace('02', '03', 1), True)
+        self.assertTrue(season.add_player_stats(first))
+        self.assertFalse(season.add_player_stats(first))
+        self.assertTrue(season.add_player_stats(second))
+        batter = season.batter(1)
+        self.assertEqual(batter.g, 2)
+        self.assertEqual(batter.ab, 7)
+        self.assertEqual(batter.h, 3)
+        self.assertEqual(batter.hr, 1)
+        self.assertEqual(batter.team, 'nyn')
+        self.assertEqual(batter.avg, 0.429)
+        self.assertEqual(batter.obp, 0.556)
+        self.assertEqual(batter.slg, 1.143)
+        self.assertEqual(batter.ops, 1.699)
+        self.assertEqual(season.batter(2).bb, 0)
+        self.assertEqual(season.batter(2).team, 'nya')
+        pitcher = season.pitcher(3)
+        self.assertEqual(pitcher.out, 45)
+        self.assertEqual(pitcher.ip, 15.0)
+        self.assertEqual(pitcher.era, 1.8)
+        self.assertEqual(pitcher.wins, 1)
+        self.assertEqual(pitcher.losses, 0)
+        self.assertEqual(pitcher.__str__(), 'Home Pitcher - 15.0 IP, 3 ER, 1.80 ERA')
+        self.assertEqual(season.pitcher(4).losses, 1)
+        self.assertEqual(len(season.game_ids), 2)
+
+    def test_team_totals(self):
+        season = mlbgame.season.SeasonAggregator()
+        season.add_team_stats(mlbgame.stats.Stats(team_data(5, 3), GAME_ID, False))
+        season.add_team_stats(mlbgame.stats.Stats(team_data(1, 2), GAME_ID + '2', False))
+        home = season.team('nyn')
+        away = season.team('nya')
+        self.assertEqual(home.wins, 1)
+        self.assertEqual(home.losses, 1)
+        self.assertEqual(away.g, 2)
+        self.assertEqual(home.batting.r, 6)
+        self.assertEqual(home.pitching.er, 5)
+        self.assertEqual(home.pitching.era, 2.5)
+        self.assertEqual(home.__str__(), 'nyn (1-1)')
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+
+import json
+import threading
+import time
+import unittest
+
+import mlbgame
+import mlbgame.serve
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+OVERVIEW = b'<game id="2016/08/02/nyamlb-nynmlb-1" home_team_runs="7"/>'
+
+
+class UpstreamHandler(BaseHTTPRequestHandler):
+    """Serves `OVERVIEW` slowly for linescore files, a truncated error
+    slowly for broken files, 503 for the scoreboard of the 3rd and 404
+    otherwise."""
+
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        if self.path.endswith('broken.xml'):
+            time.sleep(0.2)
+            self.send_response(500)
+            self.send_header('Content-Length', '1000')
+            self.end_headers()
+            self.wfile.write(b'<error')
+            return
+        if self.path.endswith('day_03/scoreboard.xml'):
+            self.send_response(503)
+            self.end_headers()
+            return
+        if not self.path.endswith('linescore.xml'):
+            self.send_response(404)
+            self.end_headers()
+            return
+        time.sleep(0.2)
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(OVERVIEW)))
+        self.end_headers()
+        self.wfile.write(OVERVIEW)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def start(server):
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return 'http://127.0.0.1:{0}'.format(server.server_address[1])
+
+
+class TestServe(unittest.TestCase):
+
+    def setUp(self):
+        UpstreamHandler.requests = []
+        self.upstream = Server(('127.0.0.1', 0), UpstreamHandler)
+        upstream_url = start(self.upstream)
+        self.proxy = mlbgame.serve.CachingProxy(
+            ttl=60, upstream=2, allowed_hosts=['127.0.0.1'])
+        self.server = mlbgame.serve.ProxyServer(('127.0.0.1', 0), self.proxy)
+        self.saved = (mlbgame.data.PROXY_URL, mlbgame.data.GAME_URL,
+                      mlbgame.data.BASE_URL)
+        mlbgame.data.PROXY_URL = start(self.server)
+        mlbgame.data.BASE_URL = (upstream_url + '/year_{0}/month_{1:02d}/'
+                                 'day_{2:02d}/')
+        mlbgame.data.GAME_URL = mlbgame.data.BASE_URL + 'gid_{3}/{4}'
+
+    def tearDown(self):
+        (mlbgame.data.PROXY_URL, mlbgame.data.GAME_URL,
+         mlbgame.data.BASE_URL) = self.saved
+        for x in (self.server, self.upstream):
+            x.shutdown()
+            x.server_close()
+
+    def test_coalesced(self):
+        results = []
+
+        def overview():
+            results.append(mlbgame.overview('2016_08_02_nyamlb_nynmlb_1'))
+
+        threads = [threading.Thread(target=overview) for x in range(8)]
+        for x in threads:
+            x.start()
+        for x in threads:
+            x.join()
+        self.assertEqual(len(results), 8)
+        self.assertEqual(results[0].home_team_runs, 7)
+        overview()
+        # every client was answered by a single upstream request
+        self.assertEqual(len(UpstreamHandler.requests), 1)
+        self.assertEqual(self.proxy.stats['misses'], 1)
+        self.assertEqual(self.proxy.stats['upstream'], 1)
+        self.assertEqual(self.proxy.stats['hits'] +
+                         self.proxy.stats['coalesced'], 8)
+        stats = json.loads(mlbgame.data.urlopen(
+            mlbgame.data.PROXY_URL + '/stats').read().decode('utf-8'))
+        self.assertEqual(stats['entries'], 1)
+
+    def test_errors(self):
+        # upstream errors reach the client like they would without proxy
+        self.assertRaises(ValueError, mlbgame.data.get_box_score,
+                          '2016_08_02_nyamlb_nynmlb_1')
+        self.assertRaises(ValueError, mlbgame.data.get_box_score,
+                          '2016_08_02_nyamlb_nynmlb_1')
+        self.assertEqual(len(UpstreamHandler.requests), 1)
+        # hosts that are not allowed are never fetched
+        self.assertFalse(self.proxy.allowed('http://example.com/x.xml'))
+        try:
+            mlbgame.data.urlopen(mlbgame.data._proxied(
+                'http://example.com/x.xml'))
+        except mlbgame.data.HTTPError as e:
+            self.assertEqual(e.code, 403)
+        else:
+            self.fail('expected HTTPError')
+
+    def test_scoreboard_errors(self):
+        # a day without scoreboard is empty, an upstream error is an error
+        self.assertEqual(mlbgame.game.scoreboard(2016, 8, 4), [])
+        for x in range(2):
+            try:
+                mlbgame.data.get_scoreboard(2016, 8, 3)
+            except mlbgame.data.HTTPError as e:
+                self.assertEqual(e.code, 502)
+            else:
+                self.fail('expected HTTPError')
+        # and is not cached
+        self.assertEqual(len(UpstreamHandler.requests), 3)
+        self.assertEqual(self.proxy.stats['errors'], 2)
+
+    def test_failed_fetch(self):
+        url = mlbgame.data._proxied(mlbgame.data.GAME_URL.format(
+            2016, 8, 2, '2016_08_02_nyamlb_nynmlb_1', 'broken.xml'))
+        codes = []
+
+        def fetch():
+            try:
+                mlbgame.data.urlopen(url)
+            except mlbgame.data.HTTPError as e:
+                codes.append(e.code)
+
+        threads = [threading.Thread(target=fetch) for x in range(4)]
+        for x in threads:
+            x.start()
+        for x in threads:
+            x.join()
+        # the clients that waited for the request get its error too
+        self.assertEqual(codes, [502] * 4)
+        self.assertEqual(len(UpstreamHandler.requests), 1)
+        self.assertEqual(self.proxy.stats['errors'], 1)
+        self.assertEqual(len(self.proxy), 0)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+
+import mmap
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+
+import mlbgame
+import mlbgame.shared
+
+SCOREBOARD = {
+    '2016_08_02_nyamlb_nynmlb_1': {
+        'game_id': '2016_08_02_nyamlb_nynmlb_1', 'game_status': 'FINAL',
+        'home_team': 'Mets', 'home_team_runs': 7, 'away_team': 'Yankees',
+        'away_team_runs': 1, 'sv_pitcher': ''},
+    '2016_08_02_bosmlb_seamlb_1': {
+        'game_id': '2016_08_02_bosmlb_seamlb_1', 'game_status': 'FINAL',
+        'home_team': 'Mariners', 'home_team_runs': 4, 'away_team': 'Red Sox',
+        'away_team_runs': 6, 'sv_pitcher': 'C. Kimbrel'}
+}
+PLAYER_STATS = {
+    '2016_08_02_nyamlb_nynmlb_1': {
+        'home_batting': [{'id': '431151', 'name': 'Reyes', 'h': '2'}],
+        'away_batting': [{'id': '457727', 'name': 'Gardner', 'h': '0'}],
+        'home_pitching': [{'id': '594798', 'name': 'deGrom', 'era': '2.54'}],
+        'away_pitching': [],
+        'batters': {
+            '431151': {'id': '431151', 'name': 'Reyes', 'h': '2',
+                       'avg': '.278'}},
+        'pitchers': {}
+    }
+}
+
+
+def read_season(path):
+    # runs in another process, which attaches to the published file
+    with mlbgame.shared.attach(path) as season:
+        games = season['games']
+        return (sum(games.column('home_team_runs')),
+                [x['home_team'] for x in games])
+
+
+class TestShared(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'season')
+        tables = mlbgame.shared.season_tables([SCOREBOARD], PLAYER_STATS)
+        mlbgame.shared.publish(self.path, tables)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_tables(self):
+        with mlbgame.shared.attach(self.path) as season:
+            games = season['games']
+            self.assertEqual(len(games), 2)
+            self.assertEqual(games.type('home_team_runs'), 'int')
+            self.assertEqual(games.row(0)['home_team'], 'Mariners')
+            self.assertIsNone(games.row(1)['sv_pitcher'])
+            # string columns are codes into their distinct values
+            self.assertEqual(games.strings('game_status'), ['FINAL'])
+            self.assertEqual(list(games.column('game_status')), [0, 0])
+            batting = season['batting']
+            self.assertEqual(len(batting), 2)
+            reyes = batting.row(0)
+            self.assertEqual((reyes['id'], reyes['h'], reyes['team']),
+                             (431151, 2, 'home'))
+            self.assertEqual(reyes['avg'], 0.278)
+            self.assertIsNone(batting.row(-1)['avg'])
+            self.assertEqual(season['pitching'].row(0)['era'], 2.54)
+
+    def test_zero_copy(self):
+        season = mlbgame.shared.attach(self.path)
+        runs = season['games'].column('home_team_runs')
+        self.assertIsInstance(runs.obj, mmap.mmap)
+        self.assertTrue(runs.readonly)
+        self.assertEqual(list(runs), [4, 7])
+        self.assertRaises(TypeError, runs.__setitem__, 0, 1)
+        season.close()
+        self.assertRaises(ValueError, runs.tolist)
+
+    def test_processes(self):
+        pool = multiprocessing.Pool(2)
+        try:
+            results = pool.map(read_season, [self.path] * 2)
+        finally:
+            pool.close()
+            pool.join()
+        self.assertEqual(results, [(11, ['Mariners', 'Mets'])] * 2)
+
+    def test_invalid(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'<game/>' * 4)
+        self.assertRaises(ValueError, mlbgame.shared.attach, self.path)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+import copy
+import os
+import shutil
+import tempfile
+import unittest
+
+import mlbgame
+import mlbgame.snapshots
+
+GAME_ID = '2016_08_02_nyamlb_nynmlb_1'
+
+
+def live_game():
+    """Yield the game events after every pitch of a game."""
+    events = {}
+    for inning in range(1, 10):
+        events[str(inning)] = {'top': [], 'bottom': []}
+        for half in ('top', 'bottom'):
+            for num in range(4):
+                atbat = {'num': str(len(events) * 8 + num),
+                         'batter': str(400000 + num), 'pitcher': '594798',
+                         'b': '0', 's': '0', 'o': str(min(num, 2)),
+                         'des': '', 'event': '', 'pitches': []}
+                events[str(inning)][half].append(atbat)
+                for pitch in range(4):
+                    atbat['pitches'].append({
+                        'id': str(pitch), 'des': 'Ball', 'type': 'B',
+                        'start_speed': '9{0}.1'.format(pitch),
+                        'px': '0.{0}12'.format(pitch), 'pz': '2.{0}'.format(
+                            pitch), 'pitch_type': 'FF', 'nasty': '44'})
+                    atbat['b'] = str(pitch)
+                    yield copy.deepcopy(events)
+                atbat['event'] = 'Walk'
+                atbat['des'] = 'Jose Reyes walks.'
+                yield copy.deepcopy(events)
+
+
+class TestSnapshots(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'snapshots.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_snapshots(self):
+        snapshots = list(live_game())
+        store = mlbgame.snapshots.SnapshotStore(self.path,
+                                                keyframe_interval=40)
+        for i, x in enumerate(snapshots[:100]):
+            self.assertEqual(store.add(GAME_ID, x, taken=i), i)
+        store.close()
+        # a reopened store goes on after the last snapshot
+        with mlbgame.snapshots.SnapshotStore(self.path,
+                                             keyframe_interval=40) as store:
+            for x in snapshots[100:]:
+                store.add(GAME_ID, x)
+            self.assertEqual(store.count(GAME_ID), len(snapshots))
+            self.assertEqual(store.game_ids(), [GAME_ID])
+            for i in (0, 1, 39, 40, 41, 99, 100, len(snapshots) - 1):
+                self.assertEqual(store.snapshot(GAME_ID, i), snapshots[i])
+            replayed = [x for taken, x in store.replay(GAME_ID)]
+            self.assertEqual(replayed, snapshots)
+            self.assertEqual(store.times(GAME_ID)[:3], [0, 1, 2])
+            self.assertRaises(ValueError, store.snapshot, GAME_ID,
+                              len(snapshots))
+            # an order of magnitude smaller than the snapshots
+            stats = store.stats(GAME_ID)
+            self.assertEqual(stats['snapshots'], len(snapshots))
+            self.assertGreater(stats['ratio'], 10)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+
+import unittest
+
+import mlbgame
+
+
+def atbat(num, o, b1='', b2='', b3='', away=0, home=0):
+    return {'num': str(num), 'o': str(o), 'b1': b1, 'b2': b2, 'b3': b3,
+            'away_team_runs': str(away), 'home_team_runs': str(home),
+            'batter': '1', 'pitcher': '2', 'event': 'Event', 'pitches': []}
+
+
+GAME = {
+    '1': {
+        'top': [
+            atbat(1, 0, b1='10'),
+            atbat(2, 0, b1='11', b3='10'),
+            atbat(3, 1, b1='11', away=1),
+            atbat(4, 3, away=1),
+        ],
+        'bottom': [
+            atbat(5, 1, away=1),
+            atbat(6, 1, away=1, home=1),
+            atbat(7, 2, away=1, home=1),
+            atbat(8, 3, away=1, home=1),
+        ]
+    }
+}
+
+
+class TestStates(unittest.TestCase):
+
+    def test_game_states(self):
+        states = mlbgame.states.game_states(GAME)
+        self.assertEqual(len(states), 8)
+        first = states[0]
+        self.assertEqual(first['start_state'], 0)
+        self.assertEqual(first['end_state'], mlbgame.states.FIRST)
+        self.assertEqual(first['runs_to_end'], 1)
+        third = states[2]
+        self.assertEqual(third['start_bases'], 5)
+        self.assertEqual(third['start_outs'], 0)
+        self.assertEqual(third['end_state'], 9)
+        self.assertEqual(third['runs'], 1)
+        self.assertEqual(states[3]['end_state'], mlbgame.states.END)
+        self.assertEqual(states[3]['runs_to_end'], 0)
+        homer = states[5]
+        self.assertEqual(homer['half'], 'bottom')
+        self.assertEqual(homer['start_state'], 8)
+        self.assertEqual(homer['runs'], 1)
+        self.assertEqual(states[4]['runs_to_end'], 1)
+        obj = mlbgame.states.StateTransition(homer)
+        self.assertEqual(obj.__str__(), 'Bottom 1: 8 -> 8 (1 runs)')
+
+    def test_run_expectancy(self):
+        table = mlbgame.states.StateTable()
+        table.add_game('game', mlbgame.states.game_states(GAME))
+        self.assertEqual(len(table), 8)
+        matrix = table.run_expectancy()
+        self.assertEqual(matrix.get(0, 0), 1.0)
+        self.assertEqual(matrix.get(0, 1), 0.5)
+        self.assertEqual(matrix.get(0, 2), 0.0)
+        self.assertEqual(matrix.counts[8], 2)
+        self.assertIsInstance(matrix.__str__(), str)
+
+    def test_truncated(self):
+        game = dict(GAME)
+        # a walk-off homer with nobody out ends the game
+        game['2'] = {
+            'top': [atbat(9, 1, away=1, home=1),
+                    atbat(10, 3, away=1, home=1)],
+            'bottom': [atbat(11, 0, away=1, home=2)]
+        }
+        states = mlbgame.states.game_states(game)
+        self.assertTrue(states[0]['complete'])
+        self.assertFalse(states[-1]['complete'])
+        table = mlbgame.states.StateTable()
+        table.add_game('game', states)
+        matrix = table.run_expectancy()
+        self.assertEqual(matrix.counts[0], 3)
+        self.assertEqual(matrix.get(0, 0), 2.0 / 3)
+        matrix = table.run_expectancy(truncated=True)
+        self.assertEqual(matrix.counts[0], 4)
+        self.assertEqual(matrix.get(0, 0), 0.75)
@@ -1,10 +1,39 @@
 #!/usr/bin/env python
 
+import io
 import unittest
 
 import mlbgame
 
 
+BOX_SCORE = b"""<boxscore>
+<pitching team_flag="home" out="27">
+<pitcher id="1" name="Home" name_display_first_last="Home Pitcher" pos="P" out="27" h="4" bb="1" so="8"/>
+</pitching>
+<pitching team_flag="away" out="24">
+<pitcher id="2" name="Away" pos="P" out="24" h="6" bb="2" so="5"/>
+</pitching>
+<batting team_flag="home" ab="30">
+<batter id="1" name="Home" pos="P" ab="3" h="1"/>
+<batter id="3" name="Other" pos="CF" ab="4" h="2"/>
+</batting>
+<batting team_flag="away" ab="32">
+<batter id="4" name="Visitor" pos="SS" ab="4" h="0"/>
+</batting>
+</boxscore>"""
+
+RAW_BOX_SCORE = b"""<boxscore>
+<team team_flag="home">
+<pitching out="27"><pitcher id="1" go="9" ao="7" h="4"/></pitching>
+<batting ab="30"><batter id="1" go="1" ao="1"/><batter id="3" go="2" ao="1"/></batting>
+</team>
+<team team_flag="away">
+<pitching out="24"><pitcher id="2" go="5" ao="10"/></pitching>
+<batting ab="32"><batter id="4" go="3" ao="1"/></batting>
+</team>
+</boxscore>"""
+
+
 class TestStats(unittest.TestCase):
 
     def __test_team_picher_stats(self, team):
@@ -213,3 +242,63 @@ class TestStats(unittest.TestCase):
         self.assertEqual(batter.so, 0)
         self.assertEqual(batter.t, 0)
         self.assertEqual(batter.__str__(), 'Alejandro De Aza (CF)')
+
+    def test_game_stats(self):
+        stats = mlbgame.game_stats('2016_08_02_nyamlb_nynmlb_1')
+        self.assertEqual(stats.game_id, '2016_08_02_nyamlb_nynmlb_1')
+        self.assertIsInstance(stats.player_stats, mlbgame.stats.Stats)
+        self.assertIsInstance(stats.team_stats, mlbgame.stats.Stats)
+        self.__test_team_picher_stats(stats.team_stats.home_pitching)
+        self.__test_team_batter_stats(stats.team_stats.home_batting)
+        self.assertEqual(stats.team_stats.home_pitching.out, 27)
+        self.assertEqual(stats.team_stats.home_batting.ab, 35)
+        pitcher = (stats.player_stats.home_pitching + stats.player_stats.away_pitching)[0]
+        batter = (stats.player_stats.home_batting + stats.player_stats.away_batting)[0]
+        self.assertEqual(pitcher.__str__(), 'Jacob deGrom (P)')
+        self.assertEqual(batter.__str__(), 'Alejandro De Aza (CF)')
+
+    def test_joined_player_stats(self):
+        get_box_score = mlbgame.data.get_box_score
+        get_raw_box_score = mlbgame.data.get_raw_box_score
+        mlbgame.data.get_box_score = lambda x: io.BytesIO(BOX_SCORE)
+        mlbgame.data.get_raw_box_score = lambda x: io.BytesIO(RAW_BOX_SCORE)
+        try:
+            stats = mlbgame.player_stats('2016_08_02_nyamlb_nynmlb_1')
+        finally:
+            mlbgame.data.get_box_score = get_box_score
+            mlbgame.data.get_raw_box_score = get_raw_box_score
+        self.assertEqual(len(stats.home_batting), 2)
+        self.assertEqual(len(stats.batters), 3)
+        self.assertEqual(len(stats.pitchers), 2)
+        pitcher = stats.pitcher(1)
+        self.assertEqual(pitcher.go, 9)
+        self.assertEqual(pitcher.ao, 7)
+        self.assertEqual(pitcher.so, 8)
+        self.assertEqual(pitcher.__str__(), 'Home Pitcher (P)')
+        batter = stats.batter('3')
+        self.assertEqual(batter.ab, 4)
+        self.assertEqual(batter.go, 2)
+        self.assertEqual(stats.batter(1).h, 1)
+        self.assertIsNone(stats.batter(2))
+        self.assertIsNone(stats.pitcher(4))
+
+    def test_game_stats_fetched_once(self):
+        calls = []
+        get_box_score = mlbgame.data.get_box_score
+        get_raw_box_score = mlbgame.data.get_raw_box_score
+        mlbgame.data.get_box_score = \
+            lambda x: calls.append('box_score') or io.BytesIO(BOX_SCORE)
+        mlbgame.data.get_raw_box_score = \
+            lambda x: calls.append('raw_box_score') or \
+            io.BytesIO(RAW_BOX_SCORE)
+        try:
+            stats = mlbgame.game_stats('2016_08_02_nyamlb_nynmlb_1')
+        finally:
+            mlbgame.data.get_box_score = get_box_score
+            mlbgame.data.get_raw_box_score = get_raw_box_score
+        # both stats come from one fetch of each file
+        self.assertEqual(sorted(calls), ['box_score', 'raw_box_score'])
+        self.assertEqual(len(stats.player_stats.home_batting), 2)
+        self.assertEqual(stats.player_stats.pitcher(1).so, 8)
+        self.assertIsInstance(stats.team_stats.home_batting,
+                              mlbgame.stats.TeamStats)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+
+import mlbgame
+import mlbgame.search
+import mlbgame.warehouse
+
+GAME_ID = '2015_06_02_phimlb_nynmlb_1'
+OTHER_ID = '2015_06_02_bosmlb_nyamlb_1'
+
+
+def scoreboard(year, month, day, home=None, away=None):
+    games = {}
+    for game_id, home, away, status in (
+            (GAME_ID, 'Mets', 'Phillies', 'FINAL'),
+            (OTHER_ID, 'Yankees', 'Red Sox', 'IN_PROGRESS')):
+        games[game_id] = {
+            'game_id': game_id, 'game_tag': 'go_game', 'game_league': 'NN',
+            'game_status': status, 'game_start_time': '7:10PM',
+            'home_team': home, 'home_team_runs': 4, 'home_team_hits': 9,
+            'home_team_errors': 0, 'away_team': away, 'away_team_runs': 2,
+            'away_team_hits': 5, 'away_team_errors': 1,
+            'w_pitcher': 'J. deGrom', 'w_pitcher_wins': 5,
+            'w_pitcher_losses': 4, 'l_pitcher': 'A. Nola',
+            'l_pitcher_wins': 0, 'l_pitcher_losses': 1, 'sv_pitcher': '',
+            'sv_pitcher_saves': 0}
+    return games
+
+
+def game_stats(game_id):
+    batter = {'id': '10', 'name': 'Wright', 'pos': '3B', 'ab': '4',
+              'h': '2', 'hr': '1', 'bb': '0', 'sf': ''}
+    visitor = {'id': '20', 'name': 'Howard', 'pos': '1B', 'ab': '3',
+               'h': '0'}
+    pitcher = {'id': '30', 'name': 'deGrom', 'pos': 'P', 'out': '21',
+               'er': '2', 'so': '8', 'win': 'true'}
+    return {
+        'player': {
+            'home_batting': [batter], 'away_batting': [visitor],
+            'home_pitching': [pitcher], 'away_pitching': [],
+            'home_additional_batting': [], 'away_additional_batting': [],
+            'home_additional_pitching': [],
+            'away_additional_pitching': [],
+            'batters': {'10': batter, '20': visitor},
+            'pitchers': {'30': pitcher}
+        },
+        'team': {
+            'home_batting': {'ab': '33', 'r': '4', 'h': '9'},
+            'away_batting': {'ab': '31', 'r': '2', 'h': '5'},
+            'home_pitching': {'out': '27', 'so': '10'},
+            'away_pitching': {'out': '24', 'so': '6'}
+        }
+    }
+
+
+def game_events(game_id):
+    atbat = {'num': '1', 'batter': '20', 'pitcher': '30',
+             'event': 'Strikeout', 'des': 'Ryan Howard strikes out.',
+             'o': '1', 'b1': '', 'pitches': [
+                 {'des': 'Called Strike', 'type': 'S', 'start_speed': '95.1'},
+                 {'des': 'Swinging Strike', 'type': 'S',
+                  'start_speed': '96.0'}]}
+    return {'1': {'top': [atbat], 'bottom': []}}
+
+
+class TestWarehouse(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.saved = [
+            (mlbgame.game, 'scoreboard', scoreboard),
+            (mlbgame.game, 'box_score', lambda x: {
+                'game_id': x, 1: {'home': '0', 'away': '1'},
+                9: {'home': 'x', 'away': '0'}}),
+            (mlbgame.game, 'players', lambda x: {
+                'game_id': x, 'home_team': {'players': [
+                    {'id': '10', 'first': 'David', 'last': 'Wright',
+                     'team_abbrev': 'NYM'}]}}),
+            (mlbgame.stats, 'game_stats', game_stats),
+            (mlbgame.events, 'game_events', game_events),
+        ]
+        for i, (module, name, function) in enumerate(self.saved):
+            self.saved[i] = (module, name, getattr(module, name))
+            setattr(module, name, self.__counted(name, function))
+        self.warehouse = mlbgame.warehouse.Warehouse()
+
+    def tearDown(self):
+        self.warehouse.close()
+        for module, name, function in self.saved:
+            setattr(module, name, function)
+
+    def __counted(self, name, function):
+        def wrapper(*args, **kwargs):
+            self.calls.append(name)
+            return function(*args, **kwargs)
+        return wrapper
+
+    def test_ingest(self):
+        warehouse = self.warehouse
+        self.assertEqual(warehouse.ingest_day(2015, 6, 2), [GAME_ID])
+        self.assertTrue(warehouse.is_ingested(GAME_ID))
+        self.assertFalse(warehouse.is_ingested(OTHER_ID))
+        self.assertEqual(self.calls.count('game_stats'), 1)
+        # already ingested games are not fetched again
+        self.assertEqual(warehouse.ingest_day(2015, 6, 2), [])
+        self.assertFalse(warehouse.ingest_game(GAME_ID))
+        self.assertEqual(self.calls.count('game_stats'), 1)
+        self.assertTrue(warehouse.ingest_game(GAME_ID, force=True))
+        self.assertEqual(self.calls.count('game_stats'), 2)
+        count = warehouse.connection.execute(
+            'SELECT COUNT(*) FROM pitches').fetchone()[0]
+        self.assertEqual(count, 2)
+        self.assertEqual(warehouse.ingested_ids(), set([GAME_ID]))
+        # games that are not final are not ingested
+        self.assertFalse(warehouse.ingest_game(OTHER_ID, force=True))
+        self.assertFalse(warehouse.is_ingested(OTHER_ID))
+        self.assertEqual(self.calls.count('game_stats'), 2)
+        count = warehouse.connection.execute(
+            'SELECT COUNT(*) FROM atbats WHERE game_id = ?',
+            (OTHER_ID,)).fetchone()[0]
+        self.assertEqual(count, 0)
+
+    def test_queries(self):
+        warehouse = self.warehouse
+        warehouse.ingest_day(2015, 6, 2)
+        games = warehouse.games(date(2015, 6, 1), date(2015, 6, 30),
+                                home='Mets', away='Mets')
+        self.assertEqual(len(games), 1)
+        self.assertEqual(games[0].game_id, GAME_ID)
+        self.assertEqual(games[0].w_team, 'Mets')
+        self.assertEqual(len(warehouse.games()), 2)
+        self.assertEqual(warehouse.games(date(2015, 7, 1)), [])
+        self.assertEqual(len(warehouse.games(away='Red Sox')), 1)
+        # teams are found by the names and codes of the stored games
+        self.assertEqual(warehouse.team_names('nyn'), set(['nyn', 'Mets']))
+        self.assertEqual(warehouse.team_names('nym'), set(['nym', 'Mets']))
+        self.assertEqual(len(warehouse.games(home='NYN')), 1)
+        self.assertEqual(len(warehouse.games(away='red sox')), 1)
+        self.assertEqual(warehouse.games(home='Giants'), [])
+        log = warehouse.game_log(10)
+        self.assertEqual(len(log['batting']), 1)
+        self.assertEqual(log['pitching'], [])
+        line = log['batting'][0]
+        self.assertEqual(line['date'], '2015-06-02')
+        self.assertEqual(line['team'], 'home')
+        self.assertEqual(line['opponent'], 'Phillies')
+        self.assertEqual(line['h'], 2)
+        self.assertIsNone(line['sf'])
+        line = warehouse.pitching_log('30')[0]
+        self.assertEqual(line['out'], 21)
+        self.assertEqual(line['win'], 'true')
+        self.assertEqual(warehouse.batting_log(20)[0]['opponent'], 'Mets')
+
+    def test_index(self):
+        index = mlbgame.search.PlayIndex()
+        warehouse = mlbgame.warehouse.Warehouse(index=index)
+        warehouse.ingest_day(2015, 6, 2)
+        atbats = index.search('howard strikes')
+        self.assertEqual(len(atbats), 1)
+        self.assertEqual(atbats[0]['game_id'], GAME_ID)
+        warehouse.close()
+        index.close()
+
+    def test_shared_index(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'mlb.db')
+        try:
+            # an index made first does not take the tables of the warehouse
+            mlbgame.search.PlayIndex(path).close()
+            warehouse = mlbgame.warehouse.Warehouse(path, index=True)
+            self.assertEqual(warehouse.ingest_day(2015, 6, 2), [GAME_ID])
+            self.assertEqual(len(warehouse.index.search('howard')), 1)
+            count = warehouse.connection.execute(
+                'SELECT COUNT(*) FROM atbats').fetchone()[0]
+            self.assertEqual(count, 1)
+            warehouse.index.close()
+            self.assertEqual(len(warehouse.games()), 2)
+            warehouse.close()
+        finally:
+            shutil.rmtree(directory)